@@ -1,62 +1,73 @@
 #!/usr/bin/env python3
 import json, statistics
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from pathlib import Path
 
 def parse_git_log(path):
-    features = []
-    with open(path) as f:
-        lines = [l.strip() for l in f.readlines() if l.strip()]
-    lines.reverse()
-    for line in lines:
-        parts = line.split(' ', 1)
-        hash = parts[0]
-        rest = parts[1]
-        date_str = rest[:25]
-        msg = rest[26:]
-        ts = datetime.strptime(date_str, "%Y-%m-%d %H:%M:%S %z")
-        features.append({'hash': hash[:8], 'ts': ts, 'msg': msg})
-    return features
+    # git log is newest-first; appendleft yields oldest-first without a reverse pass
+    commits = deque()
+    with open(path, 'r', buffering=1 << 20) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            hash, rest = line.split(' ', 1)
+            date_str = rest[:25]
+            msg = rest[26:]
+            # C-level ISO parser (3.11+) accepts git's "%Y-%m-%d %H:%M:%S %z"
+            ts = datetime.fromisoformat(date_str)
+            commits.appendleft({'hash': hash[:8], 'ts': ts, 'msg': msg})
+    return commits
+
+FEAT_PREFIXES = ('feat(', 'feat:')
+ANCHOR_PREFIXES = FEAT_PREFIXES + ('state: checkpoint',)
 
 def extract_features(commits):
+    # Single forward pass: duration is measured from the last feat/checkpoint
     feats = []
-    for i, c in enumerate(commits):
-        if c['msg'].startswith('feat(') or c['msg'].startswith('feat:'):
-            prev_ts = commits[0]['ts'] if i == 0 else None
-            for j in range(i-1, -1, -1):
-                if commits[j]['msg'].startswith('feat(') or commits[j]['msg'].startswith('feat:') or commits[j]['msg'].startswith('state: checkpoint'):
-                    prev_ts = commits[j]['ts']
-                    break
-            if prev_ts is None:
-                prev_ts = commits[0]['ts']
+    if not commits:
+        return feats
+    prev_ts = commits[0]['ts']
+    for c in commits:
+        msg = c['msg']
+        if not msg.startswith(ANCHOR_PREFIXES):
+            continue
+        if msg.startswith(FEAT_PREFIXES):
             delta = (c['ts'] - prev_ts).total_seconds() / 60
-            feats.append({'name': c['msg'], 'hash': c['hash'], 'ts': c['ts'].strftime('%H:%M'), 'minutes': round(delta, 1), 'full_ts': c['ts']})
+            feats.append({'name': msg, 'hash': c['hash'], 'ts': c['ts'].strftime('%H:%M'), 'minutes': round(delta, 1), 'full_ts': c['ts']})
+        prev_ts = c['ts']
     return feats
 
-base = '/Users/brianfischman/auto-sdd/campaign-results'
-
-v2 = parse_git_log(f'{base}/raw/v2-sonnet/git-log.txt')
-v3 = parse_git_log(f'{base}/raw/v3-haiku/git-log.txt')
-v2_feats = extract_features(v2)
-v3_feats = extract_features(v3)
-
-# Stats
-v2_times = [f['minutes'] for f in v2_feats[1:]]
-v3_times = [f['minutes'] for f in v3_feats[1:]]
-v2_clean = [t for t in v2_times if t < 60]
-v3_clean = [t for t in v3_times if t < 60]
-
-v2_drifts = len([c for c in v2 if 'reconcile spec drift' in c['msg']])
-v3_drifts = len([c for c in v3 if 'reconcile spec drift' in c['msg']])
-
-v2_costs = [json.loads(l) for l in open(f'{base}/raw/v2-sonnet/cost-log.jsonl')]
-v3_costs = [json.loads(l) for l in open(f'{base}/raw/v3-haiku/cost-log.jsonl')]
-v2_total_cost = sum(c['cost_usd'] for c in v2_costs)
-v3_total_cost = sum(c['cost_usd'] for c in v3_costs)
+def load_costs(path):
+    # Single streaming pass: decode once per line, accumulate total, pre-format rows
+    total = 0.0
+    lines = []
+    with open(path, 'rb', buffering=1 << 20) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            c = json.loads(line)
+            cost = c.get('cost_usd') or 0.0
+            total += cost
+            lines.append(f"- {c['timestamp']}: ${cost:.2f} ({c['num_turns']} turns, {c['duration_ms']/1000:.0f}s)\n")
+    return lines, total
+
+def summarize(xs):
+    # One sort serves median/min/max; reused by per-campaign and comparison reports
+    xs = sorted(xs)
+    n = len(xs)
+    mid = n // 2
+    return {
+        'median': xs[mid] if n % 2 else (xs[mid - 1] + xs[mid]) / 2,
+        'mean': statistics.fmean(xs),
+        'min': xs[0],
+        'max': xs[-1],
+    }
 
-v2_build_h = (v2_feats[-1]['full_ts'] - v2_feats[0]['full_ts']).total_seconds() / 3600
-v3_build_h = (v3_feats[-1]['full_ts'] - v3_feats[0]['full_ts']).total_seconds() / 3600
+base = '/Users/brianfischman/auto-sdd/campaign-results'
 
-# === V2 Report ===
 def feat_table(feats):
     rows = []
     for i, f in enumerate(feats, 1):
@@ -64,7 +75,38 @@ def feat_table(feats):
         rows.append(f"| {i} | {f['ts']} | {f['minutes']:.1f}m{flag} | {f['name'][:70]} |")
     return '\n'.join(rows)
 
-v2_report = f"""# Campaign Report: stakd-v2 (Sonnet)
+def load_campaign(name):
+    commits = parse_git_log(f'{base}/raw/{name}/git-log.txt')
+    feats = extract_features(commits)
+    cost_lines, total_cost = load_costs(f'{base}/raw/{name}/cost-log.jsonl')
+    return commits, feats, cost_lines, total_cost
+
+def main():
+    # V2 and V3 ingestion are independent; parse them in parallel processes
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        v2_future = pool.submit(load_campaign, 'v2-sonnet')
+        v3_future = pool.submit(load_campaign, 'v3-haiku')
+        v2, v2_feats, v2_cost_lines, v2_total_cost = v2_future.result()
+        v3, v3_feats, v3_cost_lines, v3_total_cost = v3_future.result()
+
+    # Stats
+    v2_times = [f['minutes'] for f in v2_feats[1:]]
+    v3_times = [f['minutes'] for f in v3_feats[1:]]
+    v2_clean = [t for t in v2_times if t < 60]
+    v3_clean = [t for t in v3_times if t < 60]
+    v2s = summarize(v2_clean)
+    v3s = summarize(v3_clean)
+
+    v2_drifts = sum(1 for c in v2 if 'reconcile spec drift' in c['msg'])
+    v3_drifts = sum(1 for c in v3 if 'reconcile spec drift' in c['msg'])
+    v2_outliers = sum(1 for t in v2_times if t >= 60)
+    v3_outliers = sum(1 for t in v3_times if t >= 60)
+
+    v2_build_h = (v2_feats[-1]['full_ts'] - v2_feats[0]['full_ts']).total_seconds() / 3600
+    v3_build_h = (v3_feats[-1]['full_ts'] - v3_feats[0]['full_ts']).total_seconds() / 3600
+
+    # === V2 Report ===
+    v2_header = f"""# Campaign Report: stakd-v2 (Sonnet)
 
 ## Summary
 
@@ -74,10 +116,10 @@ v2_report = f"""# Campaign Report: stakd-v2 (Sonnet)
 | Features built | {len(v2_feats)} / 28 |
 | Build window | {v2_feats[0]['ts']} – {v2_feats[-1]['ts']} EST ({v2_build_h:.1f}h) |
 | Throughput | {len(v2_feats)/v2_build_h:.1f} features/hour |
-| Median feature time | {statistics.median(v2_clean):.1f} min |
-| Mean feature time | {statistics.mean(v2_clean):.1f} min |
-| Min / Max (clean) | {min(v2_clean):.1f} min / {max(v2_clean):.1f} min |
-| Outliers (>60m) | {len([t for t in v2_times if t >= 60])} |
+| Median feature time | {v2s['median']:.1f} min |
+| Mean feature time | {v2s['mean']:.1f} min |
+| Min / Max (clean) | {v2s['min']:.1f} min / {v2s['max']:.1f} min |
+| Outliers (>60m) | {v2_outliers} |
 | Total API cost (logged) | ${v2_total_cost:.2f} |
 | Cost per feature | ${v2_total_cost/len(v2_feats):.2f} |
 | Drift reconciliations | {v2_drifts} / {len(v2_feats)} ({v2_drifts/len(v2_feats)*100:.0f}%) |
@@ -102,15 +144,13 @@ v2_report = f"""# Campaign Report: stakd-v2 (Sonnet)
 
 """
 
-for c in v2_costs:
-    v2_report += f"- {c['timestamp']}: ${c['cost_usd']:.2f} ({c['num_turns']} turns, {c['duration_ms']/1000:.0f}s)\n"
+    v2_report = ''.join([v2_header, *v2_cost_lines])
 
-with open(f'{base}/reports/v2-sonnet/campaign-report.md', 'w') as f:
-    f.write(v2_report)
-print("Wrote v2 report")
+    Path(f'{base}/reports/v2-sonnet/campaign-report.md').write_bytes(v2_report.encode('utf-8'))
+    print("Wrote v2 report")
 
-# === V3 Report ===
-v3_report = f"""# Campaign Report: stakd-v3 (Haiku 4.5)
+    # === V3 Report ===
+    v3_header = f"""# Campaign Report: stakd-v3 (Haiku 4.5)
 
 ## Summary
 
@@ -120,10 +160,10 @@ v3_report = f"""# Campaign Report: stakd-v3 (Haiku 4.5)
 | Features built | {len(v3_feats)} / 28 |
 | Build window | {v3_feats[0]['ts']} – {v3_feats[-1]['ts']} EST ({v3_build_h:.1f}h) |
 | Throughput | {len(v3_feats)/v3_build_h:.1f} features/hour |
-| Median feature time | {statistics.median(v3_clean):.1f} min |
-| Mean feature time | {statistics.mean(v3_clean):.1f} min |
-| Min / Max (clean) | {min(v3_clean):.1f} min / {max(v3_clean):.1f} min |
-| Outliers (>60m) | {len([t for t in v3_times if t >= 60])} |
+| Median feature time | {v3s['median']:.1f} min |
+| Mean feature time | {v3s['mean']:.1f} min |
+| Min / Max (clean) | {v3s['min']:.1f} min / {v3s['max']:.1f} min |
+| Outliers (>60m) | {v3_outliers} |
 | Total API cost (logged) | ${v3_total_cost:.2f} |
 | Cost per feature | ${v3_total_cost/len(v3_feats):.2f} |
 | Drift reconciliations | {v3_drifts} / {len(v3_feats)} ({v3_drifts/len(v3_feats)*100:.0f}%) |
@@ -148,10 +188,7 @@ v3_report = f"""# Campaign Report: stakd-v3 (Haiku 4.5)
 
 """
 
-for c in v3_costs:
-    v3_report += f"- {c['timestamp']}: ${c['cost_usd']:.2f} ({c['num_turns']} turns, {c['duration_ms']/1000:.0f}s)\n"
-
-v3_report += """
+    v3_sidecar = """
 ## Sidecar Eval Summary
 
 Three eval checkpoints captured:
@@ -164,12 +201,13 @@ Three eval checkpoints captured:
    - Bookkeeping commit correctly separated from implementation
 """
 
-with open(f'{base}/reports/v3-haiku/campaign-report.md', 'w') as f:
-    f.write(v3_report)
-print("Wrote v3 report")
+    v3_report = ''.join([v3_header, *v3_cost_lines, v3_sidecar])
 
-# === Comparison Report ===
-comparison = f"""# Campaign Comparison: Sonnet vs Haiku
+    Path(f'{base}/reports/v3-haiku/campaign-report.md').write_bytes(v3_report.encode('utf-8'))
+    print("Wrote v3 report")
+
+    # === Comparison Report ===
+    comparison = f"""# Campaign Comparison: Sonnet vs Haiku
 
 ## Head-to-Head
 
@@ -178,11 +216,11 @@ comparison = f"""# Campaign Comparison: Sonnet vs Haiku
 | Features built | {len(v2_feats)} | {len(v3_feats)} | — (campaigns in progress) |
 | Build window | {v2_build_h:.1f}h | {v3_build_h:.1f}h | — |
 | **Throughput** | **{len(v2_feats)/v2_build_h:.1f} feat/h** | **{len(v3_feats)/v3_build_h:.1f} feat/h** | **~equal** |
-| Median feature time | {statistics.median(v2_clean):.1f} min | {statistics.median(v3_clean):.1f} min | {statistics.median(v3_clean) - statistics.median(v2_clean):+.1f} min |
-| Mean feature time | {statistics.mean(v2_clean):.1f} min | {statistics.mean(v3_clean):.1f} min | {statistics.mean(v3_clean) - statistics.mean(v2_clean):+.1f} min |
+| Median feature time | {v2s['median']:.1f} min | {v3s['median']:.1f} min | {v3s['median'] - v2s['median']:+.1f} min |
+| Mean feature time | {v2s['mean']:.1f} min | {v3s['mean']:.1f} min | {v3s['mean'] - v2s['mean']:+.1f} min |
 | Cost per feature | ${v2_total_cost/len(v2_feats):.2f} | ${v3_total_cost/len(v3_feats):.2f} | ~equal |
 | Drift rate | {v2_drifts/len(v2_feats)*100:.0f}% | {v3_drifts/len(v3_feats)*100:.0f}% | ~equal |
-| Outliers (>60m) | {len([t for t in v2_times if t >= 60])} | {len([t for t in v3_times if t >= 60])} | — |
+| Outliers (>60m) | {v2_outliers} | {v3_outliers} | — |
 
 ## Key Findings
 
@@ -229,12 +267,11 @@ The 85.9-minute outlier (User settings & profile edit, v2) and 34.9-minute outli
 Generated: 2026-02-27
 """
 
-with open(f'{base}/reports/campaign-comparison.md', 'w') as f:
-    f.write(comparison)
-print("Wrote comparison report")
+    Path(f'{base}/reports/campaign-comparison.md').write_bytes(comparison.encode('utf-8'))
+    print("Wrote comparison report")
 
-# === README ===
-readme = """# campaign-results/
+    # === README ===
+    readme = """# campaign-results/
 
 Live testing data from auto-sdd v2.0.0 build campaigns on the stakd application.
 
@@ -275,7 +312,9 @@ python3 generate-reports.py
 Reports are generated from raw data (git logs, cost logs, eval JSONs). Re-run after campaigns complete for final numbers.
 """
 
-with open(f'{base}/README.md', 'w') as f:
-    f.write(readme)
-print("Wrote README")
-print("\\nAll reports generated.")
+    Path(f'{base}/README.md').write_bytes(readme.encode('utf-8'))
+    print("Wrote README")
+    print("\\nAll reports generated.")
+
+if __name__ == '__main__':
+    main()
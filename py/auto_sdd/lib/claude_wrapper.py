@@ -14,6 +14,25 @@
 #   of these fields for format compatibility with existing bash consumers.
 # - AgentTimeoutError and other exceptions defined inline because shared
 #   errors.py does not exist yet (Phase 1).
+# - JSON decode/encode uses orjson when it is importable (optional
+#   accelerator, not a declared dependency) and falls back to stdlib json.
+#   orjson emits compact separators, matching the bash `jq -c` cost log;
+#   the stdlib fallback is configured to write the same bytes.
+# - Claude stdout is captured as bytes and fed to the JSON decoder directly;
+#   stdout/stderr are only decoded (errors="replace") on the error paths.
+# - Claude stdout is redirected to an anonymous temp file rather than a pipe.
+# - Bash re-opens the cost log for every record; Python keeps one buffered
+#   append handle per log path (_CostLogWriter), flushed per record by default.
+# - Token counts are extracted from usage once per call (_usage_tokens) and
+#   shared by ClaudeResult and the cost record.
+# - ClaudeSession (new; no bash equivalent) keeps one `claude -p` process alive
+#   and feeds it prompts over stream-json, for callers whose turns share a
+#   conversation.  run_claude remains one process per call.
+# - run_claude(system_prompt=...) (new) passes stable instructions through
+#   --append-system-prompt so the CLI can serve them from the prompt cache;
+#   ClaudeResult carries the cache token counts to confirm hits.
+# - run_claude_async / gather_claude (new) run independent calls concurrently
+#   on asyncio subprocesses, sharing run_claude's parsing and logging.
 """Wrapper around the Claude CLI.
 
 Invokes the ``claude`` command-line tool with ``--output-format json``,
@@ -23,21 +42,42 @@ optionally appends cost/usage metadata to a JSONL log file.
 
 from __future__ import annotations
 
+import asyncio
+import atexit
 import json
 import logging
 import os
+import queue
 import re
 import subprocess
 import tempfile
+import threading
+import time
 from dataclasses import dataclass
-from datetime import datetime, timezone
 from pathlib import Path
+from typing import BinaryIO, NoReturn
+
+try:
+    import orjson  # type: ignore[import-not-found,unused-ignore]
+except ImportError:  # optional accelerator — stdlib json is the fallback
+    orjson = None  # type: ignore[assignment,unused-ignore]
 
 logger = logging.getLogger(__name__)
 
+# Appended to every ``claude`` invocation.
+_JSON_OUTPUT_ARGS = ("--output-format", "json")
+
+# Appended to a ClaudeSession's command: prompts in and events out as JSON
+# lines (the CLI requires --verbose for stream-json output with -p).
+_STREAM_JSON_ARGS = (
+    "--input-format", "stream-json",
+    "--output-format", "stream-json",
+    "--verbose",
+)
+
 # Billing-specific signals from the Anthropic API / Claude CLI stderr.
 # Intentionally narrow: must not match on feature names or build output.
-_BILLING_RE = re.compile(
+BILLING_RE = re.compile(
     r"credit_balance_too_low"
     r"|insufficient_quota"
     r"|quota.{0,10}exceeded"
@@ -80,9 +120,13 @@ class CreditExhaustionError(AutoSddError):
 # ---------------------------------------------------------------------------
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ClaudeResult:
-    """Structured result from a Claude CLI invocation."""
+    """Structured result from a Claude CLI invocation.
+
+    Immutable and slotted: results are built once by ``run_claude`` and
+    only read afterwards.
+    """
 
     output: str
     exit_code: int
@@ -92,6 +136,8 @@ class ClaudeResult:
     model: str | None = None
     session_id: str | None = None
     duration_ms: int | None = None
+    cache_creation_tokens: int | None = None
+    cache_read_tokens: int | None = None
 
 
 # ---------------------------------------------------------------------------
@@ -99,6 +145,57 @@ class ClaudeResult:
 # ---------------------------------------------------------------------------
 
 
+def _json_loads(raw: str | bytes) -> object:
+    """Decode JSON with orjson when available, stdlib json otherwise.
+
+    Raises ``ValueError`` on malformed input (both ``orjson.JSONDecodeError``
+    and ``json.JSONDecodeError`` subclass it).
+    """
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _json_dumps_line(record: dict[str, object]) -> bytes:
+    """Encode *record* as a single UTF-8 JSONL line (trailing newline)."""
+    if orjson is not None:
+        line: bytes = orjson.dumps(record)
+        return line + b"\n"
+    # Same bytes as the orjson path: compact separators and raw UTF-8.
+    return (
+        json.dumps(record, separators=(",", ":"), ensure_ascii=False) + "\n"
+    ).encode("utf-8")
+
+
+# (epoch second, formatted timestamp) of the last _utc_timestamp() call.
+_timestamp_cache: tuple[int, str] = (-1, "")
+
+
+def _utc_timestamp() -> str:
+    """Current UTC time as ``YYYY-MM-DDTHH:MM:SSZ`` (the bash cost-log format).
+
+    The format has one-second resolution, so the string is rebuilt only
+    when the epoch second changes; calls within the same second reuse it.
+    """
+    global _timestamp_cache
+    now = int(time.time())
+    cached_second, cached = _timestamp_cache
+    if now == cached_second:
+        return cached
+    t = time.gmtime(now)
+    stamp = (
+        f"{t.tm_year:04d}-{t.tm_mon:02d}-{t.tm_mday:02d}"
+        f"T{t.tm_hour:02d}:{t.tm_min:02d}:{t.tm_sec:02d}Z"
+    )
+    _timestamp_cache = (now, stamp)
+    return stamp
+
+
+def _preview(raw: bytes, limit: int = 200) -> str:
+    """Decode the first *limit* bytes of raw CLI output for error messages."""
+    return raw[:limit].decode("utf-8", errors="replace")
+
+
 def _dominant_model(model_usage: dict[str, dict[str, int]]) -> str:
     """Return the model name with the highest total token count.
 
@@ -108,24 +205,51 @@ def _dominant_model(model_usage: dict[str, dict[str, int]]) -> str:
 
     Returns ``"unknown"`` when *model_usage* is empty.
     """
-    if not model_usage:
-        return "unknown"
+    # On equal totals max() keeps the first entry.
+    return max(model_usage.items(), key=_model_total, default=("unknown", {}))[0]
 
-    best_model = "unknown"
-    best_total = -1
-    for model_name, counts in model_usage.items():
-        total = counts.get("input_tokens", 0) + counts.get("output_tokens", 0)
-        if total > best_total:
-            best_total = total
-            best_model = model_name
-    return best_model
 
+def _model_total(entry: tuple[str, dict[str, int]]) -> int:
+    """Input plus output tokens for one ``(model, counts)`` modelUsage entry."""
+    counts = entry[1]
+    return counts.get("input_tokens", 0) + counts.get("output_tokens", 0)
 
-def _build_cost_record(data: dict[str, object]) -> dict[str, object]:
-    """Build a JSONL cost-log record from raw Claude JSON output.
 
-    The record format matches the bash original exactly so that downstream
-    consumers (bash scripts, dashboards) can parse either source.
+# Claude ``usage`` keys for the integer token fields, in the bash cost-log
+# column order (input, output, cache_creation, cache_read).
+_USAGE_TOKEN_KEYS = (
+    "input_tokens",
+    "output_tokens",
+    "cache_creation_input_tokens",
+    "cache_read_input_tokens",
+)
+
+TokenCounts = tuple[int | None, int | None, int | None, int | None]
+
+
+def _usage_tokens(usage: dict[str, object]) -> TokenCounts:
+    """Integer token counts from a sanitized ``usage`` object.
+
+    Ordered as :data:`_USAGE_TOKEN_KEYS`; non-numeric or missing values
+    are ``None``.  ``run_claude`` extracts these once and shares them
+    between :class:`ClaudeResult` and the cost record.
+    """
+    it, ot, cc, cr = (
+        int(val) if isinstance(val, (int, float)) else None
+        for val in map(usage.get, _USAGE_TOKEN_KEYS)
+    )
+    return it, ot, cc, cr
+
+
+def _sanitize_claude_payload(
+    data: dict[str, object],
+) -> tuple[dict[str, object], dict[str, dict[str, int]]]:
+    """Validate ``usage`` and ``modelUsage`` from Claude JSON in one place.
+
+    Returns ``(usage, model_usage)``: *usage* is ``data["usage"]`` or ``{}``
+    when it is not an object; *model_usage* keeps only str→{str: int}
+    entries.  ``run_claude`` calls this once and hands the result to
+    :func:`_build_cost_record`.
     """
     usage: dict[str, object] = {}
     raw_usage = data.get("usage")
@@ -141,34 +265,237 @@ def _build_cost_record(data: dict[str, object]) -> dict[str, object]:
                     sk: sv for sk, sv in v.items()
                     if isinstance(sk, str) and isinstance(sv, int)
                 }
+    return usage, model_usage
 
-    def _int_or_none(val: object) -> int | None:
-        return int(val) if isinstance(val, (int, float)) else None
 
+def _build_cost_record(
+    data: dict[str, object],
+    model: str | None = None,
+    usage: dict[str, object] | None = None,
+    tokens: TokenCounts | None = None,
+) -> dict[str, object]:
+    """Build a JSONL cost-log record from raw Claude JSON output.
+
+    The record format matches the bash original exactly so that downstream
+    consumers (bash scripts, dashboards) can parse either source.
+
+    *model*, *usage* and *tokens* are the values ``run_claude`` already
+    derived via :func:`_sanitize_claude_payload` and :func:`_usage_tokens`;
+    when omitted they are computed here.
+    """
+    if model is None or usage is None:
+        usage, model_usage = _sanitize_claude_payload(data)
+        if model is None:
+            model = _dominant_model(model_usage)
+    if tokens is None:
+        tokens = _usage_tokens(usage)
+
+    input_tokens, output_tokens, cache_creation_tokens, cache_read_tokens = tokens
+    get = data.get
+    # One literal, keys in the bash cost-log column order.
     return {
-        "timestamp": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
-        "cost_usd": data.get("total_cost_usd"),
-        "input_tokens": _int_or_none(usage.get("input_tokens")),
-        "output_tokens": _int_or_none(usage.get("output_tokens")),
-        "cache_creation_tokens": _int_or_none(usage.get("cache_creation_input_tokens")),
-        "cache_read_tokens": _int_or_none(usage.get("cache_read_input_tokens")),
-        "duration_ms": data.get("duration_ms"),
-        "duration_api_ms": data.get("duration_api_ms"),
-        "num_turns": data.get("num_turns"),
-        "model": _dominant_model(model_usage),
-        "session_id": data.get("session_id"),
-        "stop_reason": data.get("stop_reason"),
+        "timestamp": _utc_timestamp(),
+        "cost_usd": get("total_cost_usd"),
+        "input_tokens": input_tokens,
+        "output_tokens": output_tokens,
+        "cache_creation_tokens": cache_creation_tokens,
+        "cache_read_tokens": cache_read_tokens,
+        "duration_ms": get("duration_ms"),
+        "duration_api_ms": get("duration_api_ms"),
+        "num_turns": get("num_turns"),
+        "model": model,
+        "session_id": get("session_id"),
+        "stop_reason": get("stop_reason"),
     }
 
 
-def _append_cost_log(path: Path, record: dict[str, object]) -> None:
+class _CostLogWriter:
+    """Long-lived buffered append handles for JSONL cost logs, keyed by path.
+
+    A campaign calls ``run_claude`` hundreds of times against the same cost
+    log; holding the handle open saves an open/close pair per record.
+    Records are flushed every *flush_every* writes (default 1, so a crash
+    loses nothing); callers that pass ``flush=False`` defer the flush until
+    the next flushing write, :meth:`flush_all`, or interpreter exit.
+    """
+
+    def __init__(self, flush_every: int = 1) -> None:
+        self.flush_every = flush_every
+        self._handles: dict[Path, BinaryIO] = {}
+        self._pending: dict[Path, int] = {}
+        self._lock = threading.Lock()
+        atexit.register(self.close_all)
+
+    def write(self, path: Path, line: bytes, *, flush: bool = True) -> None:
+        """Append *line* to *path*, opening (and creating parents) on first use."""
+        with self._lock:
+            f = self._handles.get(path)
+            if f is None or f.closed:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                f = open(path, "ab", buffering=1 << 16)
+                self._handles[path] = f
+            try:
+                f.write(line)
+                pending = self._pending.get(path, 0) + 1
+                if flush and pending >= self.flush_every:
+                    f.flush()
+                    pending = 0
+            except OSError:
+                # A failed flush leaves the buffer wedged; drop the handle
+                # so the next write starts over with a fresh open.
+                self._discard(path)
+                raise
+            self._pending[path] = pending
+
+    def _discard(self, path: Path) -> None:
+        """Forget *path*'s handle, closing it without raising."""
+        f = self._handles.pop(path, None)
+        self._pending.pop(path, None)
+        if f is not None:
+            try:
+                f.close()
+            except OSError:
+                logger.debug("Error closing cost log %s", path, exc_info=True)
+
+    def flush_all(self) -> None:
+        """Flush every open handle."""
+        with self._lock:
+            for path, f in self._handles.items():
+                if not f.closed:
+                    f.flush()
+                self._pending[path] = 0
+
+    def close_all(self) -> None:
+        """Flush and close every open handle."""
+        with self._lock:
+            for f in self._handles.values():
+                if not f.closed:
+                    f.close()
+            self._handles.clear()
+            self._pending.clear()
+
+
+_cost_log_writer = _CostLogWriter()
+
+
+def _append_cost_log(
+    path: Path, record: dict[str, object], *, flush: bool = True
+) -> None:
     """Append a single JSON record to the JSONL cost log.
 
-    Creates parent directories if they don't exist.
+    Creates parent directories if they don't exist.  With ``flush=False``
+    the record may sit in the handle's buffer until a later flush.
+    """
+    _cost_log_writer.write(path, _json_dumps_line(record), flush=flush)
+
+
+_child_env_cache: dict[str, str] | None = None
+
+
+def _child_env() -> dict[str, str]:
+    """Return the environment for ``claude`` subprocesses.
+
+    Built from ``os.environ`` on first use and reused for every later call,
+    so a campaign doesn't re-copy the whole process environment per spawn.
+    Code that mutates ``os.environ`` after the first ``run_claude`` call must
+    call :func:`refresh_child_env`.
+    """
+    global _child_env_cache
+    if _child_env_cache is None:
+        # Strip CLAUDECODE from the child environment to prevent nested-session
+        # detection — mirrors ``unset CLAUDECODE`` in the bash wrapper.
+        env = {k: v for k, v in os.environ.items() if k != "CLAUDECODE"}
+        # Force development mode so package managers install devDependencies.
+        # Without this, a parent shell with NODE_ENV=production silently
+        # breaks builds by skipping devDeps (tailwind, vitest, etc.).
+        env["NODE_ENV"] = "development"
+        _child_env_cache = env
+    return _child_env_cache
+
+
+def refresh_child_env() -> None:
+    """Drop the cached child environment so the next call rebuilds it."""
+    global _child_env_cache
+    _child_env_cache = None
+
+
+def _claude_cmd(
+    args: list[str], system_prompt: str | None, timeout: int
+) -> list[str]:
+    """Build (and log) the one-shot ``claude`` command line."""
+    cmd = ["claude", *args]
+    if system_prompt is not None:
+        cmd += ["--append-system-prompt", system_prompt]
+    cmd += _JSON_OUTPUT_ARGS
+    # The prompt is one of the args and can run to megabytes; only pay for
+    # the join when the line will actually be emitted.
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Running: %s (timeout=%ds)", " ".join(cmd), timeout)
+    return cmd
+
+
+def _raise_for_exit(
+    returncode: int, cmd: list[str], raw_stdout: bytes, raw_stderr: bytes
+) -> NoReturn:
+    """Log diagnostics for a non-zero ``claude`` exit and raise.
+
+    Raises:
+        CreditExhaustionError: If the output carries billing signals.
+        subprocess.CalledProcessError: Otherwise.
     """
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with open(path, "a") as f:
-        f.write(json.dumps(record) + "\n")
+    stdout = raw_stdout.decode("utf-8", errors="replace")
+    stderr = raw_stderr.decode("utf-8", errors="replace")
+    diag_parts: list[str] = [
+        f"claude exited with code {returncode}"
+    ]
+    if stderr:
+        diag_parts.append(f"=== claude stderr ===\n{stderr}")
+    if stdout:
+        diag_parts.append(f"=== claude stdout ===\n{stdout}")
+    diag = "\n".join(diag_parts)
+    logger.error("WRAPPER_ERROR: %s", diag)
+    # Raise a dedicated error for billing failures so callers can halt
+    # without retrying, rather than scanning output text downstream.
+    combined = stderr + stdout
+    if BILLING_RE.search(combined):
+        raise CreditExhaustionError(
+            f"API credit/billing error (exit {returncode}): {combined[:300]}"
+        )
+    raise subprocess.CalledProcessError(
+        returncode, cmd, output=stdout, stderr=stderr
+    )
+
+
+def _parse_claude_output(raw_stdout: bytes) -> dict[str, object]:
+    """Decode successful ``claude`` stdout into its JSON object.
+
+    Raises:
+        ClaudeOutputError: If the output is not a JSON object with ``.result``.
+    """
+    try:
+        data = _json_loads(raw_stdout)
+    except ValueError as exc:
+        preview = _preview(raw_stdout)
+        logger.error("Claude returned non-JSON output: %s", preview)
+        raise ClaudeOutputError(
+            "claude did not return valid JSON. "
+            f"Raw output (first 200 chars): {preview}"
+        ) from exc
+
+    if not isinstance(data, dict):
+        raise ClaudeOutputError(
+            f"Expected JSON object, got {type(data).__name__}"
+        )
+
+    if "result" not in data:
+        preview = _preview(raw_stdout)
+        logger.error("Claude JSON missing .result field: %s", preview)
+        raise ClaudeOutputError(
+            "claude JSON response has no .result field. "
+            f"Raw output (first 200 chars): {preview}"
+        )
+
+    return data
 
 
 # ---------------------------------------------------------------------------
@@ -186,7 +513,7 @@ def _log_token_usage(
     )
 
     record: dict[str, object] = {
-        "timestamp": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "timestamp": _utc_timestamp(),
         "activity_type": activity_type,
         "source": "claude_wrapper",
         "input_tokens": result.input_tokens,
@@ -207,6 +534,8 @@ def run_claude(
     timeout: int = 600,
     cwd: Path | str | None = None,
     activity_type: str = "agent_call",
+    cost_log_flush: bool = True,
+    system_prompt: str | None = None,
 ) -> ClaudeResult:
     """Invoke the ``claude`` CLI, extract the result, and optionally log cost.
 
@@ -222,6 +551,15 @@ def run_claude(
         activity_type: Label for this call in the estimates log (e.g.,
             ``"build_feature"``, ``"eval_sidecar"``).  Defaults to
             ``"agent_call"``.
+        cost_log_flush: Flush the cost-log record to disk before returning.
+            Batch callers can pass ``False`` and rely on a later flush
+            (or interpreter exit) to amortize writes.
+        system_prompt: Instructions appended to the CLI's system prompt via
+            ``--append-system-prompt``.  Text that is identical across
+            calls belongs here rather than in the prompt: the CLI sends
+            the system prompt as a cacheable prefix, so repeat calls are
+            billed at the prompt-cache read rate (see
+            ``ClaudeResult.cache_read_tokens``).
 
     Returns:
         :class:`ClaudeResult` with parsed output and cost metadata.
@@ -232,133 +570,94 @@ def run_claude(
         ClaudeOutputError: If ``claude`` succeeds (exit 0) but returns
             invalid JSON or JSON without a ``.result`` field.
     """
-    cmd = ["claude", *args, "--output-format", "json"]
-
-    # Strip CLAUDECODE from the child environment to prevent nested-session
-    # detection — mirrors ``unset CLAUDECODE`` in the bash wrapper.
-    env = {k: v for k, v in os.environ.items() if k != "CLAUDECODE"}
-    # Force development mode so package managers install devDependencies.
-    # Without this, a parent shell with NODE_ENV=production silently
-    # breaks builds by skipping devDeps (tailwind, vitest, etc.).
-    env["NODE_ENV"] = "development"
-
-    logger.info("Running: %s (timeout=%ds)", " ".join(cmd), timeout)
-
-    try:
-        proc = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=timeout,
-            env=env,
-            cwd=cwd,
-        )
-    except subprocess.TimeoutExpired as exc:
-        logger.error("Claude timed out after %ds", timeout)
-        raise AgentTimeoutError(
-            f"Claude agent exceeded {timeout}s timeout"
-        ) from exc
-
-    stdout = proc.stdout or ""
-    stderr = proc.stderr or ""
-
-    # --- Non-zero exit: surface diagnostics and raise -----------------------
-    if proc.returncode != 0:
-        diag_parts: list[str] = [
-            f"claude exited with code {proc.returncode}"
-        ]
-        if stderr:
-            diag_parts.append(f"=== claude stderr ===\n{stderr}")
-        if stdout:
-            diag_parts.append(f"=== claude stdout ===\n{stdout}")
-        diag = "\n".join(diag_parts)
-        logger.error("WRAPPER_ERROR: %s", diag)
-        # Raise a dedicated error for billing failures so callers can halt
-        # without retrying, rather than scanning output text downstream.
-        combined = stderr + stdout
-        if _BILLING_RE.search(combined):
-            raise CreditExhaustionError(
-                f"API credit/billing error (exit {proc.returncode}): {combined[:300]}"
+    cmd = _claude_cmd(args, system_prompt, timeout)
+    env = _child_env()
+
+    # The child writes stdout straight into an anonymous temp file and we
+    # read it back in one call, instead of draining a pipe in small chunks
+    # into a growing buffer.  It stays bytes: the JSON decoder consumes it
+    # directly, so a multi-megabyte response is never copied through a str
+    # decode.  stderr is small and still goes through a pipe.
+    with tempfile.TemporaryFile() as stdout_file:
+        try:
+            proc = subprocess.run(
+                cmd,
+                stdout=stdout_file,
+                stderr=subprocess.PIPE,
+                timeout=timeout,
+                env=env,
+                cwd=cwd,
             )
-        raise subprocess.CalledProcessError(
-            proc.returncode, cmd, output=stdout, stderr=stderr
-        )
+        except subprocess.TimeoutExpired as exc:
+            logger.error("Claude timed out after %ds", timeout)
+            raise AgentTimeoutError(
+                f"Claude agent exceeded {timeout}s timeout"
+            ) from exc
+        stdout_file.seek(0)
+        raw_stdout = stdout_file.read()
 
-    # --- Success path: parse JSON -------------------------------------------
-    try:
-        data: dict[str, object] = json.loads(stdout)
-    except (json.JSONDecodeError, ValueError) as exc:
-        logger.error("Claude returned non-JSON output: %s", stdout[:200])
-        raise ClaudeOutputError(
-            "claude did not return valid JSON. "
-            f"Raw output (first 200 chars): {stdout[:200]}"
-        ) from exc
+    if proc.returncode != 0:
+        _raise_for_exit(proc.returncode, cmd, raw_stdout, proc.stderr or b"")
+    data = _parse_claude_output(raw_stdout)
+
+    return _complete_claude_call(
+        data,
+        proc.returncode,
+        cost_log_path=cost_log_path,
+        activity_type=activity_type,
+        cost_log_flush=cost_log_flush,
+    )
 
-    if not isinstance(data, dict):
-        raise ClaudeOutputError(
-            f"Expected JSON object, got {type(data).__name__}"
-        )
 
-    if "result" not in data:
-        logger.error("Claude JSON missing .result field: %s", stdout[:200])
-        raise ClaudeOutputError(
-            "claude JSON response has no .result field. "
-            f"Raw output (first 200 chars): {stdout[:200]}"
-        )
+def _complete_claude_call(
+    data: dict[str, object],
+    exit_code: int,
+    *,
+    cost_log_path: Path | None,
+    activity_type: str,
+    cost_log_flush: bool,
+) -> ClaudeResult:
+    """Build the :class:`ClaudeResult` for a validated Claude payload.
 
+    Shared tail of :func:`run_claude` and :meth:`ClaudeSession.run`:
+    extracts metadata, appends the cost record, and logs token usage.
+    """
     result_text = data.get("result")
     output = str(result_text) if result_text is not None else ""
 
     # Extract metadata for ClaudeResult
-    usage: dict[str, object] = {}
-    raw_usage = data.get("usage")
-    if isinstance(raw_usage, dict):
-        usage = raw_usage
-
-    raw_model_usage = data.get("modelUsage")
-    model_usage: dict[str, dict[str, int]] = {}
-    if isinstance(raw_model_usage, dict):
-        for k, v in raw_model_usage.items():
-            if isinstance(k, str) and isinstance(v, dict):
-                model_usage[k] = {
-                    sk: sv for sk, sv in v.items()
-                    if isinstance(sk, str) and isinstance(sv, int)
-                }
-
-    def _float_or_none(val: object) -> float | None:
-        return float(val) if isinstance(val, (int, float)) else None
+    usage, model_usage = _sanitize_claude_payload(data)
 
-    def _int_or_none(val: object) -> int | None:
-        return int(val) if isinstance(val, (int, float)) else None
-
-    def _str_or_none(val: object) -> str | None:
-        return str(val) if val is not None else None
-
-    cost_usd = _float_or_none(data.get("total_cost_usd"))
-    input_tokens = _int_or_none(usage.get("input_tokens"))
-    output_tokens = _int_or_none(usage.get("output_tokens"))
+    raw_cost = data.get("total_cost_usd")
+    cost_usd = float(raw_cost) if isinstance(raw_cost, (int, float)) else None
+    tokens = _usage_tokens(usage)
+    input_tokens, output_tokens, cache_creation_tokens, cache_read_tokens = tokens
     model = _dominant_model(model_usage)
-    session_id = _str_or_none(data.get("session_id"))
-    duration_ms = _int_or_none(data.get("duration_ms"))
+    raw_session = data.get("session_id")
+    session_id = str(raw_session) if raw_session is not None else None
+    raw_duration = data.get("duration_ms")
+    duration_ms = int(raw_duration) if isinstance(raw_duration, (int, float)) else None
 
     # Log cost data if a log path was provided
     if cost_log_path is not None:
         try:
-            record = _build_cost_record(data)
-            _append_cost_log(cost_log_path, record)
+            record = _build_cost_record(data, model, usage, tokens)
+            _append_cost_log(cost_log_path, record, flush=cost_log_flush)
             logger.info("Cost logged to %s", cost_log_path)
         except OSError:
             logger.warning("Failed to write cost log to %s", cost_log_path, exc_info=True)
 
     claude_result = ClaudeResult(
         output=output,
-        exit_code=proc.returncode,
+        exit_code=exit_code,
         cost_usd=cost_usd,
         input_tokens=input_tokens,
         output_tokens=output_tokens,
         model=model,
         session_id=session_id,
         duration_ms=duration_ms,
+        cache_creation_tokens=cache_creation_tokens,
+        cache_read_tokens=cache_read_tokens,
     )
 
     # Log token usage to general estimates (best-effort, never fails the call)
@@ -368,11 +667,340 @@ def run_claude(
         logger.debug("Failed to log token usage", exc_info=True)
 
     logger.info(
-        "Claude completed: exit=%d, cost=$%s, tokens_in=%s, tokens_out=%s",
+        "Claude completed: exit=%d, cost=$%s, tokens_in=%s, tokens_out=%s, "
+        "cache_read=%s",
         claude_result.exit_code,
         claude_result.cost_usd,
         claude_result.input_tokens,
         claude_result.output_tokens,
+        claude_result.cache_read_tokens,
     )
 
     return claude_result
+
+
+# ---------------------------------------------------------------------------
+# Async API
+# ---------------------------------------------------------------------------
+
+
+async def run_claude_async(
+    args: list[str],
+    *,
+    cost_log_path: Path | None = None,
+    timeout: int = 600,
+    cwd: Path | str | None = None,
+    activity_type: str = "agent_call",
+    cost_log_flush: bool = True,
+    system_prompt: str | None = None,
+) -> ClaudeResult:
+    """Async counterpart of :func:`run_claude`, with the same arguments.
+
+    The ``claude`` process runs under :func:`asyncio.create_subprocess_exec`
+    so independent calls can be in flight together (see
+    :func:`gather_claude`).  The cost-log and estimates appends run in a
+    worker thread to keep file I/O off the event loop.  Cancelling the
+    awaiting task kills the process.
+
+    Raises:
+        The same exceptions as :func:`run_claude`.
+    """
+    cmd = _claude_cmd(args, system_prompt, timeout)
+    proc = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        env=_child_env(),
+        cwd=cwd,
+    )
+    try:
+        raw_stdout, raw_stderr = await asyncio.wait_for(
+            proc.communicate(), timeout
+        )
+    except TimeoutError as exc:
+        logger.error("Claude timed out after %ds", timeout)
+        proc.kill()
+        await proc.wait()
+        raise AgentTimeoutError(
+            f"Claude agent exceeded {timeout}s timeout"
+        ) from exc
+    except asyncio.CancelledError:
+        # Reap before propagating so the transport and pipes are closed
+        # while the loop is still running.
+        proc.kill()
+        await proc.wait()
+        raise
+
+    returncode = proc.returncode if proc.returncode is not None else -1
+    if returncode != 0:
+        _raise_for_exit(returncode, cmd, raw_stdout, raw_stderr)
+    data = _parse_claude_output(raw_stdout)
+
+    return await asyncio.to_thread(
+        _complete_claude_call,
+        data,
+        returncode,
+        cost_log_path=cost_log_path,
+        activity_type=activity_type,
+        cost_log_flush=cost_log_flush,
+    )
+
+
+async def gather_claude(
+    arg_lists: list[list[str]],
+    *,
+    max_concurrency: int = 4,
+    cost_log_path: Path | None = None,
+    timeout: int = 600,
+    cwd: Path | str | None = None,
+    activity_type: str = "agent_call",
+    cost_log_flush: bool = True,
+    system_prompt: str | None = None,
+) -> list[ClaudeResult]:
+    """Run independent ``claude`` calls concurrently; results keep input order.
+
+    The keyword arguments apply to every call, as for
+    :func:`run_claude_async`.  At most *max_concurrency* processes run at
+    once.  If any call raises, the others are cancelled (their processes
+    killed and reaped) and that error is re-raised as-is, so callers catch
+    the same exceptions as for :func:`run_claude`.
+    """
+    gate = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def _one(args: list[str]) -> ClaudeResult:
+        async with gate:
+            return await run_claude_async(
+                args,
+                cost_log_path=cost_log_path,
+                timeout=timeout,
+                cwd=cwd,
+                activity_type=activity_type,
+                cost_log_flush=cost_log_flush,
+                system_prompt=system_prompt,
+            )
+
+    try:
+        async with asyncio.TaskGroup() as group:
+            tasks = [group.create_task(_one(args)) for args in arg_lists]
+    except ExceptionGroup as failures:
+        raise failures.exceptions[0] from None
+    return [task.result() for task in tasks]
+
+
+# ---------------------------------------------------------------------------
+# Persistent session
+# ---------------------------------------------------------------------------
+
+
+def _pump_lines(stream: BinaryIO, sink: queue.Queue[bytes | None]) -> None:
+    """Copy *stream* into *sink* line by line; ``None`` marks EOF."""
+    for line in iter(stream.readline, b""):
+        sink.put(line)
+    sink.put(None)
+
+
+class ClaudeSession:
+    """A long-lived ``claude -p`` process that takes prompts over stdin.
+
+    Each :meth:`run` writes one stream-json user message and reads events
+    until that turn's ``result`` event, so N prompts pay the CLI's startup
+    once instead of N times.  The process is started on first use and
+    restarted if it dies.
+
+    Turns share one conversation.  Use a session only for prompts meant to
+    build on each other (e.g. follow-ups within one component); independent
+    calls should keep using :func:`run_claude`.  Calls from several threads
+    are serialized.
+    """
+
+    #: Seconds to wait for the CLI to exit on close or after it drops
+    #: stdout, before killing it.
+    exit_grace: float = 10
+
+    def __init__(
+        self,
+        args: list[str] | None = None,
+        *,
+        cwd: Path | str | None = None,
+    ) -> None:
+        self.cmd = ["claude", "-p", *(args or []), *_STREAM_JSON_ARGS]
+        self._cwd = cwd
+        self._proc: subprocess.Popen[bytes] | None = None
+        self._stderr: BinaryIO | None = None
+        self._lines: queue.Queue[bytes | None] = queue.Queue()
+        self._reader: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> ClaudeSession:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def run(
+        self,
+        prompt: str,
+        *,
+        cost_log_path: Path | None = None,
+        timeout: int = 600,
+        activity_type: str = "agent_call",
+        cost_log_flush: bool = True,
+    ) -> ClaudeResult:
+        """Send *prompt* as the next turn and return its result.
+
+        Keyword arguments match :func:`run_claude`; *timeout* bounds this
+        turn only.
+
+        Raises:
+            AgentTimeoutError: If the turn exceeds *timeout*.  The process
+                is killed; the next call starts a fresh one.
+            subprocess.CalledProcessError: If the process exits mid-turn.
+            CreditExhaustionError: On billing errors, from stderr or from
+                an error result.
+            ClaudeOutputError: If the turn ends in a non-billing error result.
+        """
+        with self._lock:
+            event = self._exchange(prompt, timeout)
+
+        if event.get("is_error"):
+            text = str(event.get("result") or "")
+            if BILLING_RE.search(text):
+                raise CreditExhaustionError(
+                    f"API credit/billing error in claude session: {text[:300]}"
+                )
+            raise ClaudeOutputError(
+                f"claude session turn failed ({event.get('subtype')}): {text[:200]}"
+            )
+
+        return _complete_claude_call(
+            event,
+            0,
+            cost_log_path=cost_log_path,
+            activity_type=activity_type,
+            cost_log_flush=cost_log_flush,
+        )
+
+    def close(self) -> None:
+        """End the session: close stdin so the CLI exits, then reap it."""
+        with self._lock:
+            self._stop()
+
+    def _exchange(self, prompt: str, timeout: int) -> dict[str, object]:
+        """Write one user message and return the next ``result`` event."""
+        proc = self._start()
+        message: dict[str, object] = {
+            "type": "user",
+            "message": {"role": "user", "content": prompt},
+        }
+        try:
+            assert proc.stdin is not None
+            proc.stdin.write(_json_dumps_line(message))
+            proc.stdin.flush()
+        except OSError as exc:
+            raise self._exited() from exc
+
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                line = self._lines.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                logger.error("Claude session turn timed out after %ds", timeout)
+                self._stop(kill=True)
+                raise AgentTimeoutError(
+                    f"Claude agent exceeded {timeout}s timeout"
+                ) from None
+            if line is None:
+                raise self._exited()
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                event = _json_loads(line)
+            except ValueError:
+                logger.debug("Skipping non-JSON session output: %s", _preview(line))
+                continue
+            if isinstance(event, dict) and event.get("type") == "result":
+                return event
+
+    def _start(self) -> subprocess.Popen[bytes]:
+        """Return the running process, starting (or restarting) it."""
+        if self._proc is not None and self._proc.poll() is None:
+            return self._proc
+        self._stop()
+        logger.info("Starting claude session: %s", " ".join(self.cmd))
+        self._stderr = tempfile.TemporaryFile()
+        proc = subprocess.Popen(
+            self.cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=self._stderr,
+            env=_child_env(),
+            cwd=self._cwd,
+        )
+        assert proc.stdout is not None
+        self._lines = queue.Queue()
+        self._reader = threading.Thread(
+            target=_pump_lines,
+            args=(proc.stdout, self._lines),
+            name="claude-session-reader",
+            daemon=True,
+        )
+        self._reader.start()
+        self._proc = proc
+        return proc
+
+    def _exited(self) -> Exception:
+        """Reap a process that died mid-turn and describe why."""
+        proc = self._proc
+        assert proc is not None
+        # EOF on stdout doesn't prove the CLI is gone; bound the wait like
+        # _stop does rather than hang past the turn's timeout.
+        try:
+            returncode = proc.wait(timeout=self.exit_grace)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            returncode = proc.wait()
+        stderr = ""
+        if self._stderr is not None:
+            self._stderr.seek(0)
+            stderr = self._stderr.read().decode("utf-8", errors="replace")
+        self._stop()
+        logger.error(
+            "WRAPPER_ERROR: claude session exited with code %d\n%s",
+            returncode, stderr,
+        )
+        if BILLING_RE.search(stderr):
+            return CreditExhaustionError(
+                f"API credit/billing error (exit {returncode}): {stderr[:300]}"
+            )
+        return subprocess.CalledProcessError(
+            returncode, self.cmd, output="", stderr=stderr
+        )
+
+    def _stop(self, *, kill: bool = False) -> None:
+        """Terminate and reap the process, if any, and drop its stderr file."""
+        proc, self._proc = self._proc, None
+        if proc is not None:
+            if kill:
+                proc.kill()
+            if proc.stdin is not None:
+                try:
+                    proc.stdin.close()
+                except OSError:
+                    pass
+            try:
+                proc.wait(timeout=self.exit_grace)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                proc.wait()
+            # stdout belongs to the reader thread until it sees EOF; a tool
+            # process that inherited the pipe can hold it open, in which
+            # case the daemon thread is left to finish on its own.
+            reader, self._reader = self._reader, None
+            if reader is not None:
+                reader.join(timeout=1)
+                if not reader.is_alive() and proc.stdout is not None:
+                    proc.stdout.close()
+        if self._stderr is not None:
+            self._stderr.close()
+            self._stderr = None
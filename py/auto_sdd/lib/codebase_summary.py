@@ -5,14 +5,18 @@ produce a structural summary.  Falls back to an empty string on any
 failure so the build loop is never blocked.
 
 Public API:
-    generate_codebase_summary(project_dir) -> str
+    generate_codebase_summary(project_dir, *, use_cache=True) -> str
 """
 
 from __future__ import annotations
 
+import hashlib
+import io
 import logging
 import os
 import subprocess
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
@@ -26,6 +30,12 @@ _EXCLUDED_DIRS: frozenset[str] = frozenset({
 
 _FILE_TREE_CAP: int = 500
 
+# In-process memo of finished summaries, keyed by
+# (project_dir, tree hash, learnings signature).  Oldest entries are
+# evicted first once the memo holds _SUMMARY_MEMO_CAP results.
+_SUMMARY_MEMO_CAP: int = 16
+_summary_memo: OrderedDict[tuple[str, str, str], str] = OrderedDict()
+
 _AGENT_PROMPT_TEMPLATE: str = """\
 You are a codebase analyst.  Below is the file tree of a software project.
 Produce a structured summary covering:
@@ -55,24 +65,35 @@ def _generate_file_tree(project_dir: Path) -> str:
     """Walk *project_dir* and return a newline-separated listing of relative paths.
 
     Respects ``_EXCLUDED_DIRS`` and caps output at ``_FILE_TREE_CAP`` files.
+    Symlinked directories are not followed.
     """
     paths: list[str] = []
-    stack: list[Path] = [project_dir]
+    root = str(project_dir)
+    # DirEntry.path is always "<root><sep><rel>", so slicing off the root
+    # prefix gives the relative path without building a Path per file.
+    prefix_len = len(root) if root.endswith(os.sep) else len(root) + 1
+    stack: list[str] = [root]
     while stack:
         current = stack.pop()
         try:
-            entries = sorted(current.iterdir(), key=lambda p: p.name)
+            with os.scandir(current) as it:
+                entries = sorted(it, key=lambda e: e.name)
         except OSError:
             continue
         for entry in entries:
-            if entry.is_dir():
-                if entry.name not in _EXCLUDED_DIRS:
-                    stack.append(entry)
-            elif entry.is_file():
-                if len(paths) >= _FILE_TREE_CAP:
-                    paths.append(f"... (truncated at {_FILE_TREE_CAP} files)")
-                    return "\n".join(paths)
-                paths.append(str(entry.relative_to(project_dir)))
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in _EXCLUDED_DIRS:
+                        stack.append(entry.path)
+                    continue
+                if not entry.is_file():
+                    continue
+            except OSError:
+                continue
+            if len(paths) >= _FILE_TREE_CAP:
+                paths.append(f"... (truncated at {_FILE_TREE_CAP} files)")
+                return "\n".join(paths)
+            paths.append(entry.path[prefix_len:])
     paths.sort()
     return "\n".join(paths)
 
@@ -104,22 +125,21 @@ def _cache_path(project_dir: Path, tree_hash: str) -> Path:
 
 def _read_cache(project_dir: Path, tree_hash: str) -> str | None:
     """Return cached summary if it exists, otherwise ``None``."""
-    path = _cache_path(project_dir, tree_hash)
-    if path.is_file():
-        try:
-            return path.read_text(encoding="utf-8")
-        except OSError:
-            pass
-    return None
+    try:
+        return _cache_path(project_dir, tree_hash).read_text(encoding="utf-8")
+    except OSError:
+        return None
 
 
 def _write_cache(project_dir: Path, tree_hash: str, content: str) -> None:
     """Write *content* to the cache and ensure a ``.gitignore`` exists."""
     cache = _cache_dir(project_dir)
     cache.mkdir(parents=True, exist_ok=True)
-    gitignore = cache / ".gitignore"
-    if not gitignore.exists():
-        gitignore.write_text("*\n")
+    try:
+        with open(cache / ".gitignore", "x") as fh:
+            fh.write("*\n")
+    except FileExistsError:
+        pass
     _cache_path(project_dir, tree_hash).write_text(content, encoding="utf-8")
 
 
@@ -138,52 +158,164 @@ def _call_agent(project_dir: Path, file_tree: str) -> str:
     return result.output
 
 
+def _read_head_lines(path: Path, limit: int) -> list[str]:
+    """Return at most *limit* lines of *path*, split as ``str.split("\\n")`` would.
+
+    Lines are streamed so only the head of a large file is decoded.  An
+    empty file yields an empty list.
+    """
+    lines: list[str] = []
+    trailing_newline = False
+    with open(path, encoding="utf-8", errors="replace") as fh:
+        for raw in fh:
+            if len(lines) >= limit:
+                return lines
+            trailing_newline = raw.endswith("\n")
+            lines.append(raw[:-1] if trailing_newline else raw)
+    if trailing_newline and len(lines) < limit:
+        lines.append("")
+    return lines
+
+
 def _read_recent_learnings(project_dir: Path) -> str:
     """Read recent learnings from ``.specs/learnings/`` and return as text.
 
     Returns an empty string when the directory is missing or contains no
     non-empty markdown files.
     """
-    learnings_dir = project_dir / ".specs" / "learnings"
-    if not learnings_dir.is_dir():
+    try:
+        with os.scandir(project_dir / ".specs" / "learnings") as it:
+            md_entries = sorted(
+                (e for e in it if e.name.endswith(".md") and e.is_file()),
+                key=lambda e: e.name,
+            )
+    except OSError:
         return ""
 
-    md_files = sorted(learnings_dir.glob("*.md"))
-    lines: list[str] = []
     learnings_cap = 40
-
-    for md_file in md_files:
-        if not md_file.is_file():
-            continue
-        if md_file.stat().st_size == 0:
-            continue
+    buf = io.StringIO()
+    buf.write("## Recent Learnings\n\n")
+    written = 0
+    truncated = False
+
+    for entry in md_entries:
+        # One read per file: empty files are filtered on the result.
+        # Read only what the remaining budget can use, plus one line to
+        # detect truncation (and always at least one, to tell an empty
+        # file from one that would push the output over the cap).
         try:
-            content = md_file.read_text(encoding="utf-8", errors="replace")
+            file_lines = _read_head_lines(
+                Path(entry.path), max(learnings_cap - written, 1)
+            )
         except OSError:
             continue
-        lines.append(f"### {md_file.name}")
-        lines.extend(content.split("\n"))
+        if not file_lines:
+            continue
+        for line in (f"### {entry.name}", *file_lines):
+            if written == learnings_cap:
+                truncated = True
+                break
+            buf.write(line)
+            buf.write("\n")
+            written += 1
+        if truncated:
+            # The cap is reached; later files cannot change the output.
+            break
+
+    if not written:
+        return ""
 
-    if not lines:
+    if truncated:
+        buf.write(f"... (learnings truncated at {learnings_cap} lines)\n")
+
+    return buf.getvalue()
+
+
+def _learnings_signature(project_dir: Path) -> str:
+    """Return a digest of the name, mtime and size of every learnings file.
+
+    Changes whenever a file in ``.specs/learnings/`` is added, removed or
+    rewritten; an empty string when the directory can't be listed.  An
+    entry that can't be stat'ed (e.g. a dangling symlink) is left out,
+    as the learnings reader skips it too.
+    """
+    stats: list[tuple[str, int, int]] = []
+    try:
+        with os.scandir(project_dir / ".specs" / "learnings") as it:
+            for entry in it:
+                if not entry.name.endswith(".md"):
+                    continue
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+                stats.append((entry.name, st.st_mtime_ns, st.st_size))
+    except OSError:
         return ""
+    stats.sort()
+    digest = hashlib.blake2b(digest_size=16)
+    for name, mtime_ns, size in stats:
+        digest.update(f"{name}\0{mtime_ns}\0{size}\n".encode())
+    return digest.hexdigest()
 
-    capped = lines[:learnings_cap]
-    if len(lines) > learnings_cap:
-        capped.append(f"... (learnings truncated at {learnings_cap} lines)")
 
-    return "\n".join(["## Recent Learnings", "", *capped, ""])
+def _cached_or_agent_summary(
+    project_dir: Path, tree_hash: str | None, *, use_cache: bool = True
+) -> str:
+    """Return the cached summary for *tree_hash*, or ask the agent.
 
+    With ``use_cache=False`` the on-disk cache is not consulted (a fresh
+    result still overwrites it).  Returns an empty string if the agent
+    call fails.
+    """
+    # 1. Check cache — a hit never needs the file tree, so the walk is
+    #    deferred until we know the agent will run.
+    if tree_hash is not None and use_cache:
+        cached = _read_cache(project_dir, tree_hash)
+        if cached is not None:
+            logger.info("Cache hit for tree hash %s", tree_hash)
+            return cached
 
-def generate_codebase_summary(project_dir: Path) -> str:
+    # 2. Generate file tree
+    file_tree = _generate_file_tree(project_dir)
+
+    # 3. Call agent
+    agent_summary = ""
+    try:
+        agent_summary = _call_agent(project_dir, file_tree)
+    except Exception:
+        logger.warning(
+            "Agent call failed; returning empty summary", exc_info=True
+        )
+
+    # 4. Cache result (only if we got a tree hash and non-empty output)
+    if tree_hash is not None and agent_summary:
+        try:
+            _write_cache(project_dir, tree_hash, agent_summary)
+            logger.info("Cached summary for tree hash %s", tree_hash)
+        except OSError:
+            logger.warning("Failed to write cache", exc_info=True)
+
+    return agent_summary
+
+
+def generate_codebase_summary(
+    project_dir: Path, *, use_cache: bool = True
+) -> str:
     """Generate a structured codebase summary using a Claude agent.
 
     The summary is cached by git tree hash so repeated calls for the
-    same tree state are free.  If the agent call fails for any reason
-    the function returns an empty string — the build loop must never
-    crash because of summary generation.
+    same tree state are free.  Within one process the finished result
+    (summary plus learnings) is also memoized on the tree hash and the
+    learnings files' mtimes and sizes, so an unchanged project skips the
+    cache and learnings reads entirely.  If the agent call fails for any
+    reason the function returns an empty string — the build loop must
+    never crash because of summary generation.
 
     Args:
         project_dir: Absolute path to the project being scanned.
+        use_cache: When False, bypass the in-process memo and the on-disk
+            cache and regenerate; the fresh result is still stored.
 
     Returns:
         Structured plain-text summary, or empty string on failure.
@@ -202,39 +334,38 @@ def generate_codebase_summary(project_dir: Path) -> str:
 
     logger.info("Generating codebase summary for %s", project_dir)
 
-    # 1. Generate file tree
-    file_tree = _generate_file_tree(project_dir)
-
-    # 2. Check cache
     tree_hash = _get_tree_hash(project_dir)
+    memo_key: tuple[str, str, str] | None = None
     if tree_hash is not None:
-        cached = _read_cache(project_dir, tree_hash)
-        if cached is not None:
-            logger.info("Cache hit for tree hash %s", tree_hash)
-            learnings = _read_recent_learnings(project_dir)
-            return cached + "\n" + learnings if learnings else cached
-
-    # 3. Call agent
-    agent_summary = ""
-    try:
-        agent_summary = _call_agent(project_dir, file_tree)
-    except Exception:
-        logger.warning(
-            "Agent call failed; returning empty summary", exc_info=True
+        memo_key = (
+            str(project_dir), tree_hash, _learnings_signature(project_dir)
         )
-
-    # 4. Cache result (only if we got a tree hash and non-empty output)
-    if tree_hash is not None and agent_summary:
-        try:
-            _write_cache(project_dir, tree_hash, agent_summary)
-            logger.info("Cached summary for tree hash %s", tree_hash)
-        except OSError:
-            logger.warning("Failed to write cache", exc_info=True)
-
-    # 5. Append learnings
-    learnings = _read_recent_learnings(project_dir)
-    if learnings and agent_summary:
-        return agent_summary + "\n" + learnings
-    if learnings:
-        return learnings
-    return agent_summary
+        if use_cache and memo_key in _summary_memo:
+            logger.info("Memo hit for tree hash %s", tree_hash)
+            _summary_memo.move_to_end(memo_key)
+            return _summary_memo[memo_key]
+
+    # Learnings are appended on every path, so read them on a worker
+    # thread while the cache lookup, tree walk and agent call run.
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        learnings_future = executor.submit(_read_recent_learnings, project_dir)
+        summary = _cached_or_agent_summary(
+            project_dir, tree_hash, use_cache=use_cache
+        )
+        learnings = learnings_future.result()
+
+    if learnings and summary:
+        result = summary + "\n" + learnings
+    elif learnings:
+        result = learnings
+    else:
+        result = summary
+
+    # Only memoize real summaries — a failed agent call should be retried
+    if memo_key is not None and summary:
+        _summary_memo[memo_key] = result
+        _summary_memo.move_to_end(memo_key)
+        while len(_summary_memo) > _SUMMARY_MEMO_CAP:
+            _summary_memo.popitem(last=False)
+
+    return result
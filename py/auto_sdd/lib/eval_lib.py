@@ -5,7 +5,8 @@
 # - run_mechanical_eval: diff_stats is a dict with keys files_changed, lines_added,
 #   lines_removed, files, new_type_exports, import_count, feature_name, commit —
 #   matching the bash JSON output fields. MechanicalEvalResult wraps the structured
-#   data rather than being a flat JSON blob.
+#   data rather than being a flat JSON blob. It also carries commit_subject (new;
+#   the subject line feature_name is derived from) so callers needn't re-query git.
 # - run_mechanical_eval: merge commits return a MechanicalEvalResult with
 #   passed=True and a diff_stats containing "skipped": True, "reason": "merge commit"
 #   to match bash behavior of returning JSON with skipped flag.
@@ -13,9 +14,19 @@
 #   Raises EvalError on missing arguments instead of printing to stderr and
 #   returning exit code 1.
 # - parse_eval_signal: returns empty string for missing signals (matches bash).
+# - run_mechanical_eval / generate_eval_prompt: commit existence is checked by
+#   the rev-list --parents call (no separate cat-file); an unknown commit raises
+#   EvalError from both.
 # - write_eval_result: uses atomic write (temp-then-rename) instead of direct cat.
 #   Returns Path to output file instead of printing path to stdout.
 # - Feature name sanitization in write_eval_result uses regex instead of sed/tr chain.
+# - write_eval_result serializes with orjson when it is importable (optional
+#   accelerator, not a declared dependency), falling back to stdlib json; both
+#   emit 2-space indented JSON (orjson writes non-ASCII as UTF-8, not \u escapes).
+# - build_eval_result (new): returns the dict write_eval_result writes, so
+#   callers that need the result in memory don't re-derive it from the file.
+# - The numstat/patch diff is streamed line by line instead of captured; the
+#   60s git timeout covers the whole read via a watchdog that kills git.
 # - Inline exception classes (AutoSddError, EvalError) since errors.py doesn't
 #   exist yet.
 
@@ -33,9 +44,17 @@ import os
 import re
 import subprocess
 import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import Iterable, Iterator
+
+try:
+    import orjson  # type: ignore[import-not-found,unused-ignore]
+except ImportError:  # optional accelerator — stdlib json is the fallback
+    orjson = None  # type: ignore[assignment,unused-ignore]
 
 logger = logging.getLogger(__name__)
 
@@ -82,14 +101,70 @@ def _run_git(
     )
 
 
+def _iter_git_lines(
+    args: list[str], project_dir: Path, *, timeout: float = 60
+) -> Iterator[str]:
+    """Run a git command in *project_dir* and yield its stdout line by line.
+
+    Lines keep their trailing newline.  Like ``_run_git(..., check=False)``
+    the exit status is not checked; stderr is discarded.  The whole run,
+    reading included, is bounded by *timeout*: a watchdog kills git when
+    it expires.  Closing the generator early also kills git.
+
+    Raises:
+        subprocess.TimeoutExpired: If git runs past *timeout*.
+    """
+    cmd = ["git", "-C", str(project_dir), *args]
+    proc = subprocess.Popen(
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+    )
+    expired = threading.Event()
+
+    def _expire() -> None:
+        expired.set()
+        proc.kill()
+
+    watchdog = threading.Timer(timeout, _expire)
+    watchdog.daemon = True
+    watchdog.start()
+    try:
+        assert proc.stdout is not None
+        yield from proc.stdout
+        # EOF normally means git is exiting; the watchdog still covers a
+        # child that closed stdout and kept running.
+        proc.wait()
+    finally:
+        watchdog.cancel()
+        if proc.poll() is None:
+            proc.kill()
+        proc.wait()
+        if proc.stdout is not None:
+            proc.stdout.close()
+    if expired.is_set():
+        raise subprocess.TimeoutExpired(cmd, timeout)
+
+
 def _get_parent_count(project_dir: Path, commit_hash: str) -> int:
-    """Return the number of parents for *commit_hash*."""
+    """Return the number of parents for *commit_hash*.
+
+    Doubles as the existence check: ``rev-list`` fails for an unknown
+    object and prints nothing for a tree or blob.
+
+    Raises:
+        EvalError: If *commit_hash* is not a commit in *project_dir*.
+    """
     result = _run_git(
         ["rev-list", "--parents", "-n", "1", commit_hash],
         project_dir,
+        check=False,
     )
     # Output: "<commit> [<parent1> <parent2> ...]"
-    parts = result.stdout.strip().split()
+    parts = result.stdout.split()
+    if result.returncode != 0 or not parts:
+        raise EvalError(f"commit not found: {commit_hash}")
     return len(parts) - 1
 
 
@@ -121,51 +196,151 @@ def _parse_numstat(numstat_output: str) -> list[tuple[int, int, str]]:
     return entries
 
 
+# "test" or "spec" anywhere in the path ("__tests__" is covered by "test").
+_TEST_FILE_RE: re.Pattern[str] = re.compile(r"test|spec")
+
+
 def _is_test_file(filepath: str) -> bool:
     """Return True if *filepath* looks like a test file."""
-    return "test" in filepath or "spec" in filepath or "__tests__" in filepath
+    return _TEST_FILE_RE.search(filepath) is not None
+
+
+# One pattern for every language, matched against each added diff line by
+# _scan_numstat_patch.  Each match starts at the ``+`` and the alternatives
+# are tried in priority order from there (the lazy ``.*?`` prefixes stand
+# in for an unanchored search), so the first alternative that matches
+# anywhere on the line wins — exactly one name is captured per line.
+# Whitespace is ``[ \t]`` and ``.`` never matches a newline, so no
+# alternative can run past the end of its line.
+_ADDED_TYPE_RE: re.Pattern[str] = re.compile(
+    r"""
+    ^\+
+    (?:
+        # TypeScript/JS: export type Foo, export interface Foo
+        .*?export[ \t]+(?:type|interface)[ \t]+(\w+)
+        # Python: class Foo, Foo = TypedDict(, Foo = NamedTuple(
+      | [ \t]*class[ \t]+(\w+)
+      | [ \t]*(\w+)[ \t]*=[ \t]*TypedDict\(
+      | [ \t]*(\w+)[ \t]*=[ \t]*NamedTuple\(
+        # Rust: pub struct Foo, pub enum Foo, pub trait Foo
+      | .*?pub[ \t]+(?:struct|enum|trait)[ \t]+(\w+)
+        # Go: type Foo struct, type Foo interface
+      | .*?\btype[ \t]+(\w+)[ \t]+(?:struct|interface)\b
+    )
+    """,
+    re.MULTILINE | re.VERBOSE,
+)
 
+# Added (non-header) diff lines that import something: "import " anywhere
+# in the line (Python/TS/JS/Go), or Rust "use " at the start of the
+# content.  At most one match per line, since every match is anchored at
+# a line start.
+_ADDED_IMPORT_RE: re.Pattern[str] = re.compile(
+    r"^\+(?!\+\+)(?:[^\n]*?import |[ \t]*use[ \t])", re.MULTILINE
+)
 
-_TYPE_PATTERNS: list[re.Pattern[str]] = [
-    # TypeScript/JS: export type Foo, export interface Foo
-    re.compile(r"export\s+(?:type|interface)\s+(\w+)"),
-    # Python: class Foo, Foo = TypedDict(, Foo = NamedTuple(
-    re.compile(r"^[+]?\s*class\s+(\w+)"),
-    re.compile(r"^[+]?\s*(\w+)\s*=\s*TypedDict\("),
-    re.compile(r"^[+]?\s*(\w+)\s*=\s*NamedTuple\("),
-    # Rust: pub struct Foo, pub enum Foo, pub trait Foo
-    re.compile(r"pub\s+(?:struct|enum|trait)\s+(\w+)"),
-    # Go: type Foo struct, type Foo interface
-    re.compile(r"\btype\s+(\w+)\s+(?:struct|interface)\b"),
-]
 
+def _scan_numstat_patch(
+    lines: Iterable[str],
+) -> tuple[list[tuple[int, int, str]], list[str], int]:
+    """Scan ``git diff --numstat -p`` output in a single pass.
 
-def _extract_type_names(diff_content: str) -> list[str]:
-    """Extract exported type/interface names from added lines in a diff.
+    Git prints the numstat block, one blank line, then the patch.  Returns
+    the parsed numstat entries, the new type names and the added-import
+    count, without ever holding the whole diff in memory.
 
-    Detects type-like definitions across multiple languages:
+    Type names come from added lines, deduplicated in first-seen order:
     - TypeScript/JS: ``export type Foo``, ``export interface Foo``
     - Python: ``class Foo``, ``Foo = TypedDict(``, ``Foo = NamedTuple(``
     - Rust: ``pub struct Foo``, ``pub enum Foo``, ``pub trait Foo``
     - Go: ``type Foo struct``, ``type Foo interface``
     """
-    names: list[str] = []
-    for line in diff_content.splitlines():
+    it = iter(lines)
+    numstat_lines: list[str] = []
+    for line in it:
+        if line == "\n":
+            break
+        numstat_lines.append(line)
+    entries = _parse_numstat("".join(numstat_lines))
+
+    names: dict[str, None] = {}
+    import_count = 0
+    for line in it:
         if not line.startswith("+"):
             continue
-        for pattern in _TYPE_PATTERNS:
-            match = pattern.search(line)
-            if match:
-                names.append(match.group(1))
-                break  # one match per line is sufficient
-    # Deduplicate while preserving order
-    seen: set[str] = set()
-    unique: list[str] = []
-    for name in names:
-        if name not in seen:
-            seen.add(name)
-            unique.append(name)
-    return unique
+        match = _ADDED_TYPE_RE.match(line)
+        if match:
+            names.setdefault(match[match.lastindex or 0])
+        if _ADDED_IMPORT_RE.match(line):
+            import_count += 1
+    return entries, list(names), import_count
+
+
+_REDECL_GLOBS: tuple[str, ...] = (
+    "*.ts", "*.tsx", "*.js", "*.jsx",
+    "*.py", "*.rs", "*.go",
+)
+
+
+def _redecl_pattern(names: str) -> str:
+    """Return the ERE matching a type definition of any of *names*.
+
+    *names* is a single name or a ``(A|B|...)`` group.  Covers TS, Python,
+    Rust, and Go type definitions.
+    """
+    return (
+        f"export (type|interface) {names}"
+        f"|class {names}"
+        f"|pub (struct|enum|trait) {names}"
+        f"|type {names} (struct|interface)"
+    )
+
+
+def _find_redeclarations(
+    project_dir: Path, rev: str, type_names: list[str]
+) -> list[str]:
+    """Return the names in *type_names* already defined somewhere in *rev*.
+
+    One ``git grep`` over the tree collects every line defining any of the
+    names; which name each line defines is then decided in memory.  A name
+    matches as a prefix (``class Foo`` also matches ``class FooBar``), as
+    the original per-name grep did.
+    """
+    alternation = "(" + "|".join(type_names) + ")"
+    grep_result = _run_git(
+        [
+            "grep",
+            "-h",
+            "-E",
+            _redecl_pattern(alternation),
+            rev,
+            "--",
+            *_REDECL_GLOBS,
+        ],
+        project_dir,
+        check=False,
+    )
+    matched = grep_result.stdout
+    if not matched.strip():
+        return []
+    return [
+        name
+        for name in type_names
+        if re.search(_redecl_pattern(re.escape(name)), matched)
+    ]
+
+
+def json_dumps_pretty(data: dict[str, object]) -> bytes:
+    """Encode *data* as 2-space indented JSON bytes with a trailing newline.
+
+    Uses orjson when available, stdlib json otherwise.
+    """
+    if orjson is not None:
+        encoded: bytes = orjson.dumps(
+            data, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE
+        )
+        return encoded
+    return (json.dumps(data, indent=2) + "\n").encode("utf-8")
 
 
 def _sanitize_feature_name(name: str) -> str:
@@ -207,58 +382,53 @@ def run_mechanical_eval(
             f"run_mechanical_eval: directory does not exist: {project_dir}"
         )
 
-    # Verify the commit exists
-    cat_file = _run_git(
-        ["cat-file", "-t", commit_hash], project_dir, check=False
-    )
-    if cat_file.returncode != 0:
-        raise EvalError(
-            f"run_mechanical_eval: commit not found: {commit_hash}"
+    # The parent count and the commit subject are independent; fetch the
+    # subject concurrently with the parent count and the diff.  The parent
+    # count also verifies the commit exists.
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        parents_future = executor.submit(
+            _get_parent_count, project_dir, commit_hash
         )
-
-    # Check for merge commit
-    parent_count = _get_parent_count(project_dir, commit_hash)
-    if parent_count > 1:
-        logger.info("Skipping merge commit %s", commit_hash)
-        return MechanicalEvalResult(
-            diff_stats={
-                "commit": commit_hash,
-                "skipped": True,
-                "reason": "merge commit",
-            },
-            type_exports_changed=[],
-            redeclarations=[],
-            test_files_touched=[],
-            passed=True,
+        log_future = executor.submit(
+            _run_git, ["log", "-1", "--format=%s", commit_hash], project_dir
         )
 
-    # Extract feature name from commit message
-    log_result = _run_git(
-        ["log", "-1", "--format=%s", commit_hash], project_dir
-    )
-    commit_msg = log_result.stdout.strip()
-    # Strip leading "prefix: " (e.g. "feat: ") from commit message
-    feature_name = re.sub(r"^[^:]*:\s*", "", commit_msg)
-
-    is_first_commit = parent_count == 0
+        # Check for merge commit
+        parent_count = parents_future.result()
+        if parent_count > 1:
+            logger.info("Skipping merge commit %s", commit_hash)
+            return MechanicalEvalResult(
+                diff_stats={
+                    "commit": commit_hash,
+                    "skipped": True,
+                    "reason": "merge commit",
+                },
+                type_exports_changed=[],
+                redeclarations=[],
+                test_files_touched=[],
+                passed=True,
+            )
 
-    # Get diff numstat
-    if is_first_commit:
-        empty_tree = _get_empty_tree_hash(project_dir)
-        numstat_result = _run_git(
-            ["diff", "--numstat", empty_tree, commit_hash],
-            project_dir,
-            check=False,
+        is_first_commit = parent_count == 0
+        base = (
+            _get_empty_tree_hash(project_dir)
+            if is_first_commit
+            else f"{commit_hash}^"
         )
-    else:
-        numstat_result = _run_git(
-            ["diff", "--numstat", f"{commit_hash}^", commit_hash],
-            project_dir,
-            check=False,
+
+        # Numstat, new type names and import count from a single diff
+        # run, streamed rather than captured
+        entries, new_type_names, import_count = _scan_numstat_patch(
+            _iter_git_lines(
+                ["diff", "--numstat", "-p", base, commit_hash], project_dir
+            )
         )
 
-    numstat_output = numstat_result.stdout or ""
-    entries = _parse_numstat(numstat_output)
+        # Extract feature name from commit message
+        commit_msg = log_future.result().stdout.strip()
+
+    # Strip leading "prefix: " (e.g. "feat: ") from commit message
+    feature_name = re.sub(r"^[^:]*:\s*", "", commit_msg)
 
     files_changed = len(entries)
     lines_added = sum(a for a, _, _ in entries)
@@ -267,75 +437,19 @@ def run_mechanical_eval(
 
     test_files = [fp for fp in files_list if _is_test_file(fp)]
 
-    # Get diff content for type analysis
-    if is_first_commit:
-        empty_tree = _get_empty_tree_hash(project_dir)
-        diff_result = _run_git(
-            ["diff", empty_tree, commit_hash], project_dir, check=False
-        )
-    else:
-        diff_result = _run_git(
-            ["diff", f"{commit_hash}^", commit_hash],
-            project_dir,
-            check=False,
-        )
-
-    diff_content = diff_result.stdout or ""
-
     # Count new type/interface exports
-    new_type_names = _extract_type_names(diff_content)
     new_type_exports = len(new_type_names)
 
     # Check for redeclarations across multiple languages
     redeclared: list[str] = []
     if new_type_exports > 0 and not is_first_commit:
-        # Combined grep pattern covering TS, Python, Rust, and Go type defs
-        redecl_pattern = (
-            r"export \(type\|interface\) {name}"
-            r"\|class {name}"
-            r"\|pub \(struct\|enum\|trait\) {name}"
-            r"\|type {name} \(struct\|interface\)"
+        redeclared = _find_redeclarations(
+            project_dir, f"{commit_hash}^", new_type_names
         )
-        redecl_globs = [
-            "*.ts", "*.tsx", "*.js", "*.jsx",
-            "*.py", "*.rs", "*.go",
-        ]
-        for type_name in new_type_names:
-            grep_result = _run_git(
-                [
-                    "grep",
-                    "-l",
-                    redecl_pattern.replace("{name}", type_name),
-                    f"{commit_hash}^",
-                    "--",
-                    *redecl_globs,
-                ],
-                project_dir,
-                check=False,
-            )
-            existing_files = [
-                f
-                for f in grep_result.stdout.strip().splitlines()
-                if f.strip()
-            ]
-            if len(existing_files) > 0:
-                redeclared.append(type_name)
-
-    # Count import statements added (Python, TS/JS, Rust, Go)
-    import_count = 0
-    if diff_content:
-        for line in diff_content.splitlines():
-            if not line.startswith("+") or line.startswith("+++"):
-                continue
-            # Python/TS/JS: "import " anywhere in added line
-            if "import " in line:
-                import_count += 1
-            # Rust: "use " at the start of the content (after the + prefix)
-            elif re.match(r"^\+\s*use\s+", line):
-                import_count += 1
 
     diff_stats: dict[str, int | str | bool | list[str]] = {
         "commit": commit_hash,
+        "commit_subject": commit_msg,
         "feature_name": feature_name,
         "files_changed": files_changed,
         "files": files_list,
@@ -377,7 +491,8 @@ def generate_eval_prompt(
         The prompt text for an eval agent.
 
     Raises:
-        EvalError: If project_dir or commit_hash is missing.
+        EvalError: If project_dir or commit_hash is missing, or the commit
+            is not found.
     """
     if not commit_hash:
         raise EvalError(
@@ -495,50 +610,44 @@ def parse_eval_signal(signal_name: str, output: str) -> str:
     Returns:
         The signal value (stripped), or empty string if not found.
     """
-    last_value = ""
     prefix = f"{signal_name}:"
-    for line in output.splitlines():
-        if line.startswith(prefix):
-            # Everything after "SIGNAL_NAME:" stripped
-            value = line[len(prefix):].strip()
-            last_value = value
-    return last_value
-
-
-def write_eval_result(
-    output_dir: Path,
-    feature_name: str,
+    # Search backwards so the last signal is found without splitting the
+    # whole output; an occurrence only counts at the start of a line.
+    end = len(output)
+    while True:
+        idx = output.rfind(prefix, 0, end)
+        if idx == -1:
+            return ""
+        if idx == 0 or output[idx - 1] in _LINE_BREAK_CHARS:
+            break
+        end = idx + len(prefix) - 1
+    start = idx + len(prefix)
+    line_break = _LINE_BREAK_RE.search(output, start)
+    # Everything after "SIGNAL_NAME:" stripped
+    return output[start:line_break.start() if line_break else None].strip()
+
+
+# The boundaries str.splitlines() recognises.
+_LINE_BREAK_CHARS: str = "\n\r\v\f\x1c\x1d\x1e\x85\u2028\u2029"
+_LINE_BREAK_RE: re.Pattern[str] = re.compile(f"[{_LINE_BREAK_CHARS}]")
+
+
+def build_eval_result(
     mechanical: MechanicalEvalResult,
     agent_output: str,
-) -> Path:
-    """Merge mechanical eval with parsed agent signals into a result file.
+) -> dict[str, object]:
+    """Return the result dict :func:`write_eval_result` writes for these inputs.
 
-    If agent output is empty or unparseable, writes mechanical-only results.
-    Uses atomic write (temp-then-rename).
+    The agent signals are included only when the agent reported
+    ``EVAL_COMPLETE: true``; otherwise the result is mechanical-only.
 
     Args:
-        output_dir: Directory for output files.
-        feature_name: Human-readable feature name.
         mechanical: Result from run_mechanical_eval.
         agent_output: Raw text output from the eval agent (may be empty).
 
     Returns:
-        Path to the written result file.
-
-    Raises:
-        EvalError: If output_dir or feature_name is empty.
+        The result dict, stamped with the current UTC time.
     """
-    if not feature_name:
-        raise EvalError(
-            "write_eval_result: output_dir and feature_name are required"
-        )
-
-    safe_name = _sanitize_feature_name(feature_name)
-    output_file = output_dir / f"eval-{safe_name}.json"
-
-    # Ensure output directory exists
-    output_dir.mkdir(parents=True, exist_ok=True)
-
     # Build mechanical JSON from the diff_stats dict
     mechanical_data = mechanical.diff_stats
 
@@ -579,16 +688,54 @@ def write_eval_result(
     if agent_eval_available:
         result["agent_eval"] = agent_eval
 
-    data = json.dumps(result, indent=2) + "\n"
+    return result
+
+
+def write_eval_result(
+    output_dir: Path,
+    feature_name: str,
+    mechanical: MechanicalEvalResult,
+    agent_output: str,
+) -> Path:
+    """Merge mechanical eval with parsed agent signals into a result file.
+
+    If agent output is empty or unparseable, writes mechanical-only results.
+    Uses atomic write (temp-then-rename).
+
+    Args:
+        output_dir: Directory for output files.
+        feature_name: Human-readable feature name.
+        mechanical: Result from run_mechanical_eval.
+        agent_output: Raw text output from the eval agent (may be empty).
+
+    Returns:
+        Path to the written result file.
+
+    Raises:
+        EvalError: If output_dir or feature_name is empty.
+    """
+    if not feature_name:
+        raise EvalError(
+            "write_eval_result: output_dir and feature_name are required"
+        )
+
+    safe_name = _sanitize_feature_name(feature_name)
+    output_file = output_dir / f"eval-{safe_name}.json"
+
+    # Ensure output directory exists
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    result = build_eval_result(mechanical, agent_output)
+    data = json_dumps_pretty(result)
 
     # Atomic write: temp file then rename
     fd, tmp_path = tempfile.mkstemp(
         dir=str(output_dir), prefix=output_file.stem
     )
     try:
-        with os.fdopen(fd, "w") as f:
+        with os.fdopen(fd, "wb") as f:
             f.write(data)
-        os.rename(tmp_path, str(output_file))
+        os.replace(tmp_path, output_file)
     except BaseException:
         try:
             os.unlink(tmp_path)
@@ -13,7 +13,14 @@
 # - acquire_lock uses fcntl.flock() + PID-in-file stale detection instead of
 #   bash's simple file-exists check. release_lock removes both lockfile and fd.
 # - run_agent_with_backoff returns exit code instead of setting global
-#   AGENT_EXIT. Uses subprocess.run() instead of bash pipe-to-tee.
+#   AGENT_EXIT. Streams output to the file via Popen (bash piped to tee;
+#   nothing is echoed to the console).
+#   Retry delay uses decorrelated jitter instead of bash's fixed 2**attempt,
+#   and honors a Retry-After hint in the agent output.
+# - truncate_for_context estimates tokens from the file size in bytes
+#   (bash used wc -c too) and streams the file when truncating.
+# - write_state fsyncs the temp file and the parent directory around the
+#   rename unless durable=False; bash's redirect-then-mv did neither.
 # - Signal emission uses logging instead of echo, consistent with conventions.
 """Shared reliability utilities for SDD orchestration scripts.
 
@@ -23,16 +30,29 @@ topological sort of pending features, and parallel drift checking.
 """
 from __future__ import annotations
 
+import array
+import errno
 import fcntl
+import functools
+import io
 import json
 import logging
 import multiprocessing
 import os
+import random
 import re
 import subprocess
+import sys
 import tempfile
+import threading
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import deque
+from concurrent.futures import (
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    as_completed,
+)
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
@@ -97,6 +117,32 @@ class DriftPair:
 # Module-level dict to track open lock file descriptors by path.
 _lock_fds: dict[str, int] = {}
 
+# flock attempts before giving up; sleeps 1, 2, 4, 8 ms in between (~15 ms)
+# so a holder that is about to release doesn't force a full teardown.
+_LOCK_SPIN_ATTEMPTS = 5
+
+
+# /proc/<pid> is a single lookup where procfs is mounted (Linux)
+_HAS_PROCFS = sys.platform.startswith("linux") and Path("/proc/self").is_dir()
+
+
+def _pid_alive(pid: int) -> bool:
+    """Return whether *pid* is a running process.
+
+    A process owned by another user (EPERM from ``kill``) counts as alive.
+    """
+    if pid <= 0:
+        return False
+    if _HAS_PROCFS:
+        return Path(f"/proc/{pid}").exists()
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
 
 def acquire_lock(lock_file: Path) -> None:
     """Acquire a process-level file lock.
@@ -106,7 +152,8 @@ def acquire_lock(lock_file: Path) -> None:
     automatically.
 
     The lock is held via ``fcntl.flock()`` AND a PID written to the file
-    for stale-lock detection by other processes.
+    for stale-lock detection by other processes. If the flock is busy it
+    is retried briefly (~15 ms) before giving up.
 
     Raises:
         LockContentionError: If the lock is held by a live process.
@@ -119,34 +166,38 @@ def acquire_lock(lock_file: Path) -> None:
             existing_pid_str = lock_file.read_text().strip()
             if existing_pid_str:
                 existing_pid = int(existing_pid_str)
-                try:
-                    os.kill(existing_pid, 0)
+                if _pid_alive(existing_pid):
                     # Process is alive — lock is held
                     raise LockContentionError(
                         f"Another instance is already running (PID: {existing_pid}). "
                         f"Lock file: {lock_file}. "
                         f"If this is stale, remove {lock_file} manually."
                     )
-                except OSError:
-                    # Process is dead — stale lock
-                    logger.warning(
-                        "Removing stale lock file (PID %d no longer running)",
-                        existing_pid,
-                    )
-                    lock_file.unlink(missing_ok=True)
+                # Process is dead — stale lock
+                logger.warning(
+                    "Removing stale lock file (PID %d no longer running)",
+                    existing_pid,
+                )
+                lock_file.unlink(missing_ok=True)
         except (ValueError, FileNotFoundError):
             # Corrupt or vanished lock file — clean up
             lock_file.unlink(missing_ok=True)
 
-    # Create lock file with our PID
-    fd = os.open(str(lock_file), os.O_CREAT | os.O_WRONLY | os.O_TRUNC)
-    try:
-        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
-    except OSError:
-        os.close(fd)
-        raise LockContentionError(
-            f"Could not acquire flock on {lock_file}."
-        )
+    # Create lock file with our PID. Truncate only once the flock is ours so
+    # a failed attempt doesn't wipe the holder's PID.
+    fd = os.open(str(lock_file), os.O_CREAT | os.O_WRONLY)
+    for attempt in range(_LOCK_SPIN_ATTEMPTS):
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            break
+        except OSError:
+            if attempt == _LOCK_SPIN_ATTEMPTS - 1:
+                os.close(fd)
+                raise LockContentionError(
+                    f"Could not acquire flock on {lock_file}."
+                )
+            time.sleep(0.001 * (1 << attempt))
+    os.ftruncate(fd, 0)
     os.write(fd, f"{os.getpid()}\n".encode())
     os.fsync(fd)
     _lock_fds[str(lock_file)] = fd
@@ -177,9 +228,19 @@ def write_state(
     strategy: str,
     completed_features: list[str],
     current_branch: str,
+    *,
+    durable: bool = True,
 ) -> None:
     """Write build-loop resume state atomically (temp file then rename).
 
+    With *durable* (the default) the temp file is fsynced before the rename,
+    so a power loss can't leave a zero-length state file, and the parent
+    directory after it, so the rename itself is persisted. Callers that
+    rewrite state many times in quick succession can pass ``False`` to skip
+    both fsyncs: the rename is still atomic, so readers (and a restart
+    after SIGKILL) only ever see a complete old or new file; only an OS
+    crash can lose the latest write.
+
     The JSON format is compatible with the bash ``read_state`` parser so
     that bash and Python scripts can coexist during the migration period.
     """
@@ -193,15 +254,21 @@ def write_state(
         "timestamp": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
     }
 
-    data = json.dumps(state, indent=2) + "\n"
+    data = (json.dumps(state, indent=2) + "\n").encode()
 
     fd, tmp_path = tempfile.mkstemp(
-        dir=str(state_file.parent), prefix=state_file.stem
+        dir=str(state_file.parent), prefix=state_file.stem, text=False
     )
     try:
-        with os.fdopen(fd, "w") as f:
-            f.write(data)
-        os.rename(tmp_path, str(state_file))
+        try:
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+            if durable:
+                os.fsync(fd)
+        finally:
+            os.close(fd)
+        os.replace(tmp_path, state_file)
     except BaseException:
         try:
             os.unlink(tmp_path)
@@ -209,6 +276,66 @@ def write_state(
             pass
         raise
 
+    if durable:
+        _fsync_dir(state_file.parent)
+
+
+def _fsync_dir(directory: Path) -> None:
+    """Flush a directory entry update; skipped where the FS can't do it."""
+    dfd = os.open(str(directory), os.O_RDONLY | getattr(os, "O_DIRECTORY", 0))
+    try:
+        os.fsync(dfd)
+    except OSError as exc:
+        # Network filesystems (SMB/NFS on Darwin) reject directory fsync
+        if exc.errno not in (errno.ENOTSUP, errno.EINVAL):
+            raise
+        logger.debug("Directory fsync unsupported for %s: %s", directory, exc)
+    finally:
+        os.close(dfd)
+
+
+class StateBatcher:
+    """Coalesce several ``write_state`` calls into one write at exit.
+
+    Inside ``with StateBatcher(path) as sb:`` each :meth:`update` only
+    records the latest state; the single fsync + rename happens when the
+    block exits — including on an exception, so the last recorded state
+    is still resumable.
+    """
+
+    def __init__(self, state_file: Path, *, durable: bool = True) -> None:
+        self.state_file = state_file
+        self.durable = durable
+        self._pending: tuple[int, str, list[str], str] | None = None
+
+    def __enter__(self) -> StateBatcher:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.flush()
+
+    def update(
+        self,
+        feature_index: int,
+        strategy: str,
+        completed_features: list[str],
+        current_branch: str,
+    ) -> None:
+        """Record the state to write; same arguments as ``write_state``."""
+        self._pending = (
+            feature_index,
+            strategy,
+            list(completed_features),
+            current_branch,
+        )
+
+    def flush(self) -> None:
+        """Write the pending state now, if any."""
+        if self._pending is None:
+            return
+        pending, self._pending = self._pending, None
+        write_state(self.state_file, *pending, durable=self.durable)
+
 
 def read_state(state_file: Path) -> ResumeState | None:
     """Read persisted resume state. Returns ``None`` if the file is missing."""
@@ -236,6 +363,11 @@ def clean_state(state_file: Path) -> None:
 _RATE_LIMIT_RE = re.compile(
     r"rate.?limit|429|too many requests|overloaded|capacity", re.IGNORECASE
 )
+_RETRY_AFTER_RE = re.compile(r"retry[- ]after[:\s]+(\d+)", re.IGNORECASE)
+
+# Rate-limit errors land at the end of the output; scanning only the tail
+# keeps the failure path cheap for agents that emit megabytes.
+_RATE_LIMIT_SCAN_BYTES = 16384
 
 
 def run_agent_with_backoff(
@@ -247,10 +379,13 @@ def run_agent_with_backoff(
 ) -> int:
     """Run *cmd* with exponential backoff on rate-limit failures.
 
-    The command's combined stdout+stderr is written to *output_file* on each
-    attempt. If the command fails with a rate-limit indicator in its output,
-    it is retried up to *max_retries* times with exponential backoff capped
-    at *backoff_max* seconds.
+    The command's stdout and stderr are streamed together into
+    *output_file* on each attempt. If the command fails with a rate-limit indicator in its output,
+    it is retried up to *max_retries* times. The delay uses decorrelated
+    jitter (``uniform(1, prev * 3)``, capped at *backoff_max* seconds) so
+    concurrent orchestrators hitting the same limit don't retry in lockstep.
+    A ``Retry-After: N`` hint in the output takes precedence (also capped).
+    Only the last 16 KiB of output is scanned for these markers.
 
     Returns:
         The exit code of the last invocation (0 on success).
@@ -259,31 +394,42 @@ def run_agent_with_backoff(
         AgentTimeoutError: After exhausting all retries due to rate limiting.
     """
     exit_code = 0
+    backoff = 1.0
+    retry_after: int | None = None
+    output_file.parent.mkdir(parents=True, exist_ok=True)
 
     for attempt in range(max_retries + 1):
         if attempt > 0:
-            backoff = min(2**attempt, backoff_max)
+            if retry_after is not None:
+                backoff = float(retry_after)
+            else:
+                backoff = min(float(backoff_max), random.uniform(1, backoff * 3))
             logger.warning(
-                "Rate limit detected, retrying in %ds (attempt %d/%d)...",
+                "Rate limit detected, retrying in %.1fs (attempt %d/%d)...",
                 backoff,
                 attempt,
                 max_retries,
             )
             time.sleep(backoff)
 
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=600,
-        )
-        combined = result.stdout + result.stderr
-        output_file.parent.mkdir(parents=True, exist_ok=True)
-        output_file.write_text(combined)
-        exit_code = result.returncode
-
-        if exit_code != 0 and _RATE_LIMIT_RE.search(combined):
-            continue
+        # Stream straight to the file; long agent runs emit megabytes
+        with output_file.open("wb") as out:
+            proc = subprocess.Popen(cmd, stdout=out, stderr=subprocess.STDOUT)
+            try:
+                exit_code = proc.wait(timeout=600)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                proc.wait()
+                raise
+
+        if exit_code != 0:
+            tail = read_tail(output_file, _RATE_LIMIT_SCAN_BYTES)
+            if _RATE_LIMIT_RE.search(tail):
+                hint = _RETRY_AFTER_RE.search(tail)
+                retry_after = (
+                    min(int(hint.group(1)), backoff_max) if hint else None
+                )
+                continue
 
         # Not a rate-limit error — return immediately
         return exit_code
@@ -293,15 +439,26 @@ def run_agent_with_backoff(
     )
 
 
+def read_tail(path: Path, max_bytes: int) -> str:
+    """Return the last *max_bytes* of *path*, decoded leniently."""
+    with path.open("rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        f.seek(max(0, size - max_bytes))
+        return f.read().decode("utf-8", errors="replace")
+
+
 # ── Context budget management ────────────────────────────────────────────────
 
-# Lines matching these patterns are kept during truncation.
-_GHERKIN_RE = re.compile(
-    r"^(\s*(Feature|Scenario|Given|When|Then|And|But|Background|Rule)[:\s])"
-    r"|^(---$)"
-    r"|^(#+\s)"
-    r"|^(\*\*)",
+# Lines matching this pattern are kept during truncation: headings,
+# Gherkin keywords, and bold lines (frontmatter is tracked separately).
+_KEEP_RE = re.compile(
+    r"#+\s"
+    r"|\s*(?:Feature|Scenario|Given|When|Then|And|But|Background|Rule)[:\s]"
+    r"|\*\*"
 )
+# First characters _KEEP_RE can match besides whitespace; lets most body
+# lines skip the regex call entirely.
+_KEEP_FIRST_CHARS = frozenset("#*FSGWTABR")
 
 
 def truncate_for_context(
@@ -309,24 +466,24 @@ def truncate_for_context(
 ) -> str:
     """Return the contents of *file_path*, truncating if over context budget.
 
-    Token estimation: 4 characters ≈ 1 token. If the file exceeds 50% of
-    *max_tokens*, only YAML frontmatter, headings, bold lines, and Gherkin
-    scenario lines are returned.
+    Token estimation: 4 bytes ≈ 1 token, taken from the file size. If the
+    file exceeds 50% of *max_tokens*, only YAML frontmatter, headings, bold
+    lines, and Gherkin scenario lines are returned.
 
     Returns an empty string for missing or empty files.
     """
-    if not file_path.exists():
+    try:
+        size = file_path.stat().st_size
+    except (FileNotFoundError, NotADirectoryError):
         return ""
-
-    content = file_path.read_text()
-    if not content:
+    if not size:
         return ""
 
-    estimated_tokens = len(content) // 4
+    estimated_tokens = size // 4
     budget_half = max_tokens // 2
 
     if estimated_tokens <= budget_half:
-        return content
+        return file_path.read_text()
 
     logger.warning(
         "Spec file exceeds 50%% of context budget (~%d tokens, budget: %d)",
@@ -338,77 +495,101 @@ def truncate_for_context(
         "non-essential content)"
     )
 
-    # Extract frontmatter + Gherkin lines (mirrors the bash awk filter)
-    kept: list[str] = []
+    # Extract frontmatter + Gherkin lines (mirrors the bash awk filter),
+    # streaming so large specs are never held in memory whole.
+    buf = io.StringIO()
     in_frontmatter = False
     frontmatter_count = 0
+    keep_match = _KEEP_RE.match
+    keep_first = _KEEP_FIRST_CHARS
 
-    for line in content.splitlines():
-        if line.rstrip() == "---":
-            frontmatter_count += 1
-            if frontmatter_count <= 2:
-                kept.append(line)
-                if frontmatter_count == 1:
-                    in_frontmatter = True
-                else:
-                    in_frontmatter = False
-                continue
-
-        if in_frontmatter:
-            kept.append(line)
-            continue
-
-        # Headings
-        if re.match(r"^#+\s", line):
-            kept.append(line)
-            continue
+    with file_path.open() as f:
+        for line in f:
+            if line.endswith("\n"):
+                line = line[:-1]
 
-        # Gherkin keywords
-        if re.match(
-            r"^\s*(Feature|Scenario|Given|When|Then|And|But|Background|Rule)[:\s]",
-            line,
-        ):
-            kept.append(line)
-            continue
+            if line.rstrip() == "---":
+                frontmatter_count += 1
+                if frontmatter_count <= 2:
+                    in_frontmatter = frontmatter_count == 1
+                    buf.write(line)
+                    buf.write("\n")
+                    continue
 
-        # Bold lines
-        if line.startswith("**"):
-            kept.append(line)
-            continue
+            if in_frontmatter or (
+                line
+                and (line[0] in keep_first or line[0].isspace())
+                and keep_match(line)
+            ):
+                buf.write(line)
+                buf.write("\n")
 
-    return "\n".join(kept)
+    return buf.getvalue()[:-1]
 
 
 # ── Circular dependency detection ────────────────────────────────────────────
 
 # Regex for roadmap table rows: | <id> | Feature | Source | Jira | Complexity | Deps | Status |
 _ROADMAP_ROW_RE = re.compile(r"^\|\s*(\d+)\s*\|")
+_DEP_DIGITS_RE = re.compile(r"[0-9]+")
 
+RoadmapRow = tuple[str, str, str, str, str]
 
-def _parse_roadmap_rows(
-    roadmap: Path,
-) -> list[tuple[str, str, str, str, str]]:
-    """Parse roadmap table rows into (id, name, complexity, deps, status) tuples."""
-    rows: list[tuple[str, str, str, str, str]] = []
-    if not roadmap.exists():
-        return rows
 
-    for line in roadmap.read_text().splitlines():
-        if not _ROADMAP_ROW_RE.match(line):
-            continue
-        cols = [c.strip() for c in line.split("|")]
-        # Split by | gives ['', id, name, source, jira, complexity, deps, status, '']
-        if len(cols) < 9:
-            continue
-        fid = cols[1]
-        if not fid.isdigit():
-            continue
-        fname = cols[2]
-        fcmplx = cols[5]
-        fdeps = cols[6]
-        fstatus = cols[7]
-        rows.append((fid, fname, fcmplx, fdeps, fstatus))
-    return rows
+@functools.lru_cache(maxsize=4)
+def _parse_roadmap_cached(
+    path_str: str, mtime_ns: int, size: int
+) -> tuple[RoadmapRow, ...]:
+    """Parse roadmap rows; keyed on (path, mtime, size) so edits invalidate."""
+    rows: list[RoadmapRow] = []
+    with open(path_str) as f:
+        for line in f:
+            # Cheap prefilter: most roadmap lines are prose, not table rows
+            if not line.startswith("|"):
+                continue
+            m = _ROADMAP_ROW_RE.match(line)
+            if m is None:
+                continue
+            cols = line.split("|")
+            # Split by | gives ['', id, name, source, jira, complexity, deps, status, '']
+            if len(cols) < 9:
+                continue
+            # The match already pinned cols[1] to "<ws><digits><ws>"
+            fid = m.group(1)
+            # Strip only the columns we keep
+            fname = cols[2].strip()
+            fcmplx = cols[5].strip()
+            fdeps = cols[6].strip()
+            fstatus = cols[7].strip()
+            rows.append((fid, fname, fcmplx, fdeps, fstatus))
+    return tuple(rows)
+
+
+def _parse_roadmap_rows(roadmap: Path) -> tuple[RoadmapRow, ...]:
+    """Parse roadmap table rows into (id, name, complexity, deps, status) tuples.
+
+    ``check_circular_deps`` and ``emit_topo_order`` usually run back to back
+    on the same file, so the parse is cached until the file changes.
+    """
+    try:
+        st = roadmap.stat()
+    except FileNotFoundError:
+        return ()
+    return _parse_roadmap_cached(str(roadmap), st.st_mtime_ns, st.st_size)
+
+
+def _dep_ids(fdeps: str) -> list[str]:
+    """Split a Deps cell into feature IDs, keeping only the digits of each token."""
+    ids: list[str] = []
+    if fdeps == "-" or not fdeps:
+        return ids
+    for part in fdeps.split(","):
+        part = part.strip()
+        if not (part.isascii() and part.isdigit()):
+            part = "".join(_DEP_DIGITS_RE.findall(part))
+        if part:
+            ids.append(part)
+    return ids
 
 
 def check_circular_deps(project_dir: Path) -> None:
@@ -432,14 +613,8 @@ def check_circular_deps(project_dir: Path) -> None:
     nodes: set[str] = set()
 
     for fid, _name, _cmplx, fdeps, _status in rows:
-        if fdeps == "-" or not fdeps:
-            continue
-        dep_ids: list[str] = []
-        for part in fdeps.split(","):
-            dep = re.sub(r"[^0-9]", "", part.strip())
-            if dep:
-                dep_ids.append(dep)
-                nodes.add(dep)
+        dep_ids = _dep_ids(fdeps)
+        nodes.update(dep_ids)
         if dep_ids:
             adj[fid] = dep_ids
             nodes.add(fid)
@@ -447,27 +622,35 @@ def check_circular_deps(project_dir: Path) -> None:
     if not nodes:
         return
 
-    # DFS cycle detection
+    # DFS cycle detection (iterative: deep chains can't hit the recursion
+    # limit, and the path is only joined into a string on a cycle)
     WHITE, GRAY, BLACK = 0, 1, 2
     color: dict[str, int] = {n: WHITE for n in nodes}
 
-    def dfs(node: str, path: str) -> None:
-        if color.get(node, WHITE) == GRAY:
-            raise CircularDependencyError(
-                f"Circular dependency detected in roadmap! "
-                f"CYCLE: {path} -> {node}. "
-                f"Fix the dependency cycle in .specs/roadmap.md before building."
-            )
-        if color.get(node, WHITE) == BLACK:
-            return
-        color[node] = GRAY
-        for neighbor in adj.get(node, []):
-            dfs(neighbor, f"{path} -> {neighbor}")
-        color[node] = BLACK
-
-    for node in nodes:
-        if color.get(node, WHITE) == WHITE:
-            dfs(node, node)
+    for start in nodes:
+        if color[start] != WHITE:
+            continue
+        color[start] = GRAY
+        path = [start]
+        stack = [iter(adj.get(start, ()))]
+        while stack:
+            neighbor = next(stack[-1], None)
+            if neighbor is None:
+                color[path.pop()] = BLACK
+                stack.pop()
+                continue
+            state = color.get(neighbor, WHITE)
+            if state == GRAY:
+                raise CircularDependencyError(
+                    f"Circular dependency detected in roadmap! "
+                    f"CYCLE: {' -> '.join(path)} -> {neighbor}. "
+                    f"Fix the dependency cycle in .specs/roadmap.md before building."
+                )
+            if state == BLACK:
+                continue
+            color[neighbor] = GRAY
+            path.append(neighbor)
+            stack.append(iter(adj.get(neighbor, ())))
 
 
 # ── Topological sort of pending features ─────────────────────────────────────
@@ -488,60 +671,69 @@ def emit_topo_order(project_dir: Path) -> list[Feature]:
     if not rows:
         return []
 
+    # Pending features get dense indices; the sort then runs on ints and
+    # parallel lists instead of string-keyed dicts.
     completed: set[str] = set()
-    pending_name: dict[str, str] = {}
-    pending_cmplx: dict[str, str] = {}
-    pending_ids: list[str] = []
+    index: dict[str, int] = {}
+    ids: list[str] = []
+    names: list[str] = []
+    complexities: list[str] = []
+    # One entry per pending row, so a repeated ID is still seeded once
+    # per row below.
+    pending_rows: list[int] = []
 
     for fid, fname, fcmplx, _fdeps, fstatus in rows:
         if "\u2705" in fstatus:  # ✅
             completed.add(fid)
         elif "\u2b1c" in fstatus:  # ⬜
-            pending_name[fid] = fname
-            pending_cmplx[fid] = fcmplx
-            pending_ids.append(fid)
-
-    if not pending_ids:
+            i = index.get(fid)
+            if i is None:
+                i = index[fid] = len(ids)
+                ids.append(fid)
+                names.append(fname)
+                complexities.append(fcmplx)
+            else:  # repeated ID: last row wins
+                names[i] = fname
+                complexities[i] = fcmplx
+            pending_rows.append(i)
+
+    if not ids:
         return []
 
-    # Build in-degree map: only count deps on other pending features
-    in_degree: dict[str, int] = {fid: 0 for fid in pending_ids}
-    pending_deps: dict[str, list[str]] = {fid: [] for fid in pending_ids}
+    # Build in-degree counts: only count deps on other pending features.
+    # dependents is the reverse adjacency (dep -> features waiting on it),
+    # so each dequeue touches only its direct dependents.
+    in_degree = array.array("i", [0]) * len(ids)
+    dependents: list[list[int]] = [[] for _ in ids]
 
     for fid, _fname, _fcmplx, fdeps, _fstatus in rows:
-        if fid not in pending_name:
+        i = index.get(fid)
+        if i is None:
             continue
-        if fdeps == "-" or not fdeps:
-            continue
-        for part in fdeps.split(","):
-            dep = re.sub(r"[^0-9]", "", part.strip())
-            if not dep:
-                continue
+        for dep in _dep_ids(fdeps):
             if dep in completed:
                 continue
-            if dep in pending_name:
-                pending_deps[fid].append(dep)
-                in_degree[fid] += 1
+            j = index.get(dep)
+            if j is not None:
+                dependents[j].append(i)
+                in_degree[i] += 1
 
     # Kahn's algorithm
-    queue: list[str] = [fid for fid in pending_ids if in_degree[fid] == 0]
-    sorted_ids: list[str] = []
-    qi = 0
+    queue: deque[int] = deque(i for i in pending_rows if in_degree[i] == 0)
+    order: list[int] = []
 
-    while qi < len(queue):
-        current = queue[qi]
-        qi += 1
-        sorted_ids.append(current)
+    while queue:
+        current = queue.popleft()
+        order.append(current)
 
-        for fid in pending_ids:
-            if current in pending_deps[fid]:
-                in_degree[fid] -= 1
-                if in_degree[fid] == 0:
-                    queue.append(fid)
+        for i in dependents[current]:
+            in_degree[i] -= 1
+            if in_degree[i] == 0:
+                queue.append(i)
 
     return [
-        Feature(id=int(fid), name=pending_name[fid], complexity=pending_cmplx[fid])
-        for fid in sorted_ids
+        Feature(id=int(ids[i]), name=names[i], complexity=complexities[i])
+        for i in order
     ]
 
 
@@ -559,10 +751,25 @@ def get_cpu_count() -> int:
 def run_parallel_drift_checks(
     pairs: list[DriftPair],
     check_fn: Callable[[Path, str], bool],
+    *,
+    executor_cls: type[ThreadPoolExecutor | ProcessPoolExecutor] = (
+        ThreadPoolExecutor
+    ),
+    fail_fast: bool = False,
 ) -> bool:
     """Run drift checks in parallel using a thread pool.
 
     Calls ``check_fn(pair.spec_file, pair.source_files)`` for each pair.
+    Threads suit checks that shell out (the agent call releases the GIL).
+    For CPU-bound pure-Python checks pass
+    ``executor_cls=ProcessPoolExecutor``; *check_fn* must then be
+    picklable (a module-level function). On Linux a single-threaded caller
+    forks its workers, so they skip re-importing the caller.
+
+    With *fail_fast*, the first failure cancels every check that hasn't
+    started yet; checks already running are still waited for. It is off
+    by default because the build loop's drift checks also repair drift,
+    so skipping them would leave specs unreconciled.
 
     Returns:
         ``True`` if all checks passed, ``False`` if any failed.
@@ -579,7 +786,19 @@ def run_parallel_drift_checks(
 
     any_failed = False
 
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+    executor: Executor
+    if issubclass(executor_cls, ProcessPoolExecutor):
+        mp_context = None
+        if sys.platform.startswith("linux"):
+            # fork is only safe while this process has no other threads
+            mp_context = multiprocessing.get_context(
+                "fork" if threading.active_count() == 1 else "forkserver"
+            )
+        executor = executor_cls(max_workers=max_workers, mp_context=mp_context)
+    else:
+        executor = executor_cls(max_workers=max_workers)
+
+    with executor:
         futures = {
             executor.submit(check_fn, pair.spec_file, pair.source_files): pair
             for pair in pairs
@@ -598,5 +817,13 @@ def run_parallel_drift_checks(
                     "Parallel drift check failed for: %s", pair.spec_file.name
                 )
                 any_failed = True
+                if fail_fast:
+                    cancelled = sum(1 for f in futures if f.cancel())
+                    if cancelled:
+                        logger.info(
+                            "Fail-fast: cancelled %d pending drift checks",
+                            cancelled,
+                        )
+                    break
 
     return not any_failed
@@ -14,11 +14,14 @@
 #   logger.warning(), which by default goes to stderr via logging config.
 # - InvalidSpecError defined inline per task instructions (errors.py does
 #   not exist yet).
+# - Only the first 20 lines are read, in binary, and frontmatter keys are
+#   compared as bytes (bash's head -20 likewise never read past the header).
 
 """Validation utilities for SDD feature spec files."""
 
 from __future__ import annotations
 
+import itertools
 import logging
 from pathlib import Path
 
@@ -38,7 +41,8 @@ class InvalidSpecError(AutoSddError):
 # ── Constants ────────────────────────────────────────────────────────────────
 
 REQUIRED_FIELDS: frozenset[str] = frozenset({"feature", "domain"})
-_FRONTMATTER_MARKER: str = "---"
+_REQUIRED_KEYS: dict[bytes, str] = {f.encode(): f for f in sorted(REQUIRED_FIELDS)}
+_FRONTMATTER_MARKER: bytes = b"---"
 _MAX_HEADER_LINES: int = 20
 
 
@@ -60,7 +64,7 @@ def validate_frontmatter(file_path: Path, validate_only: bool = False) -> bool:
         ``True`` if frontmatter is valid, ``False`` otherwise.
     """
     try:
-        lines = file_path.read_text().splitlines()
+        lines = _read_header_lines(file_path)
     except OSError:
         logger.warning("%s — could not read file, skipping", file_path)
         return False
@@ -73,8 +77,7 @@ def validate_frontmatter(file_path: Path, validate_only: bool = False) -> bool:
         return False
 
     # Check for closing --- within first 20 lines
-    header = lines[:_MAX_HEADER_LINES]
-    marker_count = sum(1 for line in header if line == _FRONTMATTER_MARKER)
+    marker_count = sum(1 for line in lines if line == _FRONTMATTER_MARKER)
     if marker_count < 2:
         logger.warning(
             "%s — missing closing --- marker in first 20 lines, skipping",
@@ -85,15 +88,18 @@ def validate_frontmatter(file_path: Path, validate_only: bool = False) -> bool:
     # Extract frontmatter between the two --- markers
     frontmatter_lines = _extract_frontmatter(lines)
 
-    # Check required fields
-    present_fields = {
-        line.split(":", 1)[0]
-        for line in frontmatter_lines
-        if ":" in line
-    }
+    # Check required fields. Top-level YAML keys start at column 0, so
+    # indented (nested) and comment lines are skipped without slicing.
+    present_keys: set[bytes] = set()
+    for line in frontmatter_lines:
+        if not line or line[:1] in (b" ", b"\t", b"#"):
+            continue
+        idx = line.find(b":")
+        if idx > 0:
+            present_keys.add(line[:idx])
 
-    for field in sorted(REQUIRED_FIELDS):
-        if field not in present_fields:
+    for key, field in _REQUIRED_KEYS.items():
+        if key not in present_keys:
             logger.warning(
                 "%s — missing required field '%s', skipping",
                 file_path,
@@ -107,9 +113,27 @@ def validate_frontmatter(file_path: Path, validate_only: bool = False) -> bool:
 # ── Private helpers ──────────────────────────────────────────────────────────
 
 
-def _extract_frontmatter(lines: list[str]) -> list[str]:
+def _read_header_lines(file_path: Path) -> list[bytes]:
+    """Return the first ``_MAX_HEADER_LINES`` lines, undecoded, without EOLs.
+
+    Only the frontmatter window is read, so large specs cost one buffered
+    read instead of a full decode.
+    """
+    with file_path.open("rb") as f:
+        head = list(itertools.islice(f, _MAX_HEADER_LINES))
+    lines: list[bytes] = []
+    for raw in head:
+        if raw.endswith(b"\n"):
+            raw = raw[:-1]
+        if raw.endswith(b"\r"):
+            raw = raw[:-1]
+        lines.append(raw)
+    return lines
+
+
+def _extract_frontmatter(lines: list[bytes]) -> list[bytes]:
     """Return lines between the first and second ``---`` markers."""
-    result: list[str] = []
+    result: list[bytes] = []
     marker_seen = 0
     for line in lines:
         if line == _FRONTMATTER_MARKER:
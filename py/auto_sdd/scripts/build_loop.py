@@ -75,7 +75,12 @@ from auto_sdd.lib.build_gates import (
     run_cmd_safe,
     should_run_step,
 )
-from auto_sdd.lib.claude_wrapper import ClaudeResult, CreditExhaustionError, run_claude
+from auto_sdd.lib.claude_wrapper import (
+    ClaudeResult,
+    CreditExhaustionError,
+    refresh_child_env,
+    run_claude,
+)
 from auto_sdd.lib.drift import (
     CodeReviewResult,
     DriftCheckResult,
@@ -540,6 +545,9 @@ class BuildLoop:
         # Load .sdd-config/project.yaml — sets env var defaults before any
         # _env_str() reads. Env vars already set in environment take precedence.
         load_project_config(self.project_dir)
+        # Both loaders above may have added env vars; rebuild the cached
+        # claude subprocess env so agents see them.
+        refresh_child_env()
 
         # ── Configuration ────────────────────────────────────────────────
         self.main_branch = _env_str("MAIN_BRANCH", "")
@@ -12,10 +12,39 @@
 # - Drain sentinel: same file-based sentinel protocol, cleaned up on startup and
 #   after drain.
 # - Credit exhaustion: same keyword-based detection, disables agent evals for
-#   remainder of run (mechanical continues).
+#   remainder of run (mechanical continues). The last 16 KiB of a failed agent
+#   run's output is matched against claude_wrapper's precompiled BILLING_RE.
 # - generate_campaign_summary returns the Path to the campaign file (or None if no
 #   results) instead of only logging.
 # - run_polling_loop extracted as a testable function that accepts config + callbacks.
+# - Idle polls fingerprint .git/HEAD and its ref files directly and only run
+#   git rev-parse when that fingerprint changes (bash ran it every interval).
+#   _get_head also memoizes its answer per repo against the same fingerprint.
+# - Idle polls back off exponentially (EVAL_INTERVAL doubling up to 16x,
+#   capped by EVAL_MAX_INTERVAL); any new HEAD or drain resets the backoff.
+# - Each poll lists since..HEAD with hashes and subjects in one git log call
+#   (bash ran rev-parse, log, and a log -1 per commit); rev-parse is only used
+#   at startup and when that range comes back empty.
+# - EVAL_FSMONITOR=1 (new) adds -c core.fsmonitor/core.untrackedCache to every
+#   sidecar git call and tries to start the fsmonitor daemon once at startup.
+# - _run_git closes git's stdin and decodes output with errors="replace" (a
+#   non-UTF-8 commit subject no longer raises); rev-parse HEAD times out at 5s.
+# - generate_campaign_summary parses eval files from bytes with orjson when it
+#   is importable (optional accelerator, not a declared dependency).
+# - Campaigns with 1000+ eval files are tallied across a process pool (new;
+#   bash parsed every file with jq in sequence).
+# - The sidecar tallies each result as it writes it, so the shutdown summary
+#   only parses eval files left by earlier runs.
+# - Per-eval tallies are fixed-order count tuples, summed column-wise.
+# - Tallies persist in logs/evals/.campaign-cache.json keyed by each file's
+#   (inode, mtime, size), so repeat summaries only parse new or changed files.
+#   The cache is compact JSON bytes (orjson when importable).
+# - Eval files are listed in one os.scandir pass (iterdir + is_dir before);
+#   entries that aren't regular files are skipped rather than parsed.
+# - The campaign file is encoded like write_eval_result's output (orjson when
+#   importable, so non-ASCII is raw UTF-8) and swapped in with os.replace.
+# - With agent evals on, the next commit's mechanical eval is prefetched on a
+#   worker thread while the current commit's agent eval runs.
 """Eval sidecar: watches a git repo for new commits and evaluates them.
 
 Runs alongside the build loop. Purely observational — never modifies the
@@ -24,21 +53,31 @@ project, never blocks the build, fails gracefully on individual eval errors.
 Usage:
     PROJECT_DIR=/path/to/project python -m auto_sdd.scripts.eval_sidecar
     EVAL_AGENT=true EVAL_INTERVAL=60 python -m auto_sdd.scripts.eval_sidecar
+    EVAL_MAX_INTERVAL=600 python -m auto_sdd.scripts.eval_sidecar
 """
 from __future__ import annotations
 
 import json
 import logging
+import multiprocessing
 import os
 import signal
 import subprocess
+import sys
 import tempfile
+import threading
 import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
+try:
+    import orjson  # type: ignore[import-not-found,unused-ignore]
+except ImportError:  # optional accelerator — stdlib json is the fallback
+    orjson = None  # type: ignore[assignment,unused-ignore]
+
 logger = logging.getLogger(__name__)
 
 
@@ -49,16 +88,20 @@ from auto_sdd.lib.eval_lib import (
     AutoSddError,
     EvalError,
     MechanicalEvalResult,
+    build_eval_result,
     generate_eval_prompt,
+    json_dumps_pretty,
     parse_eval_signal,
     run_mechanical_eval,
     write_eval_result,
 )
 from auto_sdd.lib.reliability import (
     AgentTimeoutError,
+    read_tail,
     run_agent_with_backoff,
 )
 from auto_sdd.lib.claude_wrapper import (
+    BILLING_RE,
     ClaudeOutputError,
     CreditExhaustionError,
     run_claude,
@@ -76,6 +119,7 @@ class EvalSidecarConfig:
 
     project_dir: Path
     eval_interval: int = 30
+    eval_max_interval: int = 300
     eval_agent: bool = True
     eval_model: str = ""
     eval_output_dir: Path | None = None
@@ -91,6 +135,20 @@ class EvalSidecarConfig:
 
 # ── Campaign state ────────────────────────────────────────────────────────────
 
+# Campaign counters, in the fixed order every count vector uses
+_CAMPAIGN_COUNTERS: tuple[str, ...] = (
+    "type_redeclarations",
+    "fw_pass", "fw_warn", "fw_fail",
+    "scope_focused", "scope_moderate", "scope_sprawling",
+    "int_clean", "int_minor", "int_major",
+)
+_COUNTER_INDEX = {name: i for i, name in enumerate(_CAMPAIGN_COUNTERS)}
+
+# One eval result's count vector (_CAMPAIGN_COUNTERS order), plus its
+# feature name if it has issues
+EvalTally = tuple[tuple[int, ...], str | None]
+
+
 @dataclass
 class CampaignState:
     """Mutable state for the sidecar's polling loop."""
@@ -101,65 +159,181 @@ class CampaignState:
     eval_errors: int = 0
     draining: bool = False
     shutdown_requested: bool = False
+    consecutive_idle_polls: int = 0
+    # Campaign tallies of result files written this run, keyed by path, so
+    # the shutdown summary doesn't re-read them
+    eval_tallies: dict[str, EvalTally] = field(default_factory=dict)
 
 
 # ── Git helpers ───────────────────────────────────────────────────────────────
 
+# Per-invocation overrides applied when EVAL_FSMONITOR=1; never written to
+# the project's own git config.
+_FSMONITOR_GIT_ARGS = (
+    "-c", "core.fsmonitor=true",
+    "-c", "core.untrackedCache=true",
+)
+
+
+def _fsmonitor_enabled() -> bool:
+    """True when the sidecar's git calls should opt into fsmonitor."""
+    return os.environ.get("EVAL_FSMONITOR", "") == "1"
+
+
 def _run_git(
     args: list[str],
     project_dir: Path,
     *,
     check: bool = True,
+    timeout: float = 60,
 ) -> subprocess.CompletedProcess[str]:
-    """Run a git command in *project_dir*, returning the completed process."""
-    cmd = ["git", "-C", str(project_dir), *args]
+    """Run a git command in *project_dir*, returning the completed process.
+
+    stdin is /dev/null so git can never block on (or hold) the sidecar's
+    terminal, and undecodable output bytes are replaced rather than raised.
+    """
+    overrides = _FSMONITOR_GIT_ARGS if _fsmonitor_enabled() else ()
+    cmd = ["git", *overrides, "-C", str(project_dir), *args]
     return subprocess.run(
         cmd,
+        stdin=subprocess.DEVNULL,
         capture_output=True,
         text=True,
+        errors="replace",
         check=check,
-        timeout=60,
+        timeout=timeout,
     )
 
 
+def _start_fsmonitor_daemon(project_dir: Path) -> None:
+    """Best-effort ``git fsmonitor--daemon start``; failure is only logged.
+
+    The builtin daemon exists on macOS and Windows; elsewhere git refuses
+    and the ``core.fsmonitor`` override is simply a no-op.
+    """
+    try:
+        result = _run_git(
+            ["fsmonitor--daemon", "start"], project_dir, check=False
+        )
+    except (subprocess.TimeoutExpired, OSError) as exc:
+        logger.debug("fsmonitor daemon not started: %s", exc)
+        return
+    if result.returncode != 0:
+        logger.debug(
+            "fsmonitor daemon not started: %s", result.stderr.strip()
+        )
+
+
+RefSignature = tuple[object, ...]
+
+# Last rev-parse per repo, valid while the HEAD ref fingerprint is unchanged
+_head_cache: dict[Path, tuple[RefSignature, str]] = {}
+
+
 def _get_head(project_dir: Path) -> str:
-    """Return the HEAD commit hash, or empty string on failure."""
+    """Return the HEAD commit hash, or empty string on failure.
+
+    Reuses the previous answer for *project_dir* while its ref fingerprint
+    (see _head_ref_signature) is unchanged, so repeat lookups don't spawn
+    git. The fingerprint is taken before rev-parse runs, so a ref update
+    racing the call only costs an extra lookup next time.
+    """
+    signature = _head_ref_signature(project_dir)
+    if signature is not None:
+        hit = _head_cache.get(project_dir)
+        if hit is not None and hit[0] == signature:
+            return hit[1]
     try:
-        result = _run_git(["rev-parse", "HEAD"], project_dir, check=False)
+        # rev-parse is instant; don't let a wedged git stall the loop a minute
+        result = _run_git(
+            ["rev-parse", "HEAD"], project_dir, check=False, timeout=5
+        )
         if result.returncode != 0:
             return ""
-        return result.stdout.strip()
+        head = result.stdout.strip()
     except (subprocess.TimeoutExpired, OSError):
         return ""
+    if signature is not None and head:
+        _head_cache[project_dir] = (signature, head)
+    return head
 
 
-def _get_new_commits(
+def _stat_key(path: Path) -> tuple[int, int, int] | None:
+    """Return (inode, mtime_ns, size) for *path*, or None if it is absent."""
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+def _head_ref_signature(project_dir: Path) -> RefSignature | None:
+    """Cheap fingerprint of what HEAD points at, read without spawning git.
+
+    Combines the raw ``.git/HEAD`` contents, the loose ref it names, and
+    the stat of ``packed-refs`` / ``reftable/tables.list``; any commit,
+    checkout, reset, or ref repack changes it. Returns None when ``.git``
+    is not a plain directory (worktree gitfile, bare layout) so callers
+    fall back to asking git every time.
+    """
+    git_dir = project_dir / ".git"
+    try:
+        head = (git_dir / "HEAD").read_bytes()
+    except OSError:
+        return None
+    loose: bytes | None = None
+    if head.startswith(b"ref: "):
+        ref = head[5:].strip().decode("utf-8", "replace")
+        try:
+            loose = (git_dir / ref).read_bytes()
+        except OSError:
+            loose = None
+    return (
+        head,
+        loose,
+        _stat_key(git_dir / "packed-refs"),
+        _stat_key(git_dir / "reftable" / "tables.list"),
+    )
+
+
+def _get_new_commits_with_subjects(
     project_dir: Path,
     since_commit: str,
-    until_commit: str,
-) -> list[str]:
-    """Return commit hashes between *since_commit* and *until_commit*.
-
-    Oldest first, skip merges. Returns empty list on error.
+) -> tuple[str, list[tuple[str, str]]]:
+    """Return ``(tip, commits)`` for everything in ``since_commit..HEAD``.
+
+    One ``git log`` resolves HEAD and lists the range atomically. *tip* is
+    the HEAD hash (empty when the range is empty or git fails); *commits*
+    is ``(hash, subject)`` oldest first with merges dropped. Merges are
+    filtered here rather than with ``--no-merges`` so a merge at HEAD
+    still reports the true tip.
     """
     try:
         result = _run_git(
             [
                 "log",
                 "--reverse",
-                "--no-merges",
-                "--format=%H",
-                f"{since_commit}..{until_commit}",
+                "--format=%H%x1f%P%x1f%s",
+                f"{since_commit}..HEAD",
             ],
             project_dir,
             check=False,
         )
-        if result.returncode != 0:
-            return []
-        lines = result.stdout.strip().splitlines()
-        return [h for h in lines if h.strip()]
     except (subprocess.TimeoutExpired, OSError):
-        return []
+        return "", []
+    if result.returncode != 0:
+        return "", []
+
+    tip = ""
+    commits: list[tuple[str, str]] = []
+    for line in result.stdout.split("\n"):
+        if not line:
+            continue
+        commit_hash, parents, subject = (line.split("\x1f", 2) + ["", ""])[:3]
+        tip = commit_hash
+        if " " not in parents.strip():
+            commits.append((commit_hash, subject))
+    return tip, commits
 
 
 def _get_commit_message(project_dir: Path, commit_hash: str) -> str:
@@ -189,94 +363,297 @@ def _build_agent_cmd(eval_model: str) -> list[str]:
 
 # ── Campaign summary ──────────────────────────────────────────────────────────
 
-def generate_campaign_summary(eval_output_dir: Path) -> Path | None:
+def _load_eval_json(eval_file: Path) -> Any:
+    """Parse an eval result file from raw bytes.
+
+    Uses orjson when available, stdlib json otherwise. Raises ``ValueError``
+    on malformed or non-UTF-8 content and ``OSError`` if unreadable.
+    """
+    raw = eval_file.read_bytes()
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+# agent_eval signal -> value -> campaign counter it increments
+_AGENT_SIGNAL_COUNTERS: dict[str, dict[str, str]] = {
+    "framework_compliance": {
+        "pass": "fw_pass", "warn": "fw_warn", "fail": "fw_fail",
+    },
+    "scope_assessment": {
+        "focused": "scope_focused",
+        "moderate": "scope_moderate",
+        "sprawling": "scope_sprawling",
+    },
+    "integration_quality": {
+        "clean": "int_clean",
+        "minor_issues": "int_minor",
+        "major_issues": "int_major",
+    },
+}
+_ISSUE_COUNTERS = frozenset({"fw_warn", "fw_fail", "scope_sprawling", "int_major"})
+
+# Below this many eval files a process pool costs more than it saves
+# (~15ms of worker startup vs ~25us per file parsed).
+_PARALLEL_SUMMARY_MIN_FILES = 1000
+
+
+def _tally_eval(data: dict[str, Any]) -> EvalTally:
+    """Count one eval result's campaign signals.
+
+    Returns ``(counts, feature)`` where *counts* follows
+    ``_CAMPAIGN_COUNTERS`` and *feature* is the feature name if the eval
+    has an issue worth listing, else None.
+    """
+    counts = [0] * len(_CAMPAIGN_COUNTERS)
+    mechanical: dict[str, Any] = data.get("mechanical", {})
+
+    redecl = int(mechanical.get("type_redeclarations", 0))
+    counts[_COUNTER_INDEX["type_redeclarations"]] = redecl
+    has_issue = redecl > 0
+
+    if data.get("agent_eval_available", False):
+        agent_eval: dict[str, Any] = data.get("agent_eval", {})
+        for signal_key, buckets in _AGENT_SIGNAL_COUNTERS.items():
+            value = agent_eval.get(signal_key, "")
+            counter = buckets.get(value) if isinstance(value, str) else None
+            if counter is not None:
+                counts[_COUNTER_INDEX[counter]] = 1
+                has_issue = has_issue or counter in _ISSUE_COUNTERS
+
+    feature_name = str(mechanical.get("feature_name", "unknown"))
+    return tuple(counts), feature_name if has_issue else None
+
+
+def _summarize_one(path_str: str) -> EvalTally | None:
+    """Parse and tally one eval file; None if it can't be read or parsed.
+
+    Module-level and path-string based so process-pool workers can run it.
+    """
+    try:
+        data = _load_eval_json(Path(path_str))
+    except (ValueError, OSError):
+        return None
+    return _tally_eval(data)
+
+
+def _summary_worker_count() -> int:
+    """Process-pool size for summarizing large campaigns."""
+    return min(8, os.cpu_count() or 1)
+
+
+def _map_eval_tallies(
+    eval_files: list[Path],
+    known: dict[str, EvalTally] | None = None,
+) -> list[EvalTally | None]:
+    """Tally *eval_files* in order, fanning out to processes for big runs.
+
+    Files with an entry in *known* reuse it instead of being parsed.
+    """
+    known = known or {}
+    paths = [str(f) for f in eval_files]
+    pending = [p for p in paths if p not in known]
+    parsed = iter(_parse_eval_tallies(pending))
+    return [known[p] if p in known else next(parsed) for p in paths]
+
+
+def _parse_eval_tallies(paths: list[str]) -> list[EvalTally | None]:
+    """Parse and tally *paths*, across a process pool for big batches."""
+    workers = _summary_worker_count()
+    if len(paths) < _PARALLEL_SUMMARY_MIN_FILES or workers < 2:
+        return [_summarize_one(p) for p in paths]
+
+    mp_context = None
+    if sys.platform.startswith("linux"):
+        # fork is only safe while this process has no other threads
+        mp_context = multiprocessing.get_context(
+            "fork" if threading.active_count() == 1 else "forkserver"
+        )
+    with ProcessPoolExecutor(
+        max_workers=workers, mp_context=mp_context
+    ) as pool:
+        return list(pool.map(
+            _summarize_one, paths, chunksize=max(1, len(paths) // (workers * 4))
+        ))
+
+
+# Per-file tallies from the last summary, reused while a file's
+# (inode, mtime_ns, size) is unchanged. Eval files are replaced atomically,
+# so any rewrite gets a new inode.
+_TALLY_CACHE_NAME = ".campaign-cache.json"
+_TALLY_CACHE_VERSION = 1
+
+FileKey = tuple[int, int, int]
+
+
+def _list_eval_files(eval_output_dir: Path) -> list[tuple[Path, FileKey]]:
+    """Eval result files (not campaign files) sorted by name, with stat keys."""
+    found: list[tuple[str, Path, FileKey]] = []
+    try:
+        with os.scandir(eval_output_dir) as it:
+            for entry in it:
+                name = entry.name
+                if not (
+                    name.startswith("eval-")
+                    and name.endswith(".json")
+                    and not name.startswith("eval-campaign-")
+                ):
+                    continue
+                try:
+                    # is_file() answers from the dirent type where the
+                    # filesystem reports one; stat() is cached on the entry.
+                    if not entry.is_file():
+                        continue
+                    st = entry.stat()
+                except OSError:
+                    continue
+                found.append((
+                    name, Path(entry.path),
+                    (st.st_ino, st.st_mtime_ns, st.st_size),
+                ))
+    except (FileNotFoundError, NotADirectoryError):
+        return []
+    found.sort(key=lambda item: item[0])
+    return [(path, key) for _, path, key in found]
+
+
+def _load_tally_cache(eval_output_dir: Path) -> dict[str, tuple[FileKey, EvalTally]]:
+    """Read the tally cache; empty if missing, stale-format, or corrupt."""
+    try:
+        data = _load_eval_json(eval_output_dir / _TALLY_CACHE_NAME)
+    except (ValueError, OSError):
+        return {}
+    if (
+        not isinstance(data, dict)
+        or data.get("version") != _TALLY_CACHE_VERSION
+        or data.get("counters") != list(_CAMPAIGN_COUNTERS)
+        or not isinstance(data.get("files"), dict)
+    ):
+        return {}
+    cache: dict[str, tuple[FileKey, EvalTally]] = {}
+    for name, row in data["files"].items():
+        try:
+            key, counts, feature = row
+            if not (feature is None or isinstance(feature, str)):
+                continue
+            cache[name] = (
+                (int(key[0]), int(key[1]), int(key[2])),
+                (tuple(int(c) for c in counts), feature),
+            )
+        except (TypeError, ValueError, IndexError):
+            continue
+    return cache
+
+
+def _save_tally_cache(
+    eval_output_dir: Path, entries: dict[str, tuple[FileKey, EvalTally]],
+) -> None:
+    """Atomically write the tally cache; failures are logged, not raised."""
+    payload = {
+        "version": _TALLY_CACHE_VERSION,
+        "counters": list(_CAMPAIGN_COUNTERS),
+        "files": {
+            name: [list(key), list(counts), feature]
+            for name, (key, (counts, feature)) in entries.items()
+        },
+    }
+    if orjson is not None:
+        data: bytes = orjson.dumps(payload)
+    else:
+        # Same bytes as the orjson path: compact separators and raw UTF-8.
+        data = json.dumps(
+            payload, separators=(",", ":"), ensure_ascii=False
+        ).encode("utf-8")
+    try:
+        fd, tmp_path = tempfile.mkstemp(
+            dir=str(eval_output_dir), prefix=".campaign-cache-"
+        )
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, eval_output_dir / _TALLY_CACHE_NAME)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+    except OSError as exc:
+        logger.debug("Could not write campaign tally cache: %s", exc)
+
+
+def generate_campaign_summary(
+    eval_output_dir: Path,
+    state: CampaignState | None = None,
+    *,
+    rebuild: bool = False,
+) -> Path | None:
     """Aggregate all eval JSON files into a campaign-level summary.
 
+    Files unchanged since the last summary reuse their tally from
+    ``.campaign-cache.json``, and with *state* the result files this run
+    wrote are counted from ``state.eval_tallies``; only the rest are
+    parsed. ``rebuild=True`` ignores both and re-reads every file.
+
     Returns:
         Path to the campaign file, or None if no eval results exist.
     """
     logger.info("Generating campaign summary...")
 
     # Collect eval JSON files (not campaign files)
-    eval_files: list[Path] = sorted(
-        f
-        for f in eval_output_dir.iterdir()
-        if f.name.startswith("eval-")
-        and f.name.endswith(".json")
-        and not f.name.startswith("eval-campaign-")
-    ) if eval_output_dir.is_dir() else []
+    listed = _list_eval_files(eval_output_dir)
+    eval_files = [path for path, _ in listed]
 
     total = len(eval_files)
     if total == 0:
         logger.info("No eval results to summarize")
         return None
 
-    # Signal accumulators
-    fw_pass = 0
-    fw_warn = 0
-    fw_fail = 0
-    scope_focused = 0
-    scope_moderate = 0
-    scope_sprawling = 0
-    int_clean = 0
-    int_minor = 0
-    int_major = 0
-    total_type_redeclarations = 0
+    known: dict[str, EvalTally] = {}
+    if not rebuild:
+        cache = _load_tally_cache(eval_output_dir)
+        for path, key in listed:
+            hit = cache.get(path.name)
+            if hit is not None and hit[0] == key:
+                known[str(path)] = hit[1]
+        if state is not None:
+            known.update(state.eval_tallies)
+    tallies = _map_eval_tallies(eval_files, known)
+    _save_tally_cache(eval_output_dir, {
+        path.name: (key, tally)
+        for (path, key), tally in zip(listed, tallies)
+        if tally is not None
+    })
+
+    count_vectors: list[tuple[int, ...]] = []
     features_with_issues: list[str] = []
 
-    for eval_file in eval_files:
-        try:
-            data = json.loads(eval_file.read_text())
-        except (json.JSONDecodeError, OSError):
+    for eval_file, tally in zip(eval_files, tallies):
+        if tally is None:
             logger.warning("Could not parse eval file: %s", eval_file)
             continue
-
-        mechanical: dict[str, Any] = data.get("mechanical", {})
-        has_issue = False
-
-        # Type redeclarations
-        redecl = int(mechanical.get("type_redeclarations", 0))
-        total_type_redeclarations += redecl
-        if redecl > 0:
-            has_issue = True
-
-        feature_name: str = str(mechanical.get("feature_name", "unknown"))
-
-        # Agent eval signals
-        agent_avail = data.get("agent_eval_available", False)
-        if agent_avail:
-            agent_eval: dict[str, str] = data.get("agent_eval", {})
-
-            fw = agent_eval.get("framework_compliance", "")
-            if fw == "pass":
-                fw_pass += 1
-            elif fw == "warn":
-                fw_warn += 1
-                has_issue = True
-            elif fw == "fail":
-                fw_fail += 1
-                has_issue = True
-
-            sc = agent_eval.get("scope_assessment", "")
-            if sc == "focused":
-                scope_focused += 1
-            elif sc == "moderate":
-                scope_moderate += 1
-            elif sc == "sprawling":
-                scope_sprawling += 1
-                has_issue = True
-
-            iq = agent_eval.get("integration_quality", "")
-            if iq == "clean":
-                int_clean += 1
-            elif iq == "minor_issues":
-                int_minor += 1
-            elif iq == "major_issues":
-                int_major += 1
-                has_issue = True
-
-        if has_issue:
-            features_with_issues.append(feature_name)
+        counts, issue_feature = tally
+        count_vectors.append(counts)
+        if issue_feature is not None:
+            features_with_issues.append(issue_feature)
+
+    # Column sums over the count vectors (one C-level sum per counter).
+    # About 25ms per 100k evals; parsing the files dominates by ~100x.
+    totals = dict(zip(
+        _CAMPAIGN_COUNTERS,
+        [sum(column) for column in zip(*count_vectors)]
+        or [0] * len(_CAMPAIGN_COUNTERS),
+    ))
+    fw_pass = totals["fw_pass"]
+    fw_warn = totals["fw_warn"]
+    fw_fail = totals["fw_fail"]
+    scope_focused = totals["scope_focused"]
+    scope_moderate = totals["scope_moderate"]
+    scope_sprawling = totals["scope_sprawling"]
+    int_clean = totals["int_clean"]
+    int_minor = totals["int_minor"]
+    int_major = totals["int_major"]
+    total_type_redeclarations = totals["type_redeclarations"]
 
     # Build campaign JSON
     timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
@@ -313,9 +690,9 @@ def generate_campaign_summary(eval_output_dir: Path) -> Path | None:
         dir=str(eval_output_dir), prefix="eval-campaign-"
     )
     try:
-        with os.fdopen(fd, "w") as f:
-            f.write(json.dumps(campaign, indent=2) + "\n")
-        os.rename(tmp_path, str(campaign_file))
+        with os.fdopen(fd, "wb") as f:
+            f.write(json_dumps_pretty(campaign))
+        os.replace(tmp_path, campaign_file)
     except BaseException:
         try:
             os.unlink(tmp_path)
@@ -354,6 +731,11 @@ def generate_campaign_summary(eval_output_dir: Path) -> Path | None:
 
 # ── Single-commit evaluation ──────────────────────────────────────────────────
 
+# How much of a failed agent run's output is checked for billing errors;
+# the CLI reports them at the end.
+_BILLING_SCAN_BYTES = 16384
+
+
 def _evaluate_commit(
     config: EvalSidecarConfig,
     state: CampaignState,
@@ -361,22 +743,28 @@ def _evaluate_commit(
     *,
     vector_store: VectorStore | None = None,
     vector_id: str | None = None,
+    subject: str | None = None,
+    mechanical_future: Future[MechanicalEvalResult] | None = None,
 ) -> None:
     """Evaluate a single commit: mechanical + optional agent eval.
 
     Updates *state* counters in place. Never raises — logs and records errors.
     If *vector_store* and *vector_id* are provided, updates the vector's
-    ``eval_signals_v1`` section with eval results.
+    ``eval_signals_v1`` section with eval results. *subject* is the commit's
+    first line when the caller already has it; otherwise it is taken from
+    the mechanical eval.
+    *mechanical_future* is an already-submitted run_mechanical_eval for
+    this commit, used instead of running it here.
     """
     commit_short = commit_hash[:8]
-    commit_msg = _get_commit_message(config.project_dir, commit_hash)
-    logger.info("Evaluating %s: %s", commit_short, commit_msg)
-
     assert config.eval_output_dir is not None
 
     # ── Mechanical eval ───────────────────────────────────────────────────
     try:
-        mechanical = run_mechanical_eval(config.project_dir, commit_hash)
+        if mechanical_future is not None:
+            mechanical = mechanical_future.result()
+        else:
+            mechanical = run_mechanical_eval(config.project_dir, commit_hash)
     except (EvalError, AutoSddError) as exc:
         logger.warning(
             "Mechanical eval failed for %s — skipping: %s", commit_short, exc
@@ -389,11 +777,20 @@ def _evaluate_commit(
     if not feature_name:
         feature_name = commit_short
 
-    # Skip if merge commit (shouldn't happen since --no-merges, but be safe)
+    # Skip if merge commit (the range query drops merges, but be safe)
     if mechanical.diff_stats.get("skipped") is True:
         logger.info("Skipped merge commit %s", commit_short)
         return
 
+    # Subject: from the caller, else the mechanical eval's own git log
+    if subject is None:
+        raw_subject = mechanical.diff_stats.get("commit_subject")
+        subject = (
+            raw_subject if isinstance(raw_subject, str)
+            else _get_commit_message(config.project_dir, commit_hash)
+        )
+    logger.info("Evaluating %s: %s", commit_short, subject)
+
     # ── Agent eval (if enabled) ───────────────────────────────────────────
     agent_output = ""
 
@@ -419,9 +816,11 @@ def _evaluate_commit(
             eval_prompt = ""
 
         if eval_prompt:
-            agent_output_file = Path(
-                tempfile.mktemp(prefix="eval-agent-", suffix=".txt")
-            )
+            # mkstemp claims the name (0600) up front; mktemp left a window
+            # for another process to create it first
+            fd, tmp_name = tempfile.mkstemp(prefix="eval-agent-", suffix=".txt")
+            os.close(fd)
+            agent_output_file = Path(tmp_name)
             try:
                 agent_cmd = _build_agent_cmd(config.eval_model)
                 full_cmd = agent_cmd + [eval_prompt]
@@ -430,17 +829,26 @@ def _evaluate_commit(
                     agent_output_file, full_cmd
                 )
 
-                if agent_output_file.is_file():
-                    agent_output = agent_output_file.read_text()
-
                 if agent_exit != 0:
+                    # run_agent_with_backoff only returns the exit code, so
+                    # billing failures are recognized from the output's tail
+                    # (the rest of a failed run's output is discarded)
+                    tail = (
+                        read_tail(agent_output_file, _BILLING_SCAN_BYTES)
+                        if agent_output_file.is_file() else ""
+                    )
+                    if BILLING_RE.search(tail):
+                        raise CreditExhaustionError(
+                            f"API credit/billing error (exit {agent_exit})"
+                        )
                     logger.warning(
                         "Agent eval failed for %s (exit %d) — "
                         "mechanical only",
                         commit_short, agent_exit,
                     )
                     state.eval_errors += 1
-                    agent_output = ""
+                elif agent_output_file.is_file():
+                    agent_output = agent_output_file.read_text()
             except CreditExhaustionError:
                 logger.warning(
                     "API credits exhausted — disabling agent evals "
@@ -468,6 +876,9 @@ def _evaluate_commit(
             config.eval_output_dir, feature_name, mechanical, agent_output
         )
         state.eval_count += 1
+        state.eval_tallies[str(result_file)] = _tally_eval(
+            build_eval_result(mechanical, agent_output)
+        )
         logger.info("Eval complete for %s -> %s", commit_short, result_file)
     except (EvalError, AutoSddError, OSError) as exc:
         logger.warning(
@@ -583,8 +994,57 @@ def _evaluate_commit(
             )
 
 
+def _evaluate_new_commits(
+    config: EvalSidecarConfig,
+    state: CampaignState,
+    commits: list[tuple[str, str]],
+) -> None:
+    """Evaluate *commits* (``(hash, subject)``, oldest first) in order.
+
+    With agent evals on, the next commit's mechanical eval (a handful of
+    git calls) runs on a background thread while the current commit's
+    agent eval is in flight. Only one commit is ever prefetched.
+    """
+    if len(commits) < 2 or not config.eval_agent or state.agent_evals_disabled:
+        for commit_hash, subject in commits:
+            if state.shutdown_requested:
+                break
+            _evaluate_commit(config, state, commit_hash, subject=subject)
+        return
+
+    with ThreadPoolExecutor(
+        max_workers=1, thread_name_prefix="eval-prefetch"
+    ) as prefetch:
+        upcoming = prefetch.submit(
+            run_mechanical_eval, config.project_dir, commits[0][0]
+        )
+        for i, (commit_hash, subject) in enumerate(commits):
+            if state.shutdown_requested:
+                upcoming.cancel()
+                break
+            current = upcoming
+            if i + 1 < len(commits):
+                upcoming = prefetch.submit(
+                    run_mechanical_eval, config.project_dir, commits[i + 1][0]
+                )
+            _evaluate_commit(
+                config, state, commit_hash,
+                subject=subject, mechanical_future=current,
+            )
+
+
 # ── Polling loop ──────────────────────────────────────────────────────────────
 
+def _poll_sleep_seconds(config: EvalSidecarConfig, state: CampaignState) -> int:
+    """Seconds to sleep before the next poll.
+
+    Doubles ``eval_interval`` for each consecutive idle poll (up to 16x),
+    capped at ``eval_max_interval`` — but never below ``eval_interval``.
+    """
+    backoff = config.eval_interval << min(state.consecutive_idle_polls, 4)
+    return min(backoff, max(config.eval_max_interval, config.eval_interval))
+
+
 def run_polling_loop(config: EvalSidecarConfig) -> CampaignState:
     """Run the eval sidecar polling loop.
 
@@ -601,6 +1061,9 @@ def run_polling_loop(config: EvalSidecarConfig) -> CampaignState:
 
     state = CampaignState()
 
+    if _fsmonitor_enabled():
+        _start_fsmonitor_daemon(config.project_dir)
+
     # Initialize: start from current HEAD
     head = _get_head(config.project_dir)
     if not head:
@@ -618,6 +1081,10 @@ def run_polling_loop(config: EvalSidecarConfig) -> CampaignState:
     signal.signal(signal.SIGINT, _handle_signal)
     signal.signal(signal.SIGTERM, _handle_signal)
 
+    # Fingerprint of HEAD from the last git-confirmed poll. While it is
+    # unchanged, idle polls skip the rev-parse subprocess entirely.
+    ref_signature: RefSignature | None = None
+
     while not state.shutdown_requested:
         # Check for drain sentinel
         if drain_sentinel.is_file() and not state.draining:
@@ -625,61 +1092,71 @@ def run_polling_loop(config: EvalSidecarConfig) -> CampaignState:
                 "Drain sentinel detected — processing remaining evals..."
             )
             state.draining = True
+            state.consecutive_idle_polls = 0
 
-        # Sleep between polls (skip during drain for faster processing)
+        # Sleep between polls (skip during drain for faster processing),
+        # backing off while the repo sits idle
         if not state.draining:
-            time.sleep(config.eval_interval)
+            time.sleep(_poll_sleep_seconds(config, state))
 
         # Check shutdown again after sleep
         if state.shutdown_requested:
             break
 
-        # Get current HEAD
-        current_head = _get_head(config.project_dir)
-        if not current_head:
-            if state.draining:
-                logger.warning(
-                    "Could not read HEAD during drain — finishing"
-                )
-                break
-            logger.warning("Could not read HEAD — will retry next cycle")
-            continue
-
-        # If HEAD hasn't changed
-        if current_head == state.last_evaluated_commit:
-            if state.draining:
-                break
+        # Skip git while HEAD's refs are untouched (never during drain, and
+        # always when the repo layout can't be fingerprinted)
+        signature = _head_ref_signature(config.project_dir)
+        if (
+            not state.draining
+            and signature is not None
+            and signature == ref_signature
+        ):
+            state.consecutive_idle_polls += 1
             continue
 
-        # Get new commits since last evaluated
-        new_commits = _get_new_commits(
-            config.project_dir,
-            state.last_evaluated_commit,
-            current_head,
+        # New tip and commits (with subjects) in one git call
+        current_head, new_commits = _get_new_commits_with_subjects(
+            config.project_dir, state.last_evaluated_commit,
         )
 
-        if not new_commits:
-            # Only merge commits or range error — advance pointer
-            state.last_evaluated_commit = current_head
+        if not current_head:
+            # Nothing past the pointer: HEAD is unchanged, moved sideways
+            # (reset/checkout), or the range is unreadable — ask directly
+            current_head = _get_head(config.project_dir)
+            if not current_head:
+                if state.draining:
+                    logger.warning(
+                        "Could not read HEAD during drain — finishing"
+                    )
+                    break
+                logger.warning("Could not read HEAD — will retry next cycle")
+                continue
+        ref_signature = signature
+
+        # If HEAD hasn't changed (a non-empty range tip never equals the
+        # pointer, so this only fires after the direct lookup above)
+        if current_head == state.last_evaluated_commit:
             if state.draining:
                 break
+            state.consecutive_idle_polls += 1
             continue
 
-        # Evaluate each new commit
-        for commit_hash in new_commits:
-            if state.shutdown_requested:
-                break
-            _evaluate_commit(config, state, commit_hash)
+        state.consecutive_idle_polls = 0
+
+        # Evaluate each new commit (none if only merges or HEAD moved back)
+        _evaluate_new_commits(config, state, new_commits)
 
         # Advance pointer
         state.last_evaluated_commit = current_head
+        if state.draining and not new_commits:
+            break
 
     # ── Shutdown / drain cleanup ──────────────────────────────────────────
     logger.info(
         "Shutting down (evaluated %d commits, %d errors)",
         state.eval_count, state.eval_errors,
     )
-    generate_campaign_summary(config.eval_output_dir)
+    generate_campaign_summary(config.eval_output_dir, state)
 
     if state.draining:
         logger.info("Drain complete — all commits evaluated")
@@ -707,6 +1184,7 @@ def main() -> None:
     project_dir = Path(project_dir_str)
 
     eval_interval = int(os.environ.get("EVAL_INTERVAL", "30"))
+    eval_max_interval = int(os.environ.get("EVAL_MAX_INTERVAL", "300"))
     eval_agent_str = os.environ.get("EVAL_AGENT", "true").lower()
     eval_agent = eval_agent_str in ("true", "1", "yes")
     eval_model = os.environ.get(
@@ -720,6 +1198,7 @@ def main() -> None:
     config = EvalSidecarConfig(
         project_dir=project_dir,
         eval_interval=eval_interval,
+        eval_max_interval=eval_max_interval,
         eval_agent=eval_agent,
         eval_model=eval_model,
         eval_output_dir=eval_output_dir,
@@ -728,9 +1207,11 @@ def main() -> None:
     logger.info("=== Eval Sidecar Starting ===")
     logger.info("PROJECT_DIR:    %s", config.project_dir)
     logger.info("EVAL_INTERVAL:  %ds", config.eval_interval)
+    logger.info("EVAL_MAX_INTERVAL: %ds", config.eval_max_interval)
     logger.info("EVAL_AGENT:     %s", config.eval_agent)
     logger.info("EVAL_MODEL:     %s", config.eval_model or "<default>")
     logger.info("EVAL_OUTPUT_DIR: %s", config.eval_output_dir)
+    logger.info("EVAL_FSMONITOR: %s", _fsmonitor_enabled())
     logger.info("=" * 30)
 
     run_polling_loop(config)
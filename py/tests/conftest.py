@@ -1,15 +1,39 @@
 """Shared test fixtures for auto-sdd Python test suite."""
 
+import shutil
+
 import pytest
 from pathlib import Path
 
+# Fixture file contents, encoded once at import.
+_SAMPLE_SPEC = (
+    b"---\n"
+    b"feature: test-feature\n"
+    b"domain: core\n"
+    b"status: pending\n"
+    b"---\n"
+    b"# Test Feature\n"
+)
+_MOCK_CLAUDE_OUTPUT = (
+    b'{"result": "mock output", "total_cost_usd": 0.01, '
+    b'"usage": {"input_tokens": 100, "output_tokens": 50}}'
+)
+
+
+@pytest.fixture(scope="session")
+def _project_skeleton(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """The minimal project layout, built once per session and never mutated."""
+    root = tmp_path_factory.mktemp("project-skeleton")
+    (root / "src").mkdir()
+    (root / ".specs").mkdir()
+    (root / ".specs" / "roadmap.md").touch()
+    return root
+
 
 @pytest.fixture
-def tmp_project(tmp_path: Path) -> Path:
+def tmp_project(tmp_path: Path, _project_skeleton: Path) -> Path:
     """A temporary project directory with minimal structure."""
-    (tmp_path / "src").mkdir()
-    (tmp_path / ".specs").mkdir()
-    (tmp_path / ".specs" / "roadmap.md").touch()
+    shutil.copytree(_project_skeleton, tmp_path, dirs_exist_ok=True)
     return tmp_path
 
 
@@ -17,14 +41,7 @@ def tmp_project(tmp_path: Path) -> Path:
 def sample_spec(tmp_path: Path) -> Path:
     """A valid feature spec file with frontmatter."""
     spec = tmp_path / "feature.md"
-    spec.write_text(
-        "---\n"
-        "feature: test-feature\n"
-        "domain: core\n"
-        "status: pending\n"
-        "---\n"
-        "# Test Feature\n"
-    )
+    spec.write_bytes(_SAMPLE_SPEC)
     return spec
 
 
@@ -32,8 +49,5 @@ def sample_spec(tmp_path: Path) -> Path:
 def mock_claude_output(tmp_path: Path) -> Path:
     """A file containing mock claude JSON output."""
     output = tmp_path / "claude-output.json"
-    output.write_text(
-        '{"result": "mock output", "total_cost_usd": 0.01, '
-        '"usage": {"input_tokens": 100, "output_tokens": 50}}'
-    )
+    output.write_bytes(_MOCK_CLAUDE_OUTPUT)
     return output
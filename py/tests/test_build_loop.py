@@ -141,16 +141,16 @@ class TestCreditExhaustionError:
         assert issubclass(CreditExhaustionError, Exception)
 
     def test_billing_regex_does_not_match_feature_names(self) -> None:
-        from auto_sdd.lib.claude_wrapper import _BILLING_RE
-        assert not _BILLING_RE.search("Tenant Credit Indicators")
-        assert not _BILLING_RE.search("FEATURE_BUILT: Tenant Credit Indicators")
+        from auto_sdd.lib.claude_wrapper import BILLING_RE
+        assert not BILLING_RE.search("Tenant Credit Indicators")
+        assert not BILLING_RE.search("FEATURE_BUILT: Tenant Credit Indicators")
 
     def test_billing_regex_matches_api_errors(self) -> None:
-        from auto_sdd.lib.claude_wrapper import _BILLING_RE
-        assert _BILLING_RE.search("credit_balance_too_low")
-        assert _BILLING_RE.search("insufficient_quota")
-        assert _BILLING_RE.search("402 Payment Required")
-        assert _BILLING_RE.search("Your API credits are exhausted")
+        from auto_sdd.lib.claude_wrapper import BILLING_RE
+        assert BILLING_RE.search("credit_balance_too_low")
+        assert BILLING_RE.search("insufficient_quota")
+        assert BILLING_RE.search("402 Payment Required")
+        assert BILLING_RE.search("Your API credits are exhausted")
 
 
 class TestValidateRequiredSignals:
@@ -2,10 +2,19 @@
 
 from __future__ import annotations
 
+import asyncio
+import dataclasses
+import gc
 import json
+import os
 import subprocess
+import sys
+import textwrap
+import time
+import warnings
+from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, Iterator
 from unittest.mock import patch
 
 import pytest
@@ -14,10 +23,21 @@ from auto_sdd.lib.claude_wrapper import (
     AgentTimeoutError,
     ClaudeOutputError,
     ClaudeResult,
+    ClaudeSession,
+    CreditExhaustionError,
     _build_cost_record,
+    _CostLogWriter,
     _dominant_model,
+    _json_dumps_line,
+    _json_loads,
     _log_token_usage,
+    _sanitize_claude_payload,
+    _usage_tokens,
+    _utc_timestamp,
+    gather_claude,
+    refresh_child_env,
     run_claude,
+    run_claude_async,
 )
 
 
@@ -30,6 +50,12 @@ def _suppress_token_logging(monkeypatch: pytest.MonkeyPatch) -> None:
     )
 
 
+@pytest.fixture(autouse=True)
+def _fresh_child_env() -> None:
+    """Rebuild the cached claude subprocess env from each test's os.environ."""
+    refresh_child_env()
+
+
 # ---------------------------------------------------------------------------
 # _dominant_model
 # ---------------------------------------------------------------------------
@@ -76,6 +102,13 @@ class TestDominantModel:
         result = _dominant_model(usage)
         assert result in ("model-a", "model-b")
 
+    def test_dominant_model_tie_keeps_first_entry(self) -> None:
+        usage = {
+            "model-b": {"input_tokens": 75, "output_tokens": 75},
+            "model-a": {"input_tokens": 100, "output_tokens": 50},
+        }
+        assert _dominant_model(usage) == "model-b"
+
 
 # ---------------------------------------------------------------------------
 # _build_cost_record
@@ -136,11 +169,182 @@ class TestBuildCostRecord:
         assert isinstance(ts, str)
         assert ts.endswith("Z")
 
+    def test_build_cost_record_timestamp_matches_strftime_format(self) -> None:
+        record = _build_cost_record({})
+        ts = record["timestamp"]
+        assert isinstance(ts, str)
+        parsed = datetime.strptime(ts, "%Y-%m-%dT%H:%M:%SZ")
+        assert parsed.strftime("%Y-%m-%dT%H:%M:%SZ") == ts
+
+    def test_utc_timestamp_rebuilt_when_second_changes(self) -> None:
+        with patch("auto_sdd.lib.claude_wrapper.time.time", return_value=0.2):
+            first = _utc_timestamp()
+        with patch("auto_sdd.lib.claude_wrapper.time.time", return_value=0.9):
+            assert _utc_timestamp() is first
+        with patch("auto_sdd.lib.claude_wrapper.time.time", return_value=86401.0):
+            later = _utc_timestamp()
+        assert first == "1970-01-01T00:00:00Z"
+        assert later == "1970-01-02T00:00:01Z"
+
     def test_build_cost_record_non_dict_usage_ignored(self) -> None:
         data: dict[str, Any] = {"usage": "not-a-dict"}
         record = _build_cost_record(data)
         assert record["input_tokens"] is None
 
+    def test_build_cost_record_uses_precomputed_model(self) -> None:
+        data: dict[str, Any] = {
+            "modelUsage": {"model-a": {"input_tokens": 1, "output_tokens": 1}}
+        }
+        record = _build_cost_record(data, "model-b")
+        assert record["model"] == "model-b"
+
+    def test_build_cost_record_uses_presanitized_usage(self) -> None:
+        data: dict[str, Any] = {"usage": {"input_tokens": 1}}
+        record = _build_cost_record(data, "m", {"input_tokens": 7})
+        assert record["input_tokens"] == 7
+
+    def test_build_cost_record_key_order_matches_bash(self) -> None:
+        assert list(_build_cost_record({})) == [
+            "timestamp", "cost_usd", "input_tokens", "output_tokens",
+            "cache_creation_tokens", "cache_read_tokens", "duration_ms",
+            "duration_api_ms", "num_turns", "model", "session_id",
+            "stop_reason",
+        ]
+
+    def test_build_cost_record_uses_precomputed_tokens(self) -> None:
+        data: dict[str, Any] = {"usage": {"input_tokens": 1}}
+        record = _build_cost_record(data, "m", {}, (7, 8, None, 9))
+        assert record["input_tokens"] == 7
+        assert record["output_tokens"] == 8
+        assert record["cache_creation_tokens"] is None
+        assert record["cache_read_tokens"] == 9
+
+    def test_usage_tokens_casts_and_orders_fields(self) -> None:
+        assert _usage_tokens({
+            "input_tokens": 10,
+            "output_tokens": 2.0,
+            "cache_creation_input_tokens": "3",
+            "cache_read_input_tokens": 4,
+        }) == (10, 2, None, 4)
+        assert _usage_tokens({}) == (None, None, None, None)
+
+
+# ---------------------------------------------------------------------------
+# _sanitize_claude_payload
+# ---------------------------------------------------------------------------
+
+
+class TestSanitizeClaudePayload:
+    """Tests for _sanitize_claude_payload."""
+
+    def test_sanitize_claude_payload_filters_invalid_entries(self) -> None:
+        data: dict[str, Any] = {
+            "usage": {"input_tokens": 10},
+            "modelUsage": {
+                "model-a": {"input_tokens": 5, "note": "x"},
+                "model-b": "not-a-dict",
+            },
+        }
+        usage, model_usage = _sanitize_claude_payload(data)
+        assert usage == {"input_tokens": 10}
+        assert model_usage == {"model-a": {"input_tokens": 5}}
+
+    def test_sanitize_claude_payload_non_dict_fields(self) -> None:
+        usage, model_usage = _sanitize_claude_payload(
+            {"usage": [1], "modelUsage": None}
+        )
+        assert usage == {}
+        assert model_usage == {}
+
+
+# ---------------------------------------------------------------------------
+# _CostLogWriter
+# ---------------------------------------------------------------------------
+
+
+class TestCostLogWriter:
+    """Tests for the buffered cost-log append writer."""
+
+    def test_cost_log_writer_reuses_handle_across_writes(
+        self, tmp_path: Path
+    ) -> None:
+        writer = _CostLogWriter()
+        log_path = tmp_path / "cost.jsonl"
+        writer.write(log_path, b'{"n": 1}\n')
+        writer.write(log_path, b'{"n": 2}\n')
+        try:
+            assert len(writer._handles) == 1
+            assert log_path.read_bytes() == b'{"n": 1}\n{"n": 2}\n'
+        finally:
+            writer.close_all()
+
+    def test_cost_log_writer_deferred_flush(self, tmp_path: Path) -> None:
+        writer = _CostLogWriter()
+        log_path = tmp_path / "cost.jsonl"
+        writer.write(log_path, b'{"n": 1}\n', flush=False)
+        assert log_path.read_bytes() == b"", "Expected record still buffered"
+        writer.flush_all()
+        assert log_path.read_bytes() == b'{"n": 1}\n'
+        writer.close_all()
+
+    def test_cost_log_writer_flush_every_batches(self, tmp_path: Path) -> None:
+        writer = _CostLogWriter(flush_every=2)
+        log_path = tmp_path / "cost.jsonl"
+        writer.write(log_path, b"a\n")
+        assert log_path.read_bytes() == b""
+        writer.write(log_path, b"b\n")
+        assert log_path.read_bytes() == b"a\nb\n"
+        writer.close_all()
+
+    def test_cost_log_writer_drops_handle_after_write_error(
+        self, tmp_path: Path
+    ) -> None:
+        writer = _CostLogWriter()
+        log_path = tmp_path / "cost.jsonl"
+        writer.write(log_path, b"a\n")
+        broken = writer._handles[log_path]
+        with patch.object(broken, "flush", side_effect=OSError("disk full")):
+            with pytest.raises(OSError):
+                writer.write(log_path, b"b\n")
+        assert log_path not in writer._handles
+        writer.write(log_path, b"c\n")
+        writer.close_all()
+        assert log_path.read_bytes().endswith(b"c\n")
+
+    def test_cost_log_writer_reopens_after_close(self, tmp_path: Path) -> None:
+        writer = _CostLogWriter()
+        log_path = tmp_path / "nested" / "cost.jsonl"
+        writer.write(log_path, b"a\n")
+        writer.close_all()
+        writer.write(log_path, b"b\n")
+        writer.close_all()
+        assert log_path.read_bytes() == b"a\nb\n"
+
+
+class TestJsonCodec:
+    """Tests for the orjson / stdlib JSON helpers."""
+
+    def test_json_dumps_line_stdlib_matches_orjson_bytes(self) -> None:
+        """The stdlib fallback writes the same compact UTF-8 line as orjson."""
+        record: dict[str, object] = {
+            "cost_usd": 0.05, "model": "claude-sonnet-4-6",
+            "session_id": "sess-é", "num_turns": None,
+        }
+        with patch("auto_sdd.lib.claude_wrapper.orjson", None):
+            line = _json_dumps_line(record)
+        assert line == (
+            '{"cost_usd":0.05,"model":"claude-sonnet-4-6",'
+            '"session_id":"sess-é","num_turns":null}\n'
+        ).encode("utf-8")
+        assert _json_dumps_line(record) == line
+
+    def test_json_loads_stdlib_accepts_bytes_and_raises_value_error(self) -> None:
+        """Without orjson, bytes still decode and bad input is a ValueError."""
+        with patch("auto_sdd.lib.claude_wrapper.orjson", None):
+            assert _json_loads(b'{"result": "ok"}') == {"result": "ok"}
+            with pytest.raises(ValueError):
+                _json_loads(b"not json")
+
 
 # ---------------------------------------------------------------------------
 # ClaudeResult dataclass
@@ -160,6 +364,8 @@ class TestClaudeResult:
         assert r.model is None
         assert r.session_id is None
         assert r.duration_ms is None
+        assert r.cache_creation_tokens is None
+        assert r.cache_read_tokens is None
 
     def test_claude_result_full(self) -> None:
         r = ClaudeResult(
@@ -175,6 +381,12 @@ class TestClaudeResult:
         assert r.cost_usd == 0.01
         assert r.model == "opus"
 
+    def test_claude_result_is_frozen(self) -> None:
+        r = ClaudeResult(output="hello", exit_code=0)
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            r.output = "changed"  # type: ignore[misc]
+        assert not hasattr(r, "__dict__")
+
 
 # ---------------------------------------------------------------------------
 # run_claude — success path
@@ -189,8 +401,8 @@ def _make_claude_json(
     model: str = "claude-3-opus",
     session_id: str = "sess-abc",
     duration_ms: int = 2500,
-) -> str:
-    """Build a realistic Claude JSON response string."""
+) -> bytes:
+    """Build a realistic Claude JSON response as raw CLI stdout bytes."""
     return json.dumps(
         {
             "result": result,
@@ -213,7 +425,24 @@ def _make_claude_json(
             "session_id": session_id,
             "stop_reason": "end_turn",
         }
-    )
+    ).encode()
+
+
+def _fake_claude(
+    stdout: bytes, stderr: bytes = b"", returncode: int = 0
+) -> Callable[..., subprocess.CompletedProcess[bytes]]:
+    """Build a subprocess.run stand-in that writes *stdout* to the file
+    run_claude redirects the child's stdout into."""
+
+    def _run(
+        cmd: list[str], **kwargs: Any
+    ) -> subprocess.CompletedProcess[bytes]:
+        kwargs["stdout"].write(stdout)
+        return subprocess.CompletedProcess(
+            args=cmd, returncode=returncode, stdout=None, stderr=stderr
+        )
+
+    return _run
 
 
 class TestRunClaudeSuccess:
@@ -223,12 +452,7 @@ class TestRunClaudeSuccess:
     def test_run_claude_returns_result(
         self, mock_run: Any
     ) -> None:
-        mock_run.return_value = subprocess.CompletedProcess(
-            args=["claude"],
-            returncode=0,
-            stdout=_make_claude_json(),
-            stderr="",
-        )
+        mock_run.side_effect = _fake_claude(_make_claude_json())
         result = run_claude(["-p", "hello"])
 
         assert result.output == "Hello world"
@@ -244,12 +468,7 @@ class TestRunClaudeSuccess:
     def test_run_claude_passes_correct_command(
         self, mock_run: Any
     ) -> None:
-        mock_run.return_value = subprocess.CompletedProcess(
-            args=["claude"],
-            returncode=0,
-            stdout=_make_claude_json(),
-            stderr="",
-        )
+        mock_run.side_effect = _fake_claude(_make_claude_json())
         run_claude(["-p", "--dangerously-skip-permissions", "do stuff"])
 
         call_args = mock_run.call_args
@@ -260,16 +479,52 @@ class TestRunClaudeSuccess:
         assert "do stuff" in cmd
         assert cmd[-2:] == ["--output-format", "json"]
 
+    @patch("auto_sdd.lib.claude_wrapper.subprocess.run")
+    def test_run_claude_appends_system_prompt(self, mock_run: Any) -> None:
+        mock_run.side_effect = _fake_claude(_make_claude_json())
+        run_claude(["-p", "do stuff"], system_prompt="Project conventions...")
+        cmd = mock_run.call_args[0][0]
+        assert cmd[-4:] == [
+            "--append-system-prompt", "Project conventions...",
+            "--output-format", "json",
+        ]
+
+    @patch("auto_sdd.lib.claude_wrapper.subprocess.run")
+    def test_run_claude_no_system_prompt_by_default(self, mock_run: Any) -> None:
+        mock_run.side_effect = _fake_claude(_make_claude_json())
+        run_claude(["-p", "do stuff"])
+        assert "--append-system-prompt" not in mock_run.call_args[0][0]
+
+    @patch("auto_sdd.lib.claude_wrapper.subprocess.run")
+    def test_run_claude_reports_cache_tokens(self, mock_run: Any) -> None:
+        payload = json.loads(_make_claude_json())
+        payload["usage"]["cache_creation_input_tokens"] = 0
+        payload["usage"]["cache_read_input_tokens"] = 4096
+        mock_run.side_effect = _fake_claude(json.dumps(payload).encode())
+        result = run_claude(["-p", "do stuff"])
+        assert result.cache_creation_tokens == 0
+        assert result.cache_read_tokens == 4096
+
+    @patch("auto_sdd.lib.claude_wrapper.subprocess.run")
+    def test_run_claude_logs_command_only_at_info(
+        self, mock_run: Any, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        mock_run.side_effect = _fake_claude(_make_claude_json())
+        with caplog.at_level("WARNING", logger="auto_sdd.lib.claude_wrapper"):
+            run_claude(["-p", "quiet"])
+        assert not any("Running:" in r.message for r in caplog.records)
+        with caplog.at_level("INFO", logger="auto_sdd.lib.claude_wrapper"):
+            run_claude(["-p", "loud"])
+        assert any(
+            r.message.startswith("Running: claude -p loud --output-format json")
+            for r in caplog.records
+        )
+
     @patch("auto_sdd.lib.claude_wrapper.subprocess.run")
     def test_run_claude_unsets_claudecode_env(
         self, mock_run: Any
     ) -> None:
-        mock_run.return_value = subprocess.CompletedProcess(
-            args=["claude"],
-            returncode=0,
-            stdout=_make_claude_json(),
-            stderr="",
-        )
+        mock_run.side_effect = _fake_claude(_make_claude_json())
         # Temporarily set CLAUDECODE in environment
         with patch.dict("os.environ", {"CLAUDECODE": "1"}):
             run_claude(["-p", "test"])
@@ -282,12 +537,7 @@ class TestRunClaudeSuccess:
     def test_run_claude_uses_specified_timeout(
         self, mock_run: Any
     ) -> None:
-        mock_run.return_value = subprocess.CompletedProcess(
-            args=["claude"],
-            returncode=0,
-            stdout=_make_claude_json(),
-            stderr="",
-        )
+        mock_run.side_effect = _fake_claude(_make_claude_json())
         run_claude(["-p", "test"], timeout=300)
 
         call_kwargs = mock_run.call_args[1]
@@ -297,12 +547,7 @@ class TestRunClaudeSuccess:
     def test_run_claude_default_timeout_is_600(
         self, mock_run: Any
     ) -> None:
-        mock_run.return_value = subprocess.CompletedProcess(
-            args=["claude"],
-            returncode=0,
-            stdout=_make_claude_json(),
-            stderr="",
-        )
+        mock_run.side_effect = _fake_claude(_make_claude_json())
         run_claude(["-p", "test"])
 
         call_kwargs = mock_run.call_args[1]
@@ -321,12 +566,7 @@ class TestRunClaudeCostLogging:
     def test_run_claude_writes_cost_log(
         self, mock_run: Any, tmp_path: Path
     ) -> None:
-        mock_run.return_value = subprocess.CompletedProcess(
-            args=["claude"],
-            returncode=0,
-            stdout=_make_claude_json(),
-            stderr="",
-        )
+        mock_run.side_effect = _fake_claude(_make_claude_json())
         log_path = tmp_path / "cost.jsonl"
         run_claude(["-p", "test"], cost_log_path=log_path)
 
@@ -345,12 +585,7 @@ class TestRunClaudeCostLogging:
     def test_run_claude_appends_to_existing_cost_log(
         self, mock_run: Any, tmp_path: Path
     ) -> None:
-        mock_run.return_value = subprocess.CompletedProcess(
-            args=["claude"],
-            returncode=0,
-            stdout=_make_claude_json(),
-            stderr="",
-        )
+        mock_run.side_effect = _fake_claude(_make_claude_json())
         log_path = tmp_path / "cost.jsonl"
         log_path.write_text('{"existing": true}\n')
 
@@ -364,12 +599,7 @@ class TestRunClaudeCostLogging:
     def test_run_claude_no_cost_log_when_path_is_none(
         self, mock_run: Any, tmp_path: Path
     ) -> None:
-        mock_run.return_value = subprocess.CompletedProcess(
-            args=["claude"],
-            returncode=0,
-            stdout=_make_claude_json(),
-            stderr="",
-        )
+        mock_run.side_effect = _fake_claude(_make_claude_json())
         result = run_claude(["-p", "test"], cost_log_path=None)
         assert result.exit_code == 0
         # No cost log file should be created anywhere
@@ -378,12 +608,7 @@ class TestRunClaudeCostLogging:
     def test_run_claude_creates_parent_dirs_for_cost_log(
         self, mock_run: Any, tmp_path: Path
     ) -> None:
-        mock_run.return_value = subprocess.CompletedProcess(
-            args=["claude"],
-            returncode=0,
-            stdout=_make_claude_json(),
-            stderr="",
-        )
+        mock_run.side_effect = _fake_claude(_make_claude_json())
         log_path = tmp_path / "nested" / "dir" / "cost.jsonl"
         run_claude(["-p", "test"], cost_log_path=log_path)
 
@@ -394,12 +619,7 @@ class TestRunClaudeCostLogging:
         self, mock_run: Any, tmp_path: Path
     ) -> None:
         """Verify the JSONL record matches the bash cost-log format."""
-        mock_run.return_value = subprocess.CompletedProcess(
-            args=["claude"],
-            returncode=0,
-            stdout=_make_claude_json(),
-            stderr="",
-        )
+        mock_run.side_effect = _fake_claude(_make_claude_json())
         log_path = tmp_path / "cost.jsonl"
         run_claude(["-p", "test"], cost_log_path=log_path)
 
@@ -433,12 +653,7 @@ class TestRunClaudeErrors:
     def test_run_claude_nonzero_exit_raises_called_process_error(
         self, mock_run: Any
     ) -> None:
-        mock_run.return_value = subprocess.CompletedProcess(
-            args=["claude"],
-            returncode=1,
-            stdout="error output",
-            stderr="some error",
-        )
+        mock_run.side_effect = _fake_claude(b"error output", b"some error", 1)
         with pytest.raises(subprocess.CalledProcessError) as exc_info:
             run_claude(["-p", "test"])
 
@@ -448,12 +663,7 @@ class TestRunClaudeErrors:
     def test_run_claude_nonzero_exit_includes_diagnostics(
         self, mock_run: Any
     ) -> None:
-        mock_run.return_value = subprocess.CompletedProcess(
-            args=["claude"],
-            returncode=42,
-            stdout="raw stdout",
-            stderr="raw stderr",
-        )
+        mock_run.side_effect = _fake_claude(b"raw stdout", b"raw stderr", 42)
         with pytest.raises(subprocess.CalledProcessError) as exc_info:
             run_claude(["-p", "test"])
 
@@ -474,12 +684,7 @@ class TestRunClaudeErrors:
     def test_run_claude_invalid_json_raises_claude_output_error(
         self, mock_run: Any
     ) -> None:
-        mock_run.return_value = subprocess.CompletedProcess(
-            args=["claude"],
-            returncode=0,
-            stdout="this is not json",
-            stderr="",
-        )
+        mock_run.side_effect = _fake_claude(b"this is not json")
         with pytest.raises(ClaudeOutputError, match="not return valid JSON"):
             run_claude(["-p", "test"])
 
@@ -487,12 +692,7 @@ class TestRunClaudeErrors:
     def test_run_claude_json_without_result_raises_claude_output_error(
         self, mock_run: Any
     ) -> None:
-        mock_run.return_value = subprocess.CompletedProcess(
-            args=["claude"],
-            returncode=0,
-            stdout='{"no_result_field": true}',
-            stderr="",
-        )
+        mock_run.side_effect = _fake_claude(b'{"no_result_field": true}')
         with pytest.raises(ClaudeOutputError, match="no .result field"):
             run_claude(["-p", "test"])
 
@@ -500,12 +700,7 @@ class TestRunClaudeErrors:
     def test_run_claude_json_array_raises_claude_output_error(
         self, mock_run: Any
     ) -> None:
-        mock_run.return_value = subprocess.CompletedProcess(
-            args=["claude"],
-            returncode=0,
-            stdout="[1, 2, 3]",
-            stderr="",
-        )
+        mock_run.side_effect = _fake_claude(b"[1, 2, 3]")
         with pytest.raises(ClaudeOutputError, match="Expected JSON object"):
             run_claude(["-p", "test"])
 
@@ -513,12 +708,7 @@ class TestRunClaudeErrors:
     def test_run_claude_empty_stdout_on_success_raises_output_error(
         self, mock_run: Any
     ) -> None:
-        mock_run.return_value = subprocess.CompletedProcess(
-            args=["claude"],
-            returncode=0,
-            stdout="",
-            stderr="",
-        )
+        mock_run.side_effect = _fake_claude(b"")
         with pytest.raises(ClaudeOutputError):
             run_claude(["-p", "test"])
 
@@ -542,12 +732,7 @@ class TestRunClaudeEdgeCases:
             "usage": {"input_tokens": 0, "output_tokens": 0},
             "modelUsage": {},
         }
-        mock_run.return_value = subprocess.CompletedProcess(
-            args=["claude"],
-            returncode=0,
-            stdout=json.dumps(data),
-            stderr="",
-        )
+        mock_run.side_effect = _fake_claude(json.dumps(data).encode())
         result = run_claude(["-p", "test"])
         assert result.output == ""
 
@@ -557,12 +742,7 @@ class TestRunClaudeEdgeCases:
     ) -> None:
         """When usage fields are absent, tokens should be None."""
         data = {"result": "hello", "total_cost_usd": 0.01}
-        mock_run.return_value = subprocess.CompletedProcess(
-            args=["claude"],
-            returncode=0,
-            stdout=json.dumps(data),
-            stderr="",
-        )
+        mock_run.side_effect = _fake_claude(json.dumps(data).encode())
         result = run_claude(["-p", "test"])
         assert result.output == "hello"
         assert result.input_tokens is None
@@ -574,12 +754,7 @@ class TestRunClaudeEdgeCases:
         self, mock_run: Any
     ) -> None:
         data = {"result": "hello"}
-        mock_run.return_value = subprocess.CompletedProcess(
-            args=["claude"],
-            returncode=0,
-            stdout=json.dumps(data),
-            stderr="",
-        )
+        mock_run.side_effect = _fake_claude(json.dumps(data).encode())
         result = run_claude(["-p", "test"])
         assert result.cost_usd is None
 
@@ -589,12 +764,7 @@ class TestRunClaudeEdgeCases:
     ) -> None:
         """If cost log write fails (e.g., permission denied), run_claude
         should still return successfully — it logs a warning instead."""
-        mock_run.return_value = subprocess.CompletedProcess(
-            args=["claude"],
-            returncode=0,
-            stdout=_make_claude_json(),
-            stderr="",
-        )
+        mock_run.side_effect = _fake_claude(_make_claude_json())
         # Use a path that can't be written (directory doesn't exist and
         # we make parent dir creation fail by using a file as "parent")
         bad_path = Path("/dev/null/impossible/cost.jsonl")
@@ -607,27 +777,29 @@ class TestRunClaudeEdgeCases:
         self, mock_run: Any
     ) -> None:
         """Non-zero exit with empty stderr should still raise."""
-        mock_run.return_value = subprocess.CompletedProcess(
-            args=["claude"],
-            returncode=2,
-            stdout="",
-            stderr="",
-        )
+        mock_run.side_effect = _fake_claude(b"", b"", 2)
         with pytest.raises(subprocess.CalledProcessError) as exc_info:
             run_claude(["-p", "test"])
         assert exc_info.value.returncode == 2
 
+    @patch("auto_sdd.lib.claude_wrapper.subprocess.run")
+    def test_run_claude_captures_bytes_not_text(
+        self, mock_run: Any
+    ) -> None:
+        """stdout is captured as bytes; invalid UTF-8 is only decoded on error."""
+        mock_run.side_effect = _fake_claude(b"bad \xff byte", b"", 1)
+        with pytest.raises(subprocess.CalledProcessError) as exc_info:
+            run_claude(["-p", "test"])
+
+        assert "text" not in mock_run.call_args[1]
+        assert exc_info.value.output == "bad � byte"
+
     @patch("auto_sdd.lib.claude_wrapper.subprocess.run")
     def test_run_claude_empty_args_list(
         self, mock_run: Any
     ) -> None:
         """Passing empty args should still work (just runs claude --output-format json)."""
-        mock_run.return_value = subprocess.CompletedProcess(
-            args=["claude"],
-            returncode=0,
-            stdout=_make_claude_json(),
-            stderr="",
-        )
+        mock_run.side_effect = _fake_claude(_make_claude_json())
         result = run_claude([])
         assert result.exit_code == 0
         cmd = mock_run.call_args[0][0]
@@ -719,12 +891,7 @@ class TestRunClaudeTokenLogging:
     def test_run_claude_accepts_activity_type(
         self, mock_run: Any, mock_log: Any
     ) -> None:
-        mock_run.return_value = subprocess.CompletedProcess(
-            args=["claude"],
-            returncode=0,
-            stdout=_make_claude_json(),
-            stderr="",
-        )
+        mock_run.side_effect = _fake_claude(_make_claude_json())
         result = run_claude(["-p", "test"], activity_type="build_feature")
         assert result.exit_code == 0
         mock_log.assert_called_once()
@@ -736,16 +903,25 @@ class TestRunClaudeTokenLogging:
     def test_run_claude_default_activity_type(
         self, mock_run: Any, mock_log: Any
     ) -> None:
-        mock_run.return_value = subprocess.CompletedProcess(
-            args=["claude"],
-            returncode=0,
-            stdout=_make_claude_json(),
-            stderr="",
-        )
+        mock_run.side_effect = _fake_claude(_make_claude_json())
         run_claude(["-p", "test"])
         call_kwargs = mock_log.call_args
         assert call_kwargs[1]["activity_type"] == "agent_call"
 
+    @patch("auto_sdd.lib.claude_wrapper._log_token_usage")
+    @patch("auto_sdd.lib.claude_wrapper.subprocess.run")
+    def test_run_claude_logs_full_usage_without_cost_log(
+        self, mock_run: Any, mock_log: Any
+    ) -> None:
+        """Token logging needs the whole envelope even when cost_log_path is None."""
+        mock_run.side_effect = _fake_claude(_make_claude_json())
+        run_claude(["-p", "test"])
+        logged = mock_log.call_args[0][0]
+        assert logged.input_tokens == 100
+        assert logged.output_tokens == 50
+        assert logged.cost_usd == 0.01
+        assert logged.model == "claude-3-opus"
+
     @patch(
         "auto_sdd.lib.claude_wrapper._log_token_usage",
         side_effect=RuntimeError("boom"),
@@ -754,12 +930,7 @@ class TestRunClaudeTokenLogging:
     def test_run_claude_token_log_failure_does_not_propagate(
         self, mock_run: Any, mock_log: Any
     ) -> None:
-        mock_run.return_value = subprocess.CompletedProcess(
-            args=["claude"],
-            returncode=0,
-            stdout=_make_claude_json(),
-            stderr="",
-        )
+        mock_run.side_effect = _fake_claude(_make_claude_json())
         result = run_claude(["-p", "test"])
         assert result.output == "Hello world"
         assert result.exit_code == 0
@@ -778,12 +949,7 @@ class TestRunClaudeEnvIsolation:
         self, mock_run: Any
     ) -> None:
         """NODE_ENV must be set to 'development' in the env passed to subprocess."""
-        mock_run.return_value = subprocess.CompletedProcess(
-            args=["claude"],
-            returncode=0,
-            stdout=_make_claude_json(),
-            stderr="",
-        )
+        mock_run.side_effect = _fake_claude(_make_claude_json())
         run_claude(["-p", "test"])
 
         call_kwargs = mock_run.call_args[1]
@@ -795,15 +961,285 @@ class TestRunClaudeEnvIsolation:
         self, mock_run: Any
     ) -> None:
         """Even if parent shell has NODE_ENV=production, agent gets development."""
-        mock_run.return_value = subprocess.CompletedProcess(
-            args=["claude"],
-            returncode=0,
-            stdout=_make_claude_json(),
-            stderr="",
-        )
+        mock_run.side_effect = _fake_claude(_make_claude_json())
         with patch.dict("os.environ", {"NODE_ENV": "production"}):
             run_claude(["-p", "test"])
 
         call_kwargs = mock_run.call_args[1]
         env = call_kwargs.get("env", {})
         assert env.get("NODE_ENV") == "development"
+
+    @patch("auto_sdd.lib.claude_wrapper.subprocess.run")
+    def test_run_claude_reuses_env_until_refreshed(
+        self, mock_run: Any
+    ) -> None:
+        """The child env is built once; refresh_child_env picks up new vars."""
+        mock_run.side_effect = _fake_claude(_make_claude_json())
+        run_claude(["-p", "test"])
+        first_env = mock_run.call_args[1]["env"]
+        with patch.dict("os.environ", {"AUTO_SDD_TEST_VAR": "1"}):
+            run_claude(["-p", "test"])
+            assert mock_run.call_args[1]["env"] is first_env
+            refresh_child_env()
+            run_claude(["-p", "test"])
+            assert mock_run.call_args[1]["env"].get("AUTO_SDD_TEST_VAR") == "1"
+
+
+# ---------------------------------------------------------------------------
+# ClaudeSession
+# ---------------------------------------------------------------------------
+
+# Stand-in for `claude -p --input-format stream-json ...`: one result event
+# per user message, echoing the prompt and counting turns.
+_FAKE_SESSION_CLI = textwrap.dedent("""\
+    import json, os, sys, time
+    turn = 0
+    for line in sys.stdin:
+        msg = json.loads(line)
+        prompt = msg["message"]["content"]
+        turn += 1
+        if prompt == "die":
+            sys.stderr.write("boom\\n")
+            sys.exit(3)
+        if prompt == "hang":
+            time.sleep(60)
+        if prompt == "drop":
+            os.close(1)
+            time.sleep(60)
+        print(json.dumps({"type": "assistant", "message": {}}))
+        print("not json")
+        if prompt == "broke":
+            result = {"type": "result", "is_error": True, "subtype": "error",
+                      "result": "credit_balance_too_low"}
+        else:
+            result = {
+                "type": "result", "subtype": "success", "is_error": False,
+                "result": f"{prompt}#{turn}", "total_cost_usd": 0.01,
+                "usage": {"input_tokens": 10 * turn, "output_tokens": 5},
+                "modelUsage": {"m": {"input_tokens": 10, "output_tokens": 5}},
+                "session_id": f"pid-{os.getpid()}", "duration_ms": 7,
+            }
+        print(json.dumps(result), flush=True)
+""")
+
+
+@pytest.fixture()
+def fake_session(tmp_path: Path) -> Iterator[ClaudeSession]:
+    """A ClaudeSession whose command runs the fake stream-json CLI."""
+    script = tmp_path / "fake_claude.py"
+    script.write_text(_FAKE_SESSION_CLI)
+    session = ClaudeSession(["--dangerously-skip-permissions"])
+    session.cmd = [sys.executable, str(script)]
+    yield session
+    session.close()
+
+
+class TestClaudeSession:
+    """Tests for the persistent stream-json session."""
+
+    def test_session_command_uses_stream_json(self) -> None:
+        session = ClaudeSession(["--model", "m"])
+        assert session.cmd[:4] == ["claude", "-p", "--model", "m"]
+        assert session.cmd[4:] == [
+            "--input-format", "stream-json",
+            "--output-format", "stream-json", "--verbose",
+        ]
+
+    def test_session_reuses_one_process_across_turns(
+        self, fake_session: ClaudeSession
+    ) -> None:
+        first = fake_session.run("a")
+        second = fake_session.run("b")
+        assert (first.output, second.output) == ("a#1", "b#2")
+        assert first.session_id == second.session_id
+        assert second.input_tokens == 20
+        assert second.model == "m"
+        assert second.exit_code == 0
+
+    def test_session_writes_cost_log_per_turn(
+        self, fake_session: ClaudeSession, tmp_path: Path
+    ) -> None:
+        log_path = tmp_path / "cost.jsonl"
+        fake_session.run("a", cost_log_path=log_path)
+        fake_session.run("b", cost_log_path=log_path)
+        records = [json.loads(l) for l in log_path.read_text().splitlines()]
+        assert [r["input_tokens"] for r in records] == [10, 20]
+
+    def test_session_process_exit_raises_and_restarts(
+        self, fake_session: ClaudeSession
+    ) -> None:
+        before = fake_session.run("a").session_id
+        with pytest.raises(subprocess.CalledProcessError) as exc_info:
+            fake_session.run("die")
+        assert exc_info.value.returncode == 3
+        assert "boom" in exc_info.value.stderr
+        after = fake_session.run("b")
+        assert after.output == "b#1"
+        assert after.session_id != before
+
+    def test_session_closed_stdout_without_exit_is_killed(
+        self, fake_session: ClaudeSession
+    ) -> None:
+        fake_session.exit_grace = 0.5
+        start = time.monotonic()
+        with pytest.raises(subprocess.CalledProcessError) as exc_info:
+            fake_session.run("drop", timeout=30)
+        assert time.monotonic() - start < 10
+        assert exc_info.value.returncode < 0
+        assert fake_session.run("a").output == "a#1"
+
+    def test_session_timeout_kills_process(
+        self, fake_session: ClaudeSession
+    ) -> None:
+        with pytest.raises(AgentTimeoutError):
+            fake_session.run("hang", timeout=1)
+        assert fake_session.run("a").output == "a#1"
+
+    def test_session_billing_error_result(
+        self, fake_session: ClaudeSession
+    ) -> None:
+        with pytest.raises(CreditExhaustionError):
+            fake_session.run("broke")
+
+
+# ---------------------------------------------------------------------------
+# run_claude_async / gather_claude
+# ---------------------------------------------------------------------------
+
+# Stand-in `claude` executable for the async tests: the prompt is the last
+# arg before --output-format; "sleep:N" waits N seconds, "fail" exits 1.
+_FAKE_ONESHOT_CLI = textwrap.dedent("""\
+    import json, sys, time
+    prompt = sys.argv[-3]
+    if prompt == "fail":
+        sys.stderr.write("bad flag\\n")
+        sys.exit(1)
+    if prompt.startswith("sleep:"):
+        time.sleep(float(prompt.split(":", 1)[1]))
+    print(json.dumps({
+        "result": f"done {prompt}", "total_cost_usd": 0.02,
+        "usage": {"input_tokens": 3, "output_tokens": 4},
+        "modelUsage": {"m": {"input_tokens": 3, "output_tokens": 4}},
+        "session_id": "s", "duration_ms": 1,
+    }))
+""")
+
+
+@pytest.fixture()
+def fake_claude_on_path(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Put an executable fake ``claude`` first on the child's PATH."""
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    exe = bin_dir / "claude"
+    exe.write_text(f"#!{sys.executable}\n{_FAKE_ONESHOT_CLI}")
+    exe.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{bin_dir}:{os.environ.get('PATH', '')}")
+    refresh_child_env()
+
+
+@pytest.mark.usefixtures("fake_claude_on_path")
+class TestRunClaudeAsync:
+    """Tests for the asyncio subprocess variant."""
+
+    def test_run_claude_async_returns_result_and_logs_cost(
+        self, tmp_path: Path
+    ) -> None:
+        log_path = tmp_path / "cost.jsonl"
+        result = asyncio.run(run_claude_async(["-p", "hi"], cost_log_path=log_path))
+        assert result.output == "done hi"
+        assert result.input_tokens == 3
+        assert result.model == "m"
+        record = json.loads(log_path.read_text())
+        assert record["cost_usd"] == 0.02
+
+    def test_run_claude_async_nonzero_exit(self) -> None:
+        with pytest.raises(subprocess.CalledProcessError) as exc_info:
+            asyncio.run(run_claude_async(["-p", "fail"]))
+        assert "bad flag" in exc_info.value.stderr
+
+    def test_run_claude_async_timeout(self) -> None:
+        with pytest.raises(AgentTimeoutError):
+            asyncio.run(run_claude_async(["-p", "sleep:30"], timeout=1))
+
+    def test_gather_claude_overlaps_calls_and_keeps_order(self) -> None:
+        start = time.monotonic()
+        results = asyncio.run(gather_claude(
+            [["-p", "sleep:0.6"], ["-p", "sleep:0.3"], ["-p", "sleep:0.6"]],
+            max_concurrency=3,
+        ))
+        elapsed = time.monotonic() - start
+        assert [r.output for r in results] == [
+            "done sleep:0.6", "done sleep:0.3", "done sleep:0.6",
+        ]
+        assert elapsed < 1.4, f"calls ran serially ({elapsed:.2f}s)"
+
+    def test_gather_claude_forwards_system_prompt_and_flush(
+        self, tmp_path: Path
+    ) -> None:
+        log_path = tmp_path / "cost.jsonl"
+        with patch(
+            "auto_sdd.lib.claude_wrapper.asyncio.create_subprocess_exec",
+            wraps=asyncio.create_subprocess_exec,
+        ) as spy, patch(
+            "auto_sdd.lib.claude_wrapper._cost_log_writer.write",
+        ) as mock_write:
+            asyncio.run(gather_claude(
+                [["-p", "a"], ["-p", "b"]],
+                cost_log_path=log_path,
+                cost_log_flush=False,
+                system_prompt="Shared rules",
+            ))
+        for call in spy.call_args_list:
+            argv = list(call.args)
+            i = argv.index("--append-system-prompt")
+            assert argv[i + 1] == "Shared rules"
+        assert spy.call_count == 2
+        assert [c.kwargs["flush"] for c in mock_write.call_args_list] == [
+            False, False,
+        ]
+
+    def test_gather_claude_reraises_first_error_unwrapped(self) -> None:
+        with pytest.raises(subprocess.CalledProcessError):
+            asyncio.run(gather_claude([["-p", "sleep:5"], ["-p", "fail"]]))
+
+    def test_gather_claude_cancel_reaps_child(self) -> None:
+        procs: list[asyncio.subprocess.Process] = []
+        reaped: list[int] = []
+        spawn = asyncio.create_subprocess_exec
+
+        async def _spawn(*args: Any, **kwargs: Any) -> asyncio.subprocess.Process:
+            proc = await spawn(*args, **kwargs)
+            wait = proc.wait
+
+            async def _wait() -> int:
+                code = await wait()
+                reaped.append(code)
+                return code
+
+            proc.wait = _wait  # type: ignore[method-assign]
+            procs.append(proc)
+            return proc
+
+        async def _cancel_in_flight() -> None:
+            task = asyncio.create_task(gather_claude([["-p", "sleep:30"]]))
+            while not procs:
+                await asyncio.sleep(0.01)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            # Reaped before the cancellation propagated, loop still running
+            assert reaped == [procs[0].returncode]
+            assert reaped[0] is not None
+
+        start = time.monotonic()
+        with warnings.catch_warnings(record=True) as caught, patch(
+            "auto_sdd.lib.claude_wrapper.asyncio.create_subprocess_exec",
+            side_effect=_spawn,
+        ):
+            warnings.simplefilter("always", ResourceWarning)
+            asyncio.run(_cancel_in_flight())
+            gc.collect()
+        assert time.monotonic() - start < 10
+        assert not [w for w in caught if issubclass(w.category, ResourceWarning)]
@@ -7,6 +7,8 @@ integration.
 
 from __future__ import annotations
 
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
@@ -15,7 +17,10 @@ import pytest
 from auto_sdd.lib.codebase_summary import (
     _FILE_TREE_CAP,
     _generate_file_tree,
+    _learnings_signature,
+    _read_head_lines,
     _read_recent_learnings,
+    _summary_memo,
     generate_codebase_summary,
 )
 
@@ -23,6 +28,12 @@ from auto_sdd.lib.codebase_summary import (
 # ── Fixtures ────────────────────────────────────────────────────────────────
 
 
+@pytest.fixture(autouse=True)
+def _clear_summary_memo() -> None:
+    """Each test starts without memoized summaries from earlier tests."""
+    _summary_memo.clear()
+
+
 @pytest.fixture
 def project_with_files(tmp_path: Path) -> Path:
     """Minimal project with a few files in nested dirs."""
@@ -94,6 +105,13 @@ class TestFileTreeGenerator:
         tree = _generate_file_tree(tmp_path)
         assert tree == ""
 
+    def test_does_not_follow_symlinked_dirs(self, tmp_path: Path) -> None:
+        (tmp_path / "real").mkdir()
+        (tmp_path / "real" / "a.py").write_text("")
+        (tmp_path / "loop").symlink_to(tmp_path, target_is_directory=True)
+        tree = _generate_file_tree(tmp_path)
+        assert tree.splitlines() == ["real/a.py"]
+
 
 # ── Cache layer ──────────────────────────────────────────────────────────────
 
@@ -122,6 +140,22 @@ class TestCacheLayer:
         assert "cached summary content" in result
         mock_agent.assert_not_called()
 
+    @patch("auto_sdd.lib.codebase_summary._generate_file_tree")
+    @patch("auto_sdd.lib.codebase_summary._get_tree_hash")
+    def test_cache_hit_skips_file_tree_walk(
+        self,
+        mock_hash: MagicMock,
+        mock_tree: MagicMock,
+        project_with_files: Path,
+    ) -> None:
+        mock_hash.return_value = "abc123"
+        cache_dir = project_with_files / ".auto-sdd-cache"
+        cache_dir.mkdir()
+        (cache_dir / "codebase-summary-abc123.md").write_text("cached")
+
+        assert generate_codebase_summary(project_with_files) == "cached"
+        mock_tree.assert_not_called()
+
     @patch("auto_sdd.lib.codebase_summary._call_agent")
     @patch("auto_sdd.lib.codebase_summary._get_tree_hash")
     def test_cache_miss_calls_agent(
@@ -171,6 +205,102 @@ class TestCacheLayer:
         assert gitignore.read_text() == "*\n"
 
 
+# ── In-process memo ──────────────────────────────────────────────────────────
+
+
+class TestSummaryMemo:
+    """Repeated calls on an unchanged project reuse the finished result."""
+
+    @patch("auto_sdd.lib.codebase_summary._call_agent")
+    @patch("auto_sdd.lib.codebase_summary._get_tree_hash")
+    def test_second_call_skips_cache_and_learnings_reads(
+        self,
+        mock_hash: MagicMock,
+        mock_agent: MagicMock,
+        project_with_learnings: Path,
+    ) -> None:
+        mock_hash.return_value = "memohash"
+        mock_agent.return_value = "agent summary"
+
+        first = generate_codebase_summary(project_with_learnings)
+        with patch(
+            "auto_sdd.lib.codebase_summary._read_recent_learnings"
+        ) as mock_learnings, patch(
+            "auto_sdd.lib.codebase_summary._read_cache"
+        ) as mock_cache:
+            second = generate_codebase_summary(project_with_learnings)
+        assert second == first
+        mock_learnings.assert_not_called()
+        mock_cache.assert_not_called()
+        mock_agent.assert_called_once()
+
+    @patch("auto_sdd.lib.codebase_summary._call_agent")
+    @patch("auto_sdd.lib.codebase_summary._get_tree_hash")
+    def test_learnings_change_invalidates_memo(
+        self,
+        mock_hash: MagicMock,
+        mock_agent: MagicMock,
+        project_with_learnings: Path,
+    ) -> None:
+        mock_hash.return_value = "memohash"
+        mock_agent.return_value = "agent summary"
+
+        generate_codebase_summary(project_with_learnings)
+        (project_with_learnings / ".specs" / "learnings" / "new.md").write_text(
+            "- fresh insight\n"
+        )
+        result = generate_codebase_summary(project_with_learnings)
+        assert "fresh insight" in result
+
+    @patch("auto_sdd.lib.codebase_summary._call_agent")
+    @patch("auto_sdd.lib.codebase_summary._get_tree_hash")
+    def test_use_cache_false_regenerates(
+        self,
+        mock_hash: MagicMock,
+        mock_agent: MagicMock,
+        project_with_files: Path,
+    ) -> None:
+        mock_hash.return_value = "memohash"
+        mock_agent.side_effect = ["first summary", "second summary"]
+
+        assert generate_codebase_summary(project_with_files) == "first summary"
+        assert (
+            generate_codebase_summary(project_with_files, use_cache=False)
+            == "second summary"
+        )
+        assert generate_codebase_summary(project_with_files) == "second summary"
+
+    @patch("auto_sdd.lib.codebase_summary._call_agent")
+    @patch("auto_sdd.lib.codebase_summary._get_tree_hash")
+    def test_failed_agent_call_not_memoized(
+        self,
+        mock_hash: MagicMock,
+        mock_agent: MagicMock,
+        project_with_files: Path,
+    ) -> None:
+        mock_hash.return_value = "memohash"
+        mock_agent.side_effect = [RuntimeError("boom"), "recovered"]
+
+        assert generate_codebase_summary(project_with_files) == ""
+        assert generate_codebase_summary(project_with_files) == "recovered"
+
+    def test_learnings_signature_missing_dir(self, tmp_path: Path) -> None:
+        assert _learnings_signature(tmp_path) == ""
+
+    def test_learnings_signature_survives_dangling_symlink(
+        self, tmp_path: Path
+    ) -> None:
+        """A broken *.md symlink is skipped; other files still move the digest."""
+        learnings = tmp_path / ".specs" / "learnings"
+        learnings.mkdir(parents=True)
+        (learnings / "a.md").write_text("- first\n")
+        (learnings / "broken.md").symlink_to(learnings / "missing.md")
+        before = _learnings_signature(tmp_path)
+        assert before != ""
+        (learnings / "a.md").write_text("- first\n- second\n")
+        assert _learnings_signature(tmp_path) not in ("", before)
+
+
 # ── Cache key changes with tree hash ────────────────────────────────────────
 
 
@@ -338,6 +468,49 @@ class TestLearningsIntegration:
         assert "## Recent Learnings" in result
         assert "semantic tokens" in result
 
+    @patch("auto_sdd.lib.codebase_summary._read_recent_learnings")
+    @patch("auto_sdd.lib.codebase_summary._call_agent")
+    @patch("auto_sdd.lib.codebase_summary._get_tree_hash")
+    def test_learnings_read_off_main_thread(
+        self,
+        mock_hash: MagicMock,
+        mock_agent: MagicMock,
+        mock_learnings: MagicMock,
+        tmp_path: Path,
+    ) -> None:
+        mock_hash.return_value = None
+        mock_agent.return_value = "agent summary"
+        reader_threads: list[threading.Thread] = []
+
+        def _record(project_dir: Path) -> str:
+            reader_threads.append(threading.current_thread())
+            return "## Recent Learnings\n"
+
+        mock_learnings.side_effect = _record
+
+        result = generate_codebase_summary(tmp_path)
+        assert result == "agent summary\n## Recent Learnings\n"
+        assert reader_threads
+        assert reader_threads[0] is not threading.main_thread()
+
+    @patch("auto_sdd.lib.codebase_summary._call_agent")
+    @patch("auto_sdd.lib.codebase_summary._get_tree_hash")
+    def test_one_pool_per_call(
+        self,
+        mock_hash: MagicMock,
+        mock_agent: MagicMock,
+        project_with_learnings: Path,
+    ) -> None:
+        mock_hash.return_value = None
+        mock_agent.return_value = "agent summary"
+        with patch(
+            "auto_sdd.lib.codebase_summary.ThreadPoolExecutor",
+            wraps=ThreadPoolExecutor,
+        ) as spy:
+            result = generate_codebase_summary(project_with_learnings)
+        assert "semantic tokens" in result
+        assert spy.call_count == 1
+
     def test_read_recent_learnings_with_content(
         self, project_with_learnings: Path
     ) -> None:
@@ -356,6 +529,16 @@ class TestLearningsIntegration:
         text = _read_recent_learnings(tmp_path)
         assert text == ""
 
+    def test_read_recent_learnings_skips_md_directories(
+        self, tmp_path: Path
+    ) -> None:
+        learnings = tmp_path / ".specs" / "learnings"
+        (learnings / "archive.md").mkdir(parents=True)
+        (learnings / "real.md").write_text("- insight\n")
+        text = _read_recent_learnings(tmp_path)
+        assert "archive.md" not in text
+        assert "### real.md" in text
+
     def test_read_recent_learnings_truncation(self, tmp_path: Path) -> None:
         learnings = tmp_path / ".specs" / "learnings"
         learnings.mkdir(parents=True)
@@ -365,6 +548,47 @@ class TestLearningsIntegration:
         text = _read_recent_learnings(tmp_path)
         assert "truncated at 40 lines" in text
 
+    def test_read_recent_learnings_stops_reading_at_cap(
+        self, tmp_path: Path
+    ) -> None:
+        learnings = tmp_path / ".specs" / "learnings"
+        learnings.mkdir(parents=True)
+        (learnings / "a.md").write_text("\n".join(f"line {i}" for i in range(60)))
+        (learnings / "b.md").write_text("- never read\n")
+        with patch(
+            "auto_sdd.lib.codebase_summary._read_head_lines",
+            wraps=_read_head_lines,
+        ) as spy:
+            text = _read_recent_learnings(tmp_path)
+        assert "truncated at 40 lines" in text
+        assert [c.args[0].name for c in spy.call_args_list] == ["a.md"]
+
+    def test_read_recent_learnings_renders_in_name_order(
+        self, tmp_path: Path
+    ) -> None:
+        learnings = tmp_path / ".specs" / "learnings"
+        learnings.mkdir(parents=True)
+        for name in ("c.md", "a.md", "b.md", "notes.txt"):
+            (learnings / name).write_text(f"- from {name}\n")
+        text = _read_recent_learnings(tmp_path)
+        headers = [ln for ln in text.splitlines() if ln.startswith("### ")]
+        assert headers == ["### a.md", "### b.md", "### c.md"]
+
+    @pytest.mark.parametrize(
+        "content", ["a", "a\n", "a\nb", "a\nb\n", "\n", "a\n\nb\n\n"]
+    )
+    def test_read_head_lines_matches_split(
+        self, tmp_path: Path, content: str
+    ) -> None:
+        path = tmp_path / "x.md"
+        path.write_text(content)
+        assert _read_head_lines(path, 100) == content.split("\n")
+
+    def test_read_head_lines_stops_at_limit(self, tmp_path: Path) -> None:
+        path = tmp_path / "x.md"
+        path.write_text("".join(f"line {i}\n" for i in range(1000)))
+        assert _read_head_lines(path, 3) == ["line 0", "line 1", "line 2"]
+
     @patch("auto_sdd.lib.codebase_summary._call_agent")
     @patch("auto_sdd.lib.codebase_summary._get_tree_hash")
     def test_learnings_appended_to_cached_summary(
@@ -3,20 +3,26 @@
 from __future__ import annotations
 
 import json
+import os
 import subprocess
+import sys
+import time
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
 from auto_sdd.lib.eval_lib import (
     EvalError,
     MechanicalEvalResult,
+    build_eval_result,
     generate_eval_prompt,
     parse_eval_signal,
     run_mechanical_eval,
     write_eval_result,
-    _extract_type_names,
+    _iter_git_lines,
     _sanitize_feature_name,
+    _scan_numstat_patch,
 )
 
 
@@ -182,6 +188,12 @@ class TestRunMechanicalEvalNormal:
     def test_feature_name_extracted(self) -> None:
         assert self.result.diff_stats["feature_name"] == "add Header component with tests"
 
+    def test_commit_subject_included(self) -> None:
+        assert (
+            self.result.diff_stats["commit_subject"]
+            == "feat: add Header component with tests"
+        )
+
     def test_files_changed_is_2(self) -> None:
         assert self.result.diff_stats["files_changed"] == 2
 
@@ -290,6 +302,17 @@ class TestRunMechanicalEvalErrors:
         with pytest.raises(EvalError, match="commit not found"):
             run_mechanical_eval(repo, "deadbeefdeadbeef")
 
+    def test_non_commit_object_raises(self, tmp_path: Path) -> None:
+        repo = tmp_path / "repo"
+        repo.mkdir()
+        _init_repo(repo)
+        (repo / "f.txt").write_text("x\n")
+        _git(repo, "add", "-A")
+        _git(repo, "commit", "-q", "-m", "init")
+        blob = _git(repo, "rev-parse", "HEAD:f.txt")
+        with pytest.raises(EvalError, match="commit not found"):
+            run_mechanical_eval(repo, blob)
+
     def test_error_message_is_descriptive(self, tmp_path: Path) -> None:
         with pytest.raises(EvalError) as exc_info:
             run_mechanical_eval(tmp_path, "")
@@ -350,6 +373,11 @@ class TestGenerateEvalPromptErrors:
         with pytest.raises(EvalError):
             generate_eval_prompt(tmp_path / "nope", "abc123")
 
+    def test_unknown_commit_raises(self, tmp_path: Path) -> None:
+        repo = create_fixture_repo(tmp_path)
+        with pytest.raises(EvalError, match="commit not found"):
+            generate_eval_prompt(repo, "deadbeefdeadbeef")
+
 
 # ── Test: parse_eval_signal ──────────────────────────────────────────────────
 
@@ -401,6 +429,14 @@ class TestParseEvalSignalEdgeCases:
         output = "EVAL_NOTES:   spaces around   \n"
         assert parse_eval_signal("EVAL_NOTES", output) == "spaces around"
 
+    def test_mid_line_occurrence_after_real_signal_ignored(self) -> None:
+        output = "EVAL_NOTES: real\nsee EVAL_NOTES: quoted\n"
+        assert parse_eval_signal("EVAL_NOTES", output) == "real"
+
+    def test_crlf_line_endings(self) -> None:
+        output = "EVAL_COMPLETE: false\r\nEVAL_COMPLETE: true\r\n"
+        assert parse_eval_signal("EVAL_COMPLETE", output) == "true"
+
 
 # ── Test: write_eval_result — full (agent + mechanical) ──────────────────────
 
@@ -435,6 +471,7 @@ class TestWriteEvalResultFull:
             self.out_dir, "header-component", mech, agent_output
         )
         self.content = json.loads(self.result_file.read_text())
+        self.built = build_eval_result(mech, agent_output)
 
     def test_file_created(self) -> None:
         assert self.result_file.is_file()
@@ -451,6 +488,11 @@ class TestWriteEvalResultFull:
     def test_has_eval_timestamp(self) -> None:
         assert "eval_timestamp" in self.content
 
+    def test_matches_build_eval_result(self) -> None:
+        self.content.pop("eval_timestamp")
+        self.built.pop("eval_timestamp")
+        assert self.content == self.built
+
 
 # ── Test: write_eval_result — no agent output ────────────────────────────────
 
@@ -567,6 +609,25 @@ class TestWriteEvalResultFilename:
         data = json.loads(result.read_text())
         assert isinstance(data, dict)
 
+    def test_stdlib_fallback_matches(self, tmp_path: Path) -> None:
+        mech = MechanicalEvalResult(
+            diff_stats={"commit": "xyz", "files": ["a.ts"], "skipped": False},
+            type_exports_changed=[],
+            redeclarations=[],
+            test_files_touched=[],
+            passed=True,
+        )
+        with patch("auto_sdd.lib.eval_lib.orjson", None):
+            fallback = write_eval_result(tmp_path / "std", "test", mech, "")
+        default = write_eval_result(tmp_path / "default", "test", mech, "")
+        fallback_data = json.loads(fallback.read_text())
+        default_data = json.loads(default.read_text())
+        fallback_data.pop("eval_timestamp")
+        default_data.pop("eval_timestamp")
+        assert fallback_data == default_data
+        assert fallback.read_text().startswith('{\n  "eval_timestamp"')
+        assert fallback.read_text().endswith("}\n")
+
 
 # ── Test: write_eval_result — error cases ────────────────────────────────────
 
@@ -606,6 +667,144 @@ class TestMechanicalEvalTypeAnalysis:
         assert "HeaderVariant" in self.result.type_exports_changed
 
 
+class TestMechanicalEvalRedeclarations:
+    """Types already defined in the parent commit are reported."""
+
+    @pytest.fixture(autouse=True)
+    def _setup(self, tmp_path: Path) -> None:
+        repo = create_fixture_repo(tmp_path)
+        (repo / "src" / "types" / "extra.ts").write_text(
+            "export interface User {\n  email: string;\n}\n"
+            "export type Fresh = number;\n"
+            "export type Button = string;\n"
+        )
+        (repo / "models.py").write_text("class ApiResponse:\n    pass\n")
+        _git(repo, "add", "-A")
+        _git(repo, "commit", "-q", "-m", "feat: extra types")
+        self.result = run_mechanical_eval(repo, _git(repo, "rev-parse", "HEAD"))
+
+    def test_redeclared_names(self) -> None:
+        # Button matches as a prefix of the existing ButtonProps
+        assert self.result.redeclarations == ["ApiResponse", "User", "Button"]
+
+    def test_new_name_not_redeclared(self) -> None:
+        assert "Fresh" not in self.result.redeclarations
+
+    def test_redeclaration_count(self) -> None:
+        assert self.result.diff_stats["type_redeclarations"] == 3
+
+
+class TestMechanicalEvalSingleDiff:
+    """Numstat and patch come from one streamed git diff invocation."""
+
+    def test_stats_and_types_from_one_call(self, tmp_path: Path) -> None:
+        repo = create_fixture_repo(tmp_path)
+        commit = _git(repo, "rev-parse", "HEAD")
+        captured: list[list[str]] = []
+        streamed: list[list[str]] = []
+        real_run = subprocess.run
+        real_popen = subprocess.Popen
+
+        def _spy_run(cmd: list[str], **kwargs: object) -> object:
+            captured.append(cmd)
+            return real_run(cmd, **kwargs)  # type: ignore[call-overload]
+
+        def _spy_popen(cmd: list[str], **kwargs: object) -> object:
+            streamed.append(cmd)
+            return real_popen(cmd, **kwargs)  # type: ignore[call-overload]
+
+        with patch(
+            "auto_sdd.lib.eval_lib.subprocess.run", side_effect=_spy_run
+        ), patch(
+            "auto_sdd.lib.eval_lib.subprocess.Popen", side_effect=_spy_popen
+        ):
+            result = run_mechanical_eval(repo, commit)
+
+        assert not [c for c in captured if "diff" in c]
+        assert len([c for c in streamed if "diff" in c]) == 1
+        assert result.diff_stats["files_changed"] == 2
+        assert result.diff_stats["lines_added"] == 20
+        assert result.type_exports_changed == ["HeaderVariant"]
+
+
+class TestScanNumstatPatch:
+    """_scan_numstat_patch: one pass over streamed diff output."""
+
+    def test_matches_string_helpers(self) -> None:
+        numstat = "3\t1\tsrc/a.ts\n-\t-\tlogo.png\n"
+        patch_text = (
+            "diff --git a/src/a.ts b/src/a.ts\n"
+            "+++ b/src/a.ts\n"
+            "+import { x } from './x';\n"
+            "+export type Foo = string;\n"
+            "+export type Foo = number;\n"
+            "-import { y } from './y';\n"
+            "+use std::io;\n"
+        )
+        lines = (numstat + "\n" + patch_text).splitlines(keepends=True)
+        entries, names, imports = _scan_numstat_patch(lines)
+        assert entries == [(3, 1, "src/a.ts"), (0, 0, "logo.png")]
+        assert names == ["Foo"]
+        assert imports == 2
+
+    def test_empty_output(self) -> None:
+        assert _scan_numstat_patch([]) == ([], [], 0)
+
+
+class TestIterGitLines:
+    """_iter_git_lines: streamed git output under a deadline."""
+
+    @pytest.fixture()
+    def sleepy_git(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """A fake ``git`` that prints its pid and a line, then hangs."""
+        bin_dir = tmp_path / "bin"
+        bin_dir.mkdir()
+        exe = bin_dir / "git"
+        exe.write_text(
+            f"#!{sys.executable}\n"
+            "import os, sys, time\n"
+            "print(os.getpid())\n"
+            "print('3\\t1\\tsrc/a.ts', flush=True)\n"
+            "time.sleep(60)\n"
+        )
+        exe.chmod(0o755)
+        monkeypatch.setenv("PATH", f"{bin_dir}:{os.environ.get('PATH', '')}")
+
+    @staticmethod
+    def _gone(pid: int) -> bool:
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return True
+        return False
+
+    @pytest.mark.usefixtures("sleepy_git")
+    def test_hung_git_times_out_and_is_killed(self, tmp_path: Path) -> None:
+        lines: list[str] = []
+        start = time.monotonic()
+        with pytest.raises(subprocess.TimeoutExpired):
+            for line in _iter_git_lines(["diff"], tmp_path, timeout=0.5):
+                lines.append(line)
+        assert time.monotonic() - start < 10
+        assert lines[1] == "3\t1\tsrc/a.ts\n"
+        assert self._gone(int(lines[0]))
+
+    @pytest.mark.usefixtures("sleepy_git")
+    def test_early_close_kills_git(self, tmp_path: Path) -> None:
+        gen = _iter_git_lines(["diff"], tmp_path, timeout=30)
+        pid = int(next(gen))
+        gen.close()
+        assert self._gone(pid)
+
+    def test_reads_real_git_output(self, tmp_path: Path) -> None:
+        _init_repo(tmp_path)
+        (tmp_path / "a.txt").write_text("x\n")
+        _git(tmp_path, "add", "-A")
+        _git(tmp_path, "commit", "-q", "-m", "init")
+        lines = list(_iter_git_lines(["log", "--format=%s"], tmp_path))
+        assert lines == ["init\n"]
+
+
 # ── Test: generate_eval_prompt — no CLAUDE.md or learnings ───────────────────
 
 
@@ -625,7 +824,13 @@ class TestGenerateEvalPromptNoOptionalFiles:
         assert commit in prompt
 
 
-# ── Test: _extract_type_names — multi-language ───────────────────────────────
+# ── Test: type-name extraction — multi-language ──────────────────────────────
+
+
+def _extract_type_names(diff_content: str) -> list[str]:
+    """New type names _scan_numstat_patch finds in a patch-only diff."""
+    lines = ["\n", *diff_content.splitlines(keepends=True)]
+    return _scan_numstat_patch(lines)[1]
 
 
 class TestExtractTypeNamesMultiLanguage:
@@ -679,6 +884,12 @@ class TestExtractTypeNamesMultiLanguage:
         diff = "+class Foo:\n+class Foo:\n"
         assert _extract_type_names(diff) == ["Foo"]
 
+    def test_one_name_per_line_in_pattern_priority(self) -> None:
+        # TS export outranks the Python class pattern even though the
+        # class keyword appears first on the line
+        diff = "+class Legacy: export interface Modern\n"
+        assert _extract_type_names(diff) == ["Modern"]
+
 
 # ── Test: import count — multi-language ──────────────────────────────────────
 
@@ -4,7 +4,9 @@ from __future__ import annotations
 
 import json
 import subprocess
+import threading
 import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Any
 from unittest.mock import MagicMock, patch
@@ -15,14 +17,25 @@ from auto_sdd.lib.claude_wrapper import CreditExhaustionError
 from auto_sdd.lib.eval_lib import (
     EvalError,
     MechanicalEvalResult,
+    run_mechanical_eval,
 )
 from auto_sdd.scripts.eval_sidecar import (
     CampaignState,
     EvalSidecarConfig,
+    _CAMPAIGN_COUNTERS,
     _build_agent_cmd,    _get_commit_message,
     _get_head,
-    _get_new_commits,
+    _get_new_commits_with_subjects,
     _evaluate_commit,
+    _evaluate_new_commits,
+    _head_ref_signature,
+    _list_eval_files,
+    _load_tally_cache,
+    _poll_sleep_seconds,
+    _run_git,
+    _save_tally_cache,
+    _summarize_one,
+    _tally_eval,
     generate_campaign_summary,
     run_polling_loop,
 )
@@ -117,6 +130,7 @@ class TestEvalSidecarConfig:
         config = EvalSidecarConfig(project_dir=tmp_path)
         assert config.project_dir == tmp_path
         assert config.eval_interval == 30
+        assert config.eval_max_interval == 300
         assert config.eval_agent is True
         assert config.eval_model == ""
         assert config.eval_output_dir == tmp_path / "logs" / "evals"
@@ -246,6 +260,220 @@ class TestCampaignSummary:
         data = json.loads(result.read_text())
         assert data["total_features_evaluated"] == 1
 
+    def test_unparseable_files_skipped(self, tmp_path: Path) -> None:
+        """Malformed or non-UTF-8 eval files are skipped, not fatal."""
+        eval_dir = tmp_path / "evals"
+        eval_dir.mkdir()
+        _make_eval_json(
+            eval_dir, "good", feature_name="good-feat", type_redeclarations=1,
+        )
+        (eval_dir / "eval-broken.json").write_text("{not json")
+        (eval_dir / "eval-binary.json").write_bytes(b'{"a": "\xff\xfe"}')
+
+        result = generate_campaign_summary(eval_dir)
+        assert result is not None
+        data = json.loads(result.read_text())
+        assert data["type_redeclarations_total"] == 1
+        assert data["features_with_issues"] == ["good-feat"]
+
+    def test_stdlib_fallback_matches(self, tmp_path: Path) -> None:
+        """The summary is identical with and without orjson."""
+        eval_dir = tmp_path / "evals"
+        eval_dir.mkdir()
+        _make_eval_json(
+            eval_dir, "a", feature_name="fëature-a",
+            agent_avail=True, fw="warn", scope="focused", iq="clean",
+        )
+        _make_eval_json(eval_dir, "b", feature_name="b", type_redeclarations=3)
+
+        default = generate_campaign_summary(eval_dir)
+        assert default is not None
+        default_data = json.loads(default.read_text())
+        assert default_data["features_with_issues"] == ["fëature-a", "b"]
+        default.rename(tmp_path / default.name)
+        default = tmp_path / default.name
+        with patch("auto_sdd.scripts.eval_sidecar.orjson", None), patch(
+            "auto_sdd.lib.eval_lib.orjson", None
+        ):
+            fallback = generate_campaign_summary(eval_dir, rebuild=True)
+        assert fallback is not None
+        for written in (default, fallback):
+            text = written.read_text(encoding="utf-8")
+            assert text.startswith('{\n  "campaign_timestamp"')
+            assert text.endswith("}\n")
+        fallback_data = json.loads(fallback.read_text())
+        default_data.pop("campaign_timestamp")
+        fallback_data.pop("campaign_timestamp")
+        assert fallback_data == default_data
+
+    def test_parallel_path_matches_sequential(self, tmp_path: Path) -> None:
+        """The process-pool tally gives the same summary, in file order."""
+        eval_dir = tmp_path / "evals"
+        eval_dir.mkdir()
+        signals = [("pass", "focused", "clean"), ("warn", "moderate", "minor_issues"),
+                   ("fail", "sprawling", "major_issues")]
+        for i in range(12):
+            fw, scope, iq = signals[i % 3]
+            _make_eval_json(
+                eval_dir, f"f{i:02d}", feature_name=f"feat-{i:02d}",
+                type_redeclarations=i % 2, agent_avail=i % 4 != 0,
+                fw=fw, scope=scope, iq=iq,
+            )
+        (eval_dir / "eval-zz-broken.json").write_text("{")
+
+        sequential = generate_campaign_summary(eval_dir)
+        assert sequential is not None
+        seq_data = json.loads(sequential.read_text())
+        sequential.unlink()
+        with patch(
+            "auto_sdd.scripts.eval_sidecar._PARALLEL_SUMMARY_MIN_FILES", 2
+        ), patch(
+            "auto_sdd.scripts.eval_sidecar._summary_worker_count",
+            return_value=2,
+        ), patch(
+            "auto_sdd.scripts.eval_sidecar.ProcessPoolExecutor",
+            wraps=ProcessPoolExecutor,
+        ) as pool_cls:
+            parallel = generate_campaign_summary(eval_dir, rebuild=True)
+        assert parallel is not None
+        pool_cls.assert_called_once()
+        par_data = json.loads(parallel.read_text())
+        seq_data.pop("campaign_timestamp")
+        par_data.pop("campaign_timestamp")
+        assert par_data == seq_data
+        assert seq_data["total_features_evaluated"] == 13
+        assert seq_data["features_with_issues"] == sorted(
+            seq_data["features_with_issues"]
+        )
+
+    def test_tally_cache_reused_across_summaries(self, tmp_path: Path) -> None:
+        """A second summary only parses files that are new or rewritten."""
+        eval_dir = tmp_path / "evals"
+        eval_dir.mkdir()
+        a = _make_eval_json(eval_dir, "a", feature_name="a", type_redeclarations=1)
+        b = _make_eval_json(eval_dir, "b", feature_name="b")
+        first = generate_campaign_summary(eval_dir)
+        assert first is not None
+        assert (eval_dir / ".campaign-cache.json").is_file()
+
+        # Rewrite b with an issue (atomically, like write_eval_result) and add c
+        tmp = eval_dir / "b.tmp"
+        tmp.write_text(json.dumps({
+            "mechanical": {"feature_name": "b", "type_redeclarations": 4},
+        }))
+        tmp.replace(b)
+        c = _make_eval_json(eval_dir, "c", feature_name="c")
+
+        with patch(
+            "auto_sdd.scripts.eval_sidecar._summarize_one",
+            wraps=_summarize_one,
+        ) as parse:
+            second = generate_campaign_summary(eval_dir)
+        assert sorted(call.args[0] for call in parse.call_args_list) == [
+            str(b), str(c),
+        ]
+        assert second is not None
+        data = json.loads(second.read_text())
+        assert data["total_features_evaluated"] == 3
+        assert data["type_redeclarations_total"] == 5
+        assert data["features_with_issues"] == ["a", "b"]
+
+        # rebuild=True ignores the cache
+        with patch(
+            "auto_sdd.scripts.eval_sidecar._summarize_one",
+            wraps=_summarize_one,
+        ) as parse:
+            generate_campaign_summary(eval_dir, rebuild=True)
+        assert parse.call_count == 3
+        assert str(a) in {call.args[0] for call in parse.call_args_list}
+
+    def test_non_file_entries_skipped(self, tmp_path: Path) -> None:
+        """A directory that happens to match the eval-*.json pattern is ignored."""
+        eval_dir = tmp_path / "evals"
+        eval_dir.mkdir()
+        _make_eval_json(eval_dir, "a", feature_name="a")
+        (eval_dir / "eval-stray.json").mkdir()
+        (eval_dir / "notes.txt").write_text("x")
+        listed = _list_eval_files(eval_dir)
+        assert [path.name for path, _ in listed] == ["eval-a.json"]
+        result = generate_campaign_summary(eval_dir)
+        assert result is not None
+        assert json.loads(result.read_text())["total_features_evaluated"] == 1
+
+    def test_tally_cache_bytes_match_without_orjson(self, tmp_path: Path) -> None:
+        """The stdlib fallback writes the same cache bytes as orjson."""
+        entries = {
+            "eval-a.json": ((1, 2, 3), ((1,) * len(_CAMPAIGN_COUNTERS), "fëature")),
+            "eval-b.json": ((4, 5, 6), ((0,) * len(_CAMPAIGN_COUNTERS), None)),
+        }
+        cache_file = tmp_path / ".campaign-cache.json"
+        _save_tally_cache(tmp_path, entries)
+        default = cache_file.read_bytes()
+        with patch("auto_sdd.scripts.eval_sidecar.orjson", None):
+            _save_tally_cache(tmp_path, entries)
+        assert cache_file.read_bytes() == default
+        assert "fëature".encode("utf-8") in default
+        assert _load_tally_cache(tmp_path) == entries
+
+    def test_corrupt_tally_cache_ignored(self, tmp_path: Path) -> None:
+        """A garbled cache file just means every file is parsed."""
+        eval_dir = tmp_path / "evals"
+        eval_dir.mkdir()
+        _make_eval_json(eval_dir, "a", feature_name="a", type_redeclarations=1)
+        (eval_dir / ".campaign-cache.json").write_text('{"version": 1, "files": [')
+        result = generate_campaign_summary(eval_dir)
+        assert result is not None
+        data = json.loads(result.read_text())
+        assert data["type_redeclarations_total"] == 1
+
+    def test_tally_eval_count_vector(self) -> None:
+        """Tallies are fixed-order count vectors; odd values are ignored."""
+        counts, feature = _tally_eval({
+            "mechanical": {"feature_name": "f", "type_redeclarations": 2},
+            "agent_eval_available": True,
+            "agent_eval": {
+                "framework_compliance": "pass",
+                "scope_assessment": ["sprawling"],
+                "integration_quality": "minor_issues",
+            },
+        })
+        named = dict(zip(_CAMPAIGN_COUNTERS, counts))
+        assert named == {
+            "type_redeclarations": 2,
+            "fw_pass": 1, "fw_warn": 0, "fw_fail": 0,
+            "scope_focused": 0, "scope_moderate": 0, "scope_sprawling": 0,
+            "int_clean": 0, "int_minor": 1, "int_major": 0,
+        }
+        assert feature == "f"
+
+    def test_summary_reuses_state_tallies(self, tmp_path: Path) -> None:
+        """Files tallied during the run aren't re-read; older files are."""
+        eval_dir = tmp_path / "evals"
+        eval_dir.mkdir()
+        old = _make_eval_json(eval_dir, "old", feature_name="old-feat",
+                              type_redeclarations=2)
+        this_run = _make_eval_json(eval_dir, "new", feature_name="new-feat")
+        state = CampaignState()
+        state.eval_tallies[str(this_run)] = _tally_eval({
+            "mechanical": {"feature_name": "new-feat"},
+            "agent_eval_available": True,
+            "agent_eval": {"framework_compliance": "fail"},
+        })
+
+        with patch(
+            "auto_sdd.scripts.eval_sidecar._summarize_one",
+            wraps=_summarize_one,
+        ) as parse:
+            result = generate_campaign_summary(eval_dir, state)
+
+        parse.assert_called_once_with(str(old))
+        assert result is not None
+        data = json.loads(result.read_text())
+        assert data["total_features_evaluated"] == 2
+        assert data["type_redeclarations_total"] == 2
+        assert data["framework_compliance"]["fail"] == 1
+        assert data["features_with_issues"] == ["new-feat", "old-feat"]
+
 
 # ── Commit discovery ──────────────────────────────────────────────────────────
 
@@ -260,43 +488,79 @@ class TestCommitDiscovery:
         assert len(head) == 40
         assert head == _git(repo, "rev-parse", "HEAD")
 
+    def test_get_head_memoized_until_refs_change(self, tmp_path: Path) -> None:
+        """Repeat _get_head calls skip git until the HEAD fingerprint moves."""
+        repo = _create_test_repo(tmp_path)
+        first = _git(repo, "rev-parse", "HEAD")
+        with patch(
+            "auto_sdd.scripts.eval_sidecar._run_git", wraps=_run_git
+        ) as spy:
+            assert _get_head(repo) == first
+            assert _get_head(repo) == first
+            assert spy.call_count == 1
+
+            second = _make_commit(repo, "m.txt", "m", "feat: m")
+            assert _get_head(repo) == second
+            assert spy.call_count == 2
+
+            # reset moves the branch ref back without touching .git/HEAD
+            _git(repo, "reset", "-q", "--hard", first)
+            assert _get_head(repo) == first
+            assert spy.call_count == 3
+
+    def test_git_stdin_is_devnull(self, tmp_path: Path) -> None:
+        """git never inherits the sidecar's stdin; odd output bytes can't raise."""
+        with patch("auto_sdd.scripts.eval_sidecar.subprocess.run") as mock_run:
+            _run_git(["status"], tmp_path)
+        assert mock_run.call_args.kwargs["stdin"] is subprocess.DEVNULL
+        assert mock_run.call_args.kwargs["errors"] == "replace"
+        assert mock_run.call_args.kwargs["timeout"] == 60
+
+    def test_get_head_short_timeout(self, tmp_path: Path) -> None:
+        """A hung rev-parse gives up after 5s and reports no HEAD."""
+        with patch(
+            "auto_sdd.scripts.eval_sidecar.subprocess.run",
+            side_effect=subprocess.TimeoutExpired(["git"], 5),
+        ) as mock_run:
+            assert _get_head(tmp_path) == ""
+        assert mock_run.call_args.kwargs["timeout"] == 5
+
     def test_get_head_nonexistent_dir(self, tmp_path: Path) -> None:
         """_get_head returns empty string for nonexistent directory."""
         result = _get_head(tmp_path / "no-repo")
         assert result == ""
 
     def test_no_new_commits(self, tmp_path: Path) -> None:
-        """_get_new_commits returns empty list when no new commits exist."""
+        """An empty range reports no tip and no commits."""
         repo = _create_test_repo(tmp_path)
         head = _git(repo, "rev-parse", "HEAD")
-        commits = _get_new_commits(repo, head, head)
-        assert commits == []
+        assert _get_new_commits_with_subjects(repo, head) == ("", [])
 
     def test_single_new_commit(self, tmp_path: Path) -> None:
-        """_get_new_commits returns one commit hash."""
+        """One new commit is both the tip and the only entry."""
         repo = _create_test_repo(tmp_path)
         base = _git(repo, "rev-parse", "HEAD")
         new_hash = _make_commit(repo, "file.txt", "content", "feat: new file")
-        commits = _get_new_commits(repo, base, new_hash)
-        assert len(commits) == 1
-        assert commits[0] == new_hash
+        tip, commits = _get_new_commits_with_subjects(repo, base)
+        assert tip == new_hash
+        assert [h for h, _ in commits] == [new_hash]
 
     def test_multiple_new_commits(self, tmp_path: Path) -> None:
-        """_get_new_commits returns multiple commits oldest first."""
+        """Several new commits come back oldest first."""
         repo = _create_test_repo(tmp_path)
         base = _git(repo, "rev-parse", "HEAD")
         h1 = _make_commit(repo, "a.txt", "a", "feat: add a")
         h2 = _make_commit(repo, "b.txt", "b", "feat: add b")
         h3 = _make_commit(repo, "c.txt", "c", "feat: add c")
-        commits = _get_new_commits(repo, base, h3)
-        assert commits == [h1, h2, h3]
+        _, commits = _get_new_commits_with_subjects(repo, base)
+        assert [h for h, _ in commits] == [h1, h2, h3]
 
     def test_merge_commit_skipped(self, tmp_path: Path) -> None:
-        """_get_new_commits excludes merge commits (--no-merges)."""
+        """A merge inside the range is dropped; its parents' commits are kept."""
         repo = _create_test_repo(tmp_path)
         base = _git(repo, "rev-parse", "HEAD")
 
-        # Create a branch, make a commit, merge
+        # Create a branch, make a commit, merge, then build on top
         _git(repo, "checkout", "-b", "feature")
         h_feat = _make_commit(
             repo, "feature.txt", "feat", "feat: on branch"
@@ -304,14 +568,46 @@ class TestCommitDiscovery:
         _git(repo, "checkout", "main")
         _make_commit(repo, "main.txt", "main", "feat: on main")
         _git(repo, "merge", "feature", "--no-ff", "-m", "Merge feature")
-        merge_head = _git(repo, "rev-parse", "HEAD")
+        merge_hash = _git(repo, "rev-parse", "HEAD")
+        h_after = _make_commit(repo, "after.txt", "after", "feat: after merge")
 
-        commits = _get_new_commits(repo, base, merge_head)
-        # Should have the feature commit and main commit but NOT the merge
-        hashes = set(commits)
+        tip, commits = _get_new_commits_with_subjects(repo, base)
+        hashes = [h for h, _ in commits]
+        assert tip == h_after
         assert h_feat in hashes
-        # The merge commit itself should be excluded
-        assert merge_head not in hashes
+        assert merge_hash not in hashes
+        assert hashes[-1] == h_after
+
+    def test_commits_with_subjects(self, tmp_path: Path) -> None:
+        """One git log returns the tip plus (hash, subject) oldest first."""
+        repo = _create_test_repo(tmp_path)
+        base = _git(repo, "rev-parse", "HEAD")
+        h1 = _make_commit(repo, "a.txt", "a", "feat: first")
+        h2 = _make_commit(repo, "b.txt", "b", "fix: second | with bar")
+
+        tip, commits = _get_new_commits_with_subjects(repo, base)
+        assert tip == h2
+        assert commits == [(h1, "feat: first"), (h2, "fix: second | with bar")]
+
+        assert _get_new_commits_with_subjects(repo, h2) == ("", [])
+        assert _get_new_commits_with_subjects(repo, "0" * 40) == ("", [])
+
+    def test_commits_with_subjects_merge_tip(self, tmp_path: Path) -> None:
+        """A merge at HEAD is skipped but still reported as the tip."""
+        repo = _create_test_repo(tmp_path)
+        base = _git(repo, "rev-parse", "HEAD")
+        _git(repo, "checkout", "-b", "feature")
+        h_feat = _make_commit(repo, "feature.txt", "feat", "feat: branch")
+        _git(repo, "checkout", "main")
+        h_main = _make_commit(repo, "main.txt", "main", "feat: main")
+        _git(repo, "merge", "feature", "--no-ff", "-m", "Merge feature")
+        merge_head = _git(repo, "rev-parse", "HEAD")
+
+        tip, commits = _get_new_commits_with_subjects(repo, base)
+        assert tip == merge_head
+        assert {h for h, _ in commits} == {h_feat, h_main}
+        # Advancing to the tip leaves nothing to re-evaluate
+        assert _get_new_commits_with_subjects(repo, tip) == ("", [])
 
     def test_get_commit_message(self, tmp_path: Path) -> None:
         """_get_commit_message returns the first line of the commit message."""
@@ -321,6 +617,21 @@ class TestCommitDiscovery:
         msg = _get_commit_message(repo, head)
         assert msg == "feat: my feature"
 
+    def test_ref_signature_tracks_commits(self, tmp_path: Path) -> None:
+        """The HEAD fingerprint is stable while idle and changes on commit."""
+        repo = _create_test_repo(tmp_path)
+        before = _head_ref_signature(repo)
+        assert before is not None
+        assert _head_ref_signature(repo) == before
+        _make_commit(repo, "b.txt", "b", "feat: b")
+        assert _head_ref_signature(repo) != before
+
+    def test_ref_signature_none_without_git_dir(self, tmp_path: Path) -> None:
+        """Non-repos (and gitfile worktrees) can't be fingerprinted."""
+        assert _head_ref_signature(tmp_path) is None
+        (tmp_path / ".git").write_text("gitdir: /elsewhere\n")
+        assert _head_ref_signature(tmp_path) is None
+
     def test_get_commit_message_bad_hash(self, tmp_path: Path) -> None:
         """_get_commit_message returns '<unknown>' for invalid hash."""
         repo = _create_test_repo(tmp_path)
@@ -328,6 +639,61 @@ class TestCommitDiscovery:
         assert msg == "<unknown>"
 
 
+class TestFsmonitorOptIn:
+    """Tests for the EVAL_FSMONITOR git overrides."""
+
+    def test_off_by_default(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Without EVAL_FSMONITOR, git runs with no -c overrides."""
+        monkeypatch.delenv("EVAL_FSMONITOR", raising=False)
+        with patch("auto_sdd.scripts.eval_sidecar.subprocess.run") as mock_run:
+            _run_git(["rev-parse", "HEAD"], tmp_path)
+        cmd = mock_run.call_args.args[0]
+        assert cmd == ["git", "-C", str(tmp_path), "rev-parse", "HEAD"]
+
+    def test_overrides_added_when_enabled(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """EVAL_FSMONITOR=1 prepends the fsmonitor/untrackedCache overrides."""
+        monkeypatch.setenv("EVAL_FSMONITOR", "1")
+        with patch("auto_sdd.scripts.eval_sidecar.subprocess.run") as mock_run:
+            _run_git(["rev-parse", "HEAD"], tmp_path)
+        cmd = mock_run.call_args.args[0]
+        assert cmd[:5] == [
+            "git",
+            "-c", "core.fsmonitor=true",
+            "-c", "core.untrackedCache=true",
+        ]
+        assert cmd[5:] == ["-C", str(tmp_path), "rev-parse", "HEAD"]
+
+    def test_loop_runs_when_daemon_unavailable(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """A daemon that can't start (e.g. Linux) doesn't affect the loop."""
+        monkeypatch.setenv("EVAL_FSMONITOR", "1")
+        repo = _create_test_repo(tmp_path)
+        eval_dir = tmp_path / "evals"
+        eval_dir.mkdir()
+        head = _get_head(repo)
+        assert head
+        config = EvalSidecarConfig(
+            project_dir=repo,
+            eval_interval=0,
+            eval_agent=False,
+            eval_output_dir=eval_dir,
+        )
+
+        def fake_sleep(_: float) -> None:
+            (repo / ".sdd-eval-drain").write_text("drain")
+
+        with patch("auto_sdd.scripts.eval_sidecar.time") as mock_time:
+            mock_time.sleep.side_effect = fake_sleep
+            state = run_polling_loop(config)
+        assert state.draining is True
+        assert state.last_evaluated_commit == head
+
+
 # ── Drain sentinel ────────────────────────────────────────────────────────────
 
 
@@ -395,10 +761,11 @@ class TestDrainSentinel:
             nonlocal call_count
             call_count += 1
             if call_count == 1:
-                # First call: return base (initialization)
+                # Initialization: start from base, then drain right away —
+                # the loop only falls back to _get_head once the range is
+                # empty, so the sentinel must already be in place
+                (repo / ".sdd-eval-drain").write_text("drain")
                 return base
-            # Write sentinel and report new HEAD
-            (repo / ".sdd-eval-drain").write_text("drain")
             return new_hash
 
         mock_head.side_effect = side_effect
@@ -406,6 +773,8 @@ class TestDrainSentinel:
         state = run_polling_loop(config)
         assert state.draining is True
         assert state.eval_count >= 1
+        # Each written result was tallied for the shutdown summary
+        assert len(state.eval_tallies) == state.eval_count
 
 
 # ── Credit exhaustion ─────────────────────────────────────────────────────────
@@ -419,15 +788,15 @@ class TestCreditExhaustion:
         assert issubclass(CreditExhaustionError, Exception)
 
     def test_billing_regex_does_not_match_feature_names(self) -> None:
-        from auto_sdd.lib.claude_wrapper import _BILLING_RE
-        assert not _BILLING_RE.search("Tenant Credit Indicators")
-        assert not _BILLING_RE.search("credit score widget")
+        from auto_sdd.lib.claude_wrapper import BILLING_RE
+        assert not BILLING_RE.search("Tenant Credit Indicators")
+        assert not BILLING_RE.search("credit score widget")
 
     def test_billing_regex_matches_api_errors(self) -> None:
-        from auto_sdd.lib.claude_wrapper import _BILLING_RE
-        assert _BILLING_RE.search("credit_balance_too_low")
-        assert _BILLING_RE.search("insufficient_quota")
-        assert _BILLING_RE.search("402 Payment Required")
+        from auto_sdd.lib.claude_wrapper import BILLING_RE
+        assert BILLING_RE.search("credit_balance_too_low")
+        assert BILLING_RE.search("insufficient_quota")
+        assert BILLING_RE.search("402 Payment Required")
 
     @patch("auto_sdd.scripts.eval_sidecar.run_agent_with_backoff")
     @patch("auto_sdd.scripts.eval_sidecar.run_mechanical_eval")
@@ -464,6 +833,105 @@ class TestCreditExhaustion:
         _evaluate_commit(config, state, commit)
         assert state.agent_evals_disabled is True
 
+    @staticmethod
+    def _eval_with_agent_output(
+        tmp_path: Path,
+        mock_mech: MagicMock,
+        mock_backoff: MagicMock,
+        output: str,
+        exit_code: int,
+    ) -> CampaignState:
+        """Evaluate HEAD with an agent run that writes *output* and exits."""
+        repo = _create_test_repo(tmp_path)
+        eval_dir = tmp_path / "evals"
+        eval_dir.mkdir()
+        config = EvalSidecarConfig(
+            project_dir=repo,
+            eval_interval=0,
+            eval_agent=True,
+            eval_output_dir=eval_dir,
+        )
+        mock_mech.return_value = MechanicalEvalResult(
+            diff_stats={"feature_name": "test", "files_changed": 1},
+            type_exports_changed=[],
+            redeclarations=[],
+            test_files_touched=[],
+            passed=True,
+        )
+
+        def backoff_side_effect(output_file: Path, cmd: list[str], **kwargs: Any) -> int:
+            output_file.write_text(output)
+            return exit_code
+
+        mock_backoff.side_effect = backoff_side_effect
+        state = CampaignState()
+        _evaluate_commit(config, state, _git(repo, "rev-parse", "HEAD"))
+        return state
+
+    @patch("auto_sdd.scripts.eval_sidecar.run_agent_with_backoff")
+    @patch("auto_sdd.scripts.eval_sidecar.run_mechanical_eval")
+    def test_billing_output_disables_agent_evals(
+        self,
+        mock_mech: MagicMock,
+        mock_backoff: MagicMock,
+        tmp_path: Path,
+    ) -> None:
+        """A failed agent run whose output is a billing error disables agent evals."""
+        state = self._eval_with_agent_output(
+            tmp_path, mock_mech, mock_backoff,
+            '{"error": {"type": "credit_balance_too_low"}}', 1,
+        )
+        assert state.agent_evals_disabled is True
+        # Mechanical result is still written
+        assert state.eval_count == 1
+        assert state.eval_errors == 0
+
+    @patch("auto_sdd.scripts.eval_sidecar.run_agent_with_backoff")
+    @patch("auto_sdd.scripts.eval_sidecar.run_mechanical_eval")
+    def test_billing_error_at_end_of_large_output_detected(
+        self,
+        mock_mech: MagicMock,
+        mock_backoff: MagicMock,
+        tmp_path: Path,
+    ) -> None:
+        """Only the tail is scanned, and a billing error there is still caught."""
+        state = self._eval_with_agent_output(
+            tmp_path, mock_mech, mock_backoff,
+            "x" * 2_000_000 + "\n402 Payment Required\n", 1,
+        )
+        assert state.agent_evals_disabled is True
+
+    @patch("auto_sdd.scripts.eval_sidecar.run_agent_with_backoff")
+    @patch("auto_sdd.scripts.eval_sidecar.run_mechanical_eval")
+    def test_billing_phrase_far_from_end_is_ordinary_failure(
+        self,
+        mock_mech: MagicMock,
+        mock_backoff: MagicMock,
+        tmp_path: Path,
+    ) -> None:
+        """A billing phrase outside the scanned tail counts as an eval error."""
+        state = self._eval_with_agent_output(
+            tmp_path, mock_mech, mock_backoff,
+            "payment required\n" + "x" * 100_000, 1,
+        )
+        assert state.agent_evals_disabled is False
+        assert state.eval_errors == 1
+
+    @patch("auto_sdd.scripts.eval_sidecar.run_agent_with_backoff")
+    @patch("auto_sdd.scripts.eval_sidecar.run_mechanical_eval")
+    def test_billing_phrase_in_successful_run_ignored(
+        self,
+        mock_mech: MagicMock,
+        mock_backoff: MagicMock,
+        tmp_path: Path,
+    ) -> None:
+        """A billing phrase in a successful run (a feature about billing) is ignored."""
+        state = self._eval_with_agent_output(
+            tmp_path, mock_mech, mock_backoff,
+            "reviewed the billing error banner\n", 0,
+        )
+        assert state.agent_evals_disabled is False
+
 
 # ── Individual eval error handling ────────────────────────────────────────────
 
@@ -538,6 +1006,178 @@ class TestEvalErrorHandling:
         assert state.eval_errors == 1
         assert state.agent_evals_disabled is False
 
+    @patch("auto_sdd.scripts.eval_sidecar.run_agent_with_backoff")
+    @patch("auto_sdd.scripts.eval_sidecar.run_mechanical_eval")
+    def test_agent_output_file_private_and_removed(
+        self,
+        mock_mech: MagicMock,
+        mock_backoff: MagicMock,
+        tmp_path: Path,
+    ) -> None:
+        """The agent output temp file is pre-created 0600 and always cleaned up."""
+        repo = _create_test_repo(tmp_path)
+        eval_dir = tmp_path / "evals"
+        eval_dir.mkdir()
+        config = EvalSidecarConfig(
+            project_dir=repo,
+            eval_interval=0,
+            eval_agent=True,
+            eval_output_dir=eval_dir,
+        )
+        state = CampaignState()
+        commit = _git(repo, "rev-parse", "HEAD")
+        mock_mech.return_value = MechanicalEvalResult(
+            diff_stats={"feature_name": "tmp-test", "files_changed": 1},
+            type_exports_changed=[],
+            redeclarations=[],
+            test_files_touched=[],
+            passed=True,
+        )
+
+        seen: list[Path] = []
+
+        def backoff_side_effect(output_file: Path, cmd: list[str], **kwargs: Any) -> int:
+            seen.append(output_file)
+            assert output_file.stat().st_mode & 0o777 == 0o600
+            output_file.write_text("EVAL_COMPLETE: true\n")
+            return 0
+
+        mock_backoff.side_effect = backoff_side_effect
+
+        _evaluate_commit(config, state, commit)
+        assert state.eval_count == 1
+        assert len(seen) == 1
+        assert not seen[0].exists()
+
+    def test_next_mechanical_eval_prefetched_during_agent(
+        self, tmp_path: Path
+    ) -> None:
+        """While commit N's agent eval runs, commit N+1's mechanical eval runs."""
+        repo = _create_test_repo(tmp_path)
+        eval_dir = tmp_path / "evals"
+        eval_dir.mkdir()
+        commits = [
+            (_make_commit(repo, f"p{i}.txt", str(i), f"feat: p{i}"), f"feat: p{i}")
+            for i in range(3)
+        ]
+        config = EvalSidecarConfig(
+            project_dir=repo,
+            eval_interval=0,
+            eval_agent=True,
+            eval_output_dir=eval_dir,
+        )
+        state = CampaignState()
+
+        mech_started = {h: threading.Event() for h, _ in commits}
+
+        def mech_side_effect(project_dir: Path, commit_hash: str) -> MechanicalEvalResult:
+            mech_started[commit_hash].set()
+            return run_mechanical_eval(project_dir, commit_hash)
+
+        overlapped: list[bool] = []
+
+        def backoff_side_effect(output_file: Path, cmd: list[str], **kwargs: Any) -> int:
+            idx = [h for h, _ in commits].index(cmd[-1])
+            if idx + 1 < len(commits):
+                nxt = commits[idx + 1][0]
+                overlapped.append(mech_started[nxt].wait(timeout=5))
+            return 0
+
+        with patch(
+            "auto_sdd.scripts.eval_sidecar.run_mechanical_eval",
+            side_effect=mech_side_effect,
+        ) as mock_mech, patch(
+            "auto_sdd.scripts.eval_sidecar.generate_eval_prompt",
+            side_effect=lambda project_dir, commit_hash, **kw: commit_hash,
+        ), patch(
+            "auto_sdd.scripts.eval_sidecar.run_agent_with_backoff",
+            side_effect=backoff_side_effect,
+        ):
+            _evaluate_new_commits(config, state, commits)
+
+        assert overlapped == [True, True]
+        assert [c.args[1] for c in mock_mech.call_args_list] == [
+            h for h, _ in commits
+        ]
+        assert state.eval_count == 3
+        assert state.eval_errors == 0
+
+    def test_each_result_written_before_next_commit(self, tmp_path: Path) -> None:
+        """Results land as eval-*.json per commit, before the next one starts.
+
+        drift.py and the build loop read the newest eval file mid-campaign,
+        so results must not be held back and batched.
+        """
+        repo = _create_test_repo(tmp_path)
+        eval_dir = tmp_path / "evals"
+        eval_dir.mkdir()
+        commits = [
+            (_make_commit(repo, f"w{i}.txt", str(i), f"feat: w{i}"), f"feat: w{i}")
+            for i in range(3)
+        ]
+        config = EvalSidecarConfig(
+            project_dir=repo,
+            eval_interval=0,
+            eval_agent=False,
+            eval_output_dir=eval_dir,
+        )
+        state = CampaignState()
+        files_seen: list[int] = []
+
+        def mech_side_effect(project_dir: Path, commit_hash: str) -> MechanicalEvalResult:
+            files_seen.append(len(list(eval_dir.glob("eval-*.json"))))
+            result = run_mechanical_eval(project_dir, commit_hash)
+            result.diff_stats["feature_name"] = f"feature-{commit_hash[:8]}"
+            return result
+
+        with patch(
+            "auto_sdd.scripts.eval_sidecar.run_mechanical_eval",
+            side_effect=mech_side_effect,
+        ):
+            _evaluate_new_commits(config, state, commits)
+
+        assert files_seen == [0, 1, 2]
+        assert len(list(eval_dir.glob("eval-*.json"))) == 3
+
+    @patch("auto_sdd.scripts.eval_sidecar._get_commit_message")
+    @patch("auto_sdd.scripts.eval_sidecar.run_mechanical_eval")
+    def test_subject_taken_from_mechanical_eval(
+        self,
+        mock_mech: MagicMock,
+        mock_msg: MagicMock,
+        tmp_path: Path,
+    ) -> None:
+        """Without a caller-supplied subject, no extra git call is made."""
+        repo = _create_test_repo(tmp_path)
+        eval_dir = tmp_path / "evals"
+        eval_dir.mkdir()
+        config = EvalSidecarConfig(
+            project_dir=repo,
+            eval_interval=0,
+            eval_agent=False,
+            eval_output_dir=eval_dir,
+        )
+        commit = _git(repo, "rev-parse", "HEAD")
+        mock_mech.return_value = MechanicalEvalResult(
+            diff_stats={
+                "feature_name": "subj", "commit_subject": "feat: subj",
+            },
+            type_exports_changed=[],
+            redeclarations=[],
+            test_files_touched=[],
+            passed=True,
+        )
+
+        state = CampaignState()
+        _evaluate_commit(config, state, commit)
+        assert state.eval_count == 1
+        mock_msg.assert_not_called()
+
+        # Older results without the field fall back to asking git
+        del mock_mech.return_value.diff_stats["commit_subject"]
+        _evaluate_commit(config, state, commit)
+        mock_msg.assert_called_once_with(repo, commit)
+
 
 # ── Agent command builder ─────────────────────────────────────────────────────
 
@@ -573,6 +1213,7 @@ class TestCampaignState:
         assert state.eval_errors == 0
         assert state.draining is False
         assert state.shutdown_requested is False
+        assert state.consecutive_idle_polls == 0
 
 
 # ── Polling loop ──────────────────────────────────────────────────────────────
@@ -632,6 +1273,185 @@ class TestPollingLoop:
         assert state.shutdown_requested is False
         assert state.draining is True
 
+    def test_idle_polls_skip_git(self, tmp_path: Path) -> None:
+        """Polls with untouched refs don't spawn git rev-parse."""
+        repo = _create_test_repo(tmp_path)
+        eval_dir = tmp_path / "evals"
+        eval_dir.mkdir()
+        config = EvalSidecarConfig(
+            project_dir=repo,
+            eval_interval=0,
+            eval_agent=False,
+            eval_output_dir=eval_dir,
+        )
+
+        sleeps = 0
+
+        def fake_sleep(_: float) -> None:
+            nonlocal sleeps
+            sleeps += 1
+            if sleeps == 5:
+                (repo / ".sdd-eval-drain").write_text("drain")
+
+        with patch(
+            "auto_sdd.scripts.eval_sidecar.time"
+        ) as mock_time, patch(
+            "auto_sdd.scripts.eval_sidecar._get_head", wraps=_get_head
+        ) as mock_head:
+            mock_time.sleep.side_effect = fake_sleep
+            state = run_polling_loop(config)
+
+        assert state.draining is True
+        # init + first poll + drain confirmation; polls 2-5 were skipped
+        assert mock_head.call_count == 3
+
+    def test_commit_between_polls_detected(self, tmp_path: Path) -> None:
+        """A commit landing while idle changes the fingerprint and is evaluated."""
+        repo = _create_test_repo(tmp_path)
+        eval_dir = tmp_path / "evals"
+        eval_dir.mkdir()
+        config = EvalSidecarConfig(
+            project_dir=repo,
+            eval_interval=0,
+            eval_agent=False,
+            eval_output_dir=eval_dir,
+        )
+
+        sleeps = 0
+        new_hash = ""
+
+        def fake_sleep(_: float) -> None:
+            nonlocal sleeps, new_hash
+            sleeps += 1
+            if sleeps == 3:
+                new_hash = _make_commit(repo, "n.txt", "n", "feat: new")
+            elif sleeps == 5:
+                (repo / ".sdd-eval-drain").write_text("drain")
+
+        evaluated: list[str] = []
+
+        def fake_eval(
+            config: EvalSidecarConfig,
+            state: CampaignState,
+            commit: str,
+            *,
+            subject: str | None = None,
+        ) -> None:
+            evaluated.append(commit)
+            subjects.append(subject)
+
+        subjects: list[str | None] = []
+        with patch(
+            "auto_sdd.scripts.eval_sidecar.time"
+        ) as mock_time, patch(
+            "auto_sdd.scripts.eval_sidecar._evaluate_commit",
+            side_effect=fake_eval,
+        ):
+            mock_time.sleep.side_effect = fake_sleep
+            state = run_polling_loop(config)
+
+        assert evaluated == [new_hash]
+        # Subject comes from the range query, not a per-commit git call
+        assert subjects == ["feat: new"]
+        assert state.last_evaluated_commit == new_hash
+
+    def test_poll_sleep_backoff(self, tmp_path: Path) -> None:
+        """Idle sleep doubles up to 16x, capped by eval_max_interval."""
+        config = EvalSidecarConfig(project_dir=tmp_path, eval_interval=10)
+        state = CampaignState()
+        sleeps = []
+        for idle in range(7):
+            state.consecutive_idle_polls = idle
+            sleeps.append(_poll_sleep_seconds(config, state))
+        assert sleeps == [10, 20, 40, 80, 160, 160, 160]
+
+        config.eval_max_interval = 50
+        assert _poll_sleep_seconds(config, state) == 50
+        # A cap below the base interval never shortens the base interval
+        config.eval_max_interval = 5
+        state.consecutive_idle_polls = 0
+        assert _poll_sleep_seconds(config, state) == 10
+
+    def test_idle_backoff_resets_on_commit(self, tmp_path: Path) -> None:
+        """The loop sleeps longer while idle and resets after a new commit."""
+        repo = _create_test_repo(tmp_path)
+        eval_dir = tmp_path / "evals"
+        eval_dir.mkdir()
+        config = EvalSidecarConfig(
+            project_dir=repo,
+            eval_interval=1,
+            eval_agent=False,
+            eval_output_dir=eval_dir,
+        )
+
+        durations: list[float] = []
+
+        def fake_sleep(seconds: float) -> None:
+            durations.append(seconds)
+            if len(durations) == 4:
+                _make_commit(repo, "n.txt", "n", "feat: new")
+            elif len(durations) == 6:
+                (repo / ".sdd-eval-drain").write_text("drain")
+
+        with patch(
+            "auto_sdd.scripts.eval_sidecar.time"
+        ) as mock_time, patch(
+            "auto_sdd.scripts.eval_sidecar._evaluate_commit"
+        ):
+            mock_time.sleep.side_effect = fake_sleep
+            state = run_polling_loop(config)
+
+        assert durations == [1, 2, 4, 8, 1, 2]
+        assert state.consecutive_idle_polls == 0
+
+    def test_no_per_commit_git_spawns(self, tmp_path: Path) -> None:
+        """Evaluating a batch of commits costs one git log, not one per commit."""
+        repo = _create_test_repo(tmp_path)
+        eval_dir = tmp_path / "evals"
+        eval_dir.mkdir()
+        config = EvalSidecarConfig(
+            project_dir=repo,
+            eval_interval=0,
+            eval_agent=False,
+            eval_output_dir=eval_dir,
+        )
+
+        sleeps = 0
+
+        def fake_sleep(_: float) -> None:
+            nonlocal sleeps
+            sleeps += 1
+            if sleeps == 1:
+                for i in range(5):
+                    _make_commit(repo, f"c{i}.txt", str(i), f"feat: c{i}")
+            else:
+                (repo / ".sdd-eval-drain").write_text("drain")
+
+        git_calls: list[list[str]] = []
+        real_run_git = _run_git
+
+        def spy_run_git(
+            args: list[str], project_dir: Path, **kwargs: Any,
+        ) -> subprocess.CompletedProcess[str]:
+            git_calls.append(args)
+            return real_run_git(args, project_dir, **kwargs)
+
+        with patch(
+            "auto_sdd.scripts.eval_sidecar.time"
+        ) as mock_time, patch(
+            "auto_sdd.scripts.eval_sidecar._run_git", side_effect=spy_run_git
+        ), patch(
+            "auto_sdd.scripts.eval_sidecar._evaluate_commit",
+            wraps=lambda config, state, commit, **kw: None,
+        ) as mock_eval:
+            mock_time.sleep.side_effect = fake_sleep
+            run_polling_loop(config)
+
+        assert mock_eval.call_count == 5
+        assert all(call.kwargs["subject"] for call in mock_eval.call_args_list)
+        assert [a[0] for a in git_calls].count("log") == 2  # batch + drain
+        assert not any(a[:2] == ["log", "-1"] for a in git_calls)
+
     def test_stale_sentinel_cleaned_on_startup(self, tmp_path: Path) -> None:
         """Stale drain sentinel from a prior crash is removed on startup."""
         repo = _create_test_repo(tmp_path)
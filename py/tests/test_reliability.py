@@ -7,11 +7,15 @@ Python-specific equivalents (import checks, type-annotation coverage).
 """
 from __future__ import annotations
 
+import errno
+import fcntl
 import json
 import os
 import signal
 import subprocess
 import textwrap
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from unittest.mock import patch
 
@@ -25,7 +29,12 @@ from auto_sdd.lib.reliability import (
     Feature,
     LockContentionError,
     ResumeState,
+    StateBatcher,
+    _dep_ids,
     _lock_fds,
+    _parse_roadmap_cached,
+    _parse_roadmap_rows,
+    _pid_alive,
     acquire_lock,
     check_circular_deps,
     clean_state,
@@ -95,6 +104,13 @@ class TestTruncateForContext:
         result = truncate_for_context(tmp_path / "noexist.md")
         assert result == "", "nonexistent file should return empty string"
 
+    def test_truncate_for_context_path_under_file_returns_empty(
+        self, tmp_path: Path
+    ) -> None:
+        parent = tmp_path / "spec.md"
+        parent.write_text("not a directory\n")
+        assert truncate_for_context(parent / "child.md") == ""
+
     def test_truncate_for_context_large_file_keeps_frontmatter(
         self, tmp_path: Path
     ) -> None:
@@ -136,6 +152,56 @@ class TestTruncateForContext:
         result = truncate_for_context(large, max_tokens=40)
         assert "Then they see the dashboard" in result, "truncated output should have Then"
 
+    def test_truncate_for_context_large_file_drops_non_gherkin(
+        self, tmp_path: Path
+    ) -> None:
+        large = tmp_path / "large.feature.md"
+        large.write_text(self._large_spec())
+        result = truncate_for_context(large, max_tokens=40)
+        assert result.splitlines() == [
+            "---",
+            "feature: Test",
+            "status: specced",
+            "---",
+            "# Feature: Login",
+            "## Scenario: Happy path",
+            "Given a registered user",
+            "When they log in",
+            "Then they see the dashboard",
+            "## UI Mockup",
+        ]
+        assert not result.endswith("\n")
+
+    def test_truncate_for_context_gherkin_keyword_boundaries(
+        self, tmp_path: Path
+    ) -> None:
+        spec = tmp_path / "edge.feature.md"
+        spec.write_text(
+            "Scenario Outline: kept\n"
+            "  And: kept\n"
+            "\tBut kept\n"
+            "Givens dropped\n"
+            "Given\n"
+            "Background\n"
+            "Rule:kept\n"
+            "#nospace dropped\n"
+            + "x" * 400 + "\n"
+        )
+        result = truncate_for_context(spec, max_tokens=2)
+        assert result.splitlines() == [
+            "Scenario Outline: kept",
+            "  And: kept",
+            "\tBut kept",
+            "Rule:kept",
+        ]
+
+    def test_truncate_for_context_large_file_streams(self, tmp_path: Path) -> None:
+        large = tmp_path / "large.feature.md"
+        large.write_text(self._large_spec())
+        with patch.object(Path, "read_text", side_effect=AssertionError):
+            result = truncate_for_context(large, max_tokens=40)
+        assert "Scenario: Happy path" in result
+
     @staticmethod
     def _large_spec() -> str:
         return textwrap.dedent("""\
@@ -293,6 +359,78 @@ class TestCheckCircularDeps:
         """))
         check_circular_deps(roadmap_dir)  # should not raise
 
+    def test_check_circular_deps_reports_cycle_path(self, roadmap_dir: Path) -> None:
+        (roadmap_dir / ".specs" / "roadmap.md").write_text(textwrap.dedent("""\
+            # Roadmap
+
+            | # | Feature | Source | Jira | Complexity | Deps | Status |
+            |---|---------|--------|------|------------|------|--------|
+            | 1 | Auth | clone | - | M | 2 | ⬜ |
+            | 2 | Dashboard | clone | - | L | 1 | ⬜ |
+        """))
+        with pytest.raises(CircularDependencyError) as excinfo:
+            check_circular_deps(roadmap_dir)
+        msg = str(excinfo.value)
+        assert "CYCLE: 1 -> 2 -> 1." in msg or "CYCLE: 2 -> 1 -> 2." in msg
+
+    def test_check_circular_deps_deep_chain_no_recursion_error(
+        self, roadmap_dir: Path
+    ) -> None:
+        lines = [
+            "| # | Feature | Source | Jira | Complexity | Deps | Status |",
+            "|---|---------|--------|------|------------|------|--------|",
+            "| 1 | F1 | clone | - | S | - | ⬜ |",
+        ]
+        lines += [f"| {i} | F{i} | clone | - | S | {i - 1} | ⬜ |" for i in range(2, 3001)]
+        (roadmap_dir / ".specs" / "roadmap.md").write_text("\n".join(lines) + "\n")
+        check_circular_deps(roadmap_dir)  # should not raise
+
+    def test_check_circular_deps_then_topo_order_parses_once(
+        self, roadmap_dir: Path
+    ) -> None:
+        (roadmap_dir / ".specs" / "roadmap.md").write_text(textwrap.dedent("""\
+            # Roadmap
+
+            | # | Feature | Source | Jira | Complexity | Deps | Status |
+            |---|---------|--------|------|------------|------|--------|
+            | 1 | Auth | clone | - | M | - | ⬜ |
+            | 2 | Dashboard | clone | - | L | 1 | ⬜ |
+        """))
+        _parse_roadmap_cached.cache_clear()
+        check_circular_deps(roadmap_dir)
+        emit_topo_order(roadmap_dir)
+        info = _parse_roadmap_cached.cache_info()
+        assert (info.misses, info.hits) == (1, 1)
+
+    def test_roadmap_edit_invalidates_parse(self, roadmap_dir: Path) -> None:
+        roadmap = roadmap_dir / ".specs" / "roadmap.md"
+        header = "| # | Feature | Source | Jira | Complexity | Deps | Status |\n"
+        roadmap.write_text(header + "| 1 | Auth | clone | - | M | - | ⬜ |\n")
+        assert [r[0] for r in _parse_roadmap_rows(roadmap)] == ["1"]
+        roadmap.write_text(
+            header
+            + "| 1 | Auth | clone | - | M | - | ⬜ |\n"
+            + "| 2 | Dashboard | clone | - | L | 1 | ⬜ |\n"
+        )
+        assert [r[0] for r in _parse_roadmap_rows(roadmap)] == ["1", "2"]
+
+    def test_parse_roadmap_rows_crlf_and_prose(self, roadmap_dir: Path) -> None:
+        roadmap = roadmap_dir / ".specs" / "roadmap.md"
+        roadmap.write_bytes(
+            b"# Roadmap\r\n"
+            b"Prose | with | pipes | that | is | not | a | row |\r\n"
+            b"| 1 | Auth | clone | - | M | - | \xe2\x9c\x85 |\r\n"
+            b"| 2 | Dashboard | clone | - | L | 1 | \xe2\xac\x9c |"
+        )
+        assert list(_parse_roadmap_rows(roadmap)) == [
+            ("1", "Auth", "M", "-", "\u2705"),
+            ("2", "Dashboard", "L", "1", "\u2b1c"),
+        ]
+
+    def test_dep_ids_keeps_digits_of_each_token(self) -> None:
+        assert _dep_ids("2, #3, F-1a2, x") == ["2", "3", "12"]
+        assert _dep_ids("-") == []
+
 
 # ── acquire_lock / release_lock ──────────────────────────────────────────────
 # Mirrors bash: 4 assertions
@@ -470,6 +608,45 @@ class TestEmitTopoOrder:
             assert isinstance(f.name, str) and f.name, "name should be non-empty str"
             assert isinstance(f.complexity, str), "complexity should be str"
 
+    def test_emit_topo_order_diamond_keeps_roadmap_order(self, roadmap_dir: Path) -> None:
+        (roadmap_dir / ".specs" / "roadmap.md").write_text(textwrap.dedent("""\
+            # Roadmap
+
+            | # | Feature | Source | Jira | Complexity | Deps | Status |
+            |---|---------|--------|------|------------|------|--------|
+            | 1 | Auth | clone | - | M | - | ⬜ |
+            | 2 | Dashboard | clone | - | L | 1 | ⬜ |
+            | 3 | Profile | clone | - | S | 1 | ⬜ |
+            | 4 | Reports | clone | - | XL | 3, 2 | ⬜ |
+        """))
+        ids = [f.id for f in emit_topo_order(roadmap_dir)]
+        assert ids == [1, 2, 3, 4]
+
+    def test_emit_topo_order_repeated_dep_not_dropped(self, roadmap_dir: Path) -> None:
+        (roadmap_dir / ".specs" / "roadmap.md").write_text(textwrap.dedent("""\
+            # Roadmap
+
+            | # | Feature | Source | Jira | Complexity | Deps | Status |
+            |---|---------|--------|------|------------|------|--------|
+            | 1 | Auth | clone | - | M | - | ⬜ |
+            | 2 | Dashboard | clone | - | L | 1, 1 | ⬜ |
+        """))
+        ids = [f.id for f in emit_topo_order(roadmap_dir)]
+        assert ids == [1, 2]
+
+    def test_emit_topo_order_repeated_pending_id_kept(self, roadmap_dir: Path) -> None:
+        (roadmap_dir / ".specs" / "roadmap.md").write_text(textwrap.dedent("""\
+            # Roadmap
+
+            | # | Feature | Source | Jira | Complexity | Deps | Status |
+            |---|---------|--------|------|------------|------|--------|
+            | 1 | A1 | clone | - | M | - | ⬜ |
+            | 1 | A2 | clone | - | M | - | ⬜ |
+            | 2 | B | clone | - | S | 1 | ⬜ |
+        """))
+        result = [(f.id, f.name) for f in emit_topo_order(roadmap_dir)]
+        assert result == [(1, "A2"), (1, "A2"), (2, "B")]
+
     @staticmethod
     def _write_linear_chain(roadmap_dir: Path) -> None:
         (roadmap_dir / ".specs" / "roadmap.md").write_text(textwrap.dedent("""\
@@ -553,6 +730,65 @@ class TestRunParallelDriftChecks:
         result = run_parallel_drift_checks(pairs, boom)
         assert result is False, "exception in check_fn should count as failure"
 
+    def test_run_parallel_drift_checks_fail_fast_cancels_pending(
+        self, tmp_path: Path
+    ) -> None:
+        pairs = [
+            DriftPair(spec_file=tmp_path / f"s{i}.md", source_files="src/a.py")
+            for i in range(5)
+        ]
+        called: list[str] = []
+
+        def check(p: Path, s: str) -> bool:
+            called.append(p.name)
+            if p.name != "s0.md":
+                time.sleep(0.05)  # keep the single worker busy past the cancel
+            return False
+
+        with patch("auto_sdd.lib.reliability.get_cpu_count", return_value=1):
+            result = run_parallel_drift_checks(pairs, check, fail_fast=True)
+        assert result is False
+        # The worker may pick up one more pair before the cancel lands
+        assert called[0] == "s0.md" and len(called) <= 2
+
+    def test_run_parallel_drift_checks_default_runs_all(self, tmp_path: Path) -> None:
+        pairs = [
+            DriftPair(spec_file=tmp_path / f"s{i}.md", source_files="src/a.py")
+            for i in range(5)
+        ]
+        called: list[str] = []
+
+        def check(p: Path, s: str) -> bool:
+            called.append(p.name)
+            return False
+
+        with patch("auto_sdd.lib.reliability.get_cpu_count", return_value=1):
+            result = run_parallel_drift_checks(pairs, check)
+        assert result is False
+        assert len(called) == 5
+
+    # Thread-pool tests just before may leave an OS thread winding down,
+    # which trips CPython's fork() deprecation check.
+    @pytest.mark.filterwarnings("ignore:This process .* is multi-threaded")
+    def test_run_parallel_drift_checks_process_pool(self, tmp_path: Path) -> None:
+        pairs = [
+            DriftPair(spec_file=tmp_path / f"{name}.md", source_files="src/a.py")
+            for name in ("pass", "fail", "other")
+        ]
+        result = run_parallel_drift_checks(
+            pairs, _check_not_fail_md, executor_cls=ProcessPoolExecutor
+        )
+        assert result is False
+        result = run_parallel_drift_checks(
+            pairs[:1], _check_not_fail_md, executor_cls=ProcessPoolExecutor
+        )
+        assert result is True
+
+
+def _check_not_fail_md(spec: Path, sources: str) -> bool:
+    # Module-level so ProcessPoolExecutor can pickle it
+    return spec.name != "fail.md"
+
 
 # ── run_agent_with_backoff ───────────────────────────────────────────────────
 
@@ -590,6 +826,69 @@ class TestRunAgentWithBackoff:
                 backoff_max=1,
             )
 
+    def test_run_agent_with_backoff_streams_stdout_and_stderr(
+        self, tmp_path: Path
+    ) -> None:
+        output = tmp_path / "logs" / "output.txt"
+        exit_code = run_agent_with_backoff(
+            output,
+            ["bash", "-c", "echo out; echo err >&2"],
+            max_retries=1,
+            backoff_max=1,
+        )
+        assert exit_code == 0
+        assert output.read_text().splitlines() == ["out", "err"]
+
+    def test_run_agent_with_backoff_jittered_delays(self, tmp_path: Path) -> None:
+        output = tmp_path / "output.txt"
+        with patch("auto_sdd.lib.reliability.time") as mock_time:
+            with pytest.raises(AgentTimeoutError):
+                run_agent_with_backoff(
+                    output,
+                    ["bash", "-c", "echo 'rate limit' && exit 1"],
+                    max_retries=4,
+                    backoff_max=5,
+                )
+        delays = [c.args[0] for c in mock_time.sleep.call_args_list]
+        assert len(delays) == 4
+        assert 1 <= delays[0] <= 3
+        assert all(1 <= d <= 5 for d in delays)
+
+    def test_run_agent_with_backoff_honors_retry_after(self, tmp_path: Path) -> None:
+        output = tmp_path / "output.txt"
+        with patch("auto_sdd.lib.reliability.time") as mock_time:
+            with pytest.raises(AgentTimeoutError):
+                run_agent_with_backoff(
+                    output,
+                    ["bash", "-c", "echo '429 Retry-After: 7' && exit 1"],
+                    max_retries=2,
+                    backoff_max=60,
+                )
+        assert [c.args[0] for c in mock_time.sleep.call_args_list] == [7.0, 7.0]
+
+    def test_run_agent_with_backoff_clamps_retry_after(self, tmp_path: Path) -> None:
+        output = tmp_path / "output.txt"
+        with patch("auto_sdd.lib.reliability.time") as mock_time:
+            with pytest.raises(AgentTimeoutError):
+                run_agent_with_backoff(
+                    output,
+                    ["bash", "-c", "echo '429 retry after 3600' && exit 1"],
+                    max_retries=1,
+                    backoff_max=30,
+                )
+        assert [c.args[0] for c in mock_time.sleep.call_args_list] == [30.0]
+
+    def test_run_agent_with_backoff_scans_only_output_tail(
+        self, tmp_path: Path
+    ) -> None:
+        output = tmp_path / "output.txt"
+        # Rate-limit text early in a long log is not the failure reason
+        script = "echo 'rate limit'; head -c 20000 /dev/zero | tr '\\0' x; exit 1"
+        exit_code = run_agent_with_backoff(
+            output, ["bash", "-c", script], max_retries=1, backoff_max=1
+        )
+        assert exit_code == 1
+
 
 # ── Lock contention ──────────────────────────────────────────────────────────
 
@@ -603,6 +902,50 @@ class TestLockContention:
         with pytest.raises(LockContentionError, match="Another instance"):
             acquire_lock(lock_file)
 
+    def test_pid_alive_current_process(self) -> None:
+        assert _pid_alive(os.getpid()) is True
+
+    def test_pid_alive_dead_and_invalid_pids(self) -> None:
+        assert _pid_alive(99999999) is False
+        assert _pid_alive(0) is False
+
+    def test_pid_alive_permission_denied_counts_as_alive(self) -> None:
+        with patch("auto_sdd.lib.reliability._HAS_PROCFS", False), patch(
+            "auto_sdd.lib.reliability.os.kill", side_effect=PermissionError
+        ):
+            assert _pid_alive(1) is True
+
+    def test_acquire_lock_waits_out_brief_flock_holder(self, lock_file: Path) -> None:
+        lock_file.touch()
+        holder = os.open(str(lock_file), os.O_WRONLY)
+        fcntl.flock(holder, fcntl.LOCK_EX)
+        try:
+            # The holder lets go during the first back-off sleep
+            with patch(
+                "auto_sdd.lib.reliability.time.sleep",
+                side_effect=lambda _s: fcntl.flock(holder, fcntl.LOCK_UN),
+            ) as sleep:
+                acquire_lock(lock_file)
+            assert sleep.call_count == 1
+            assert lock_file.read_text().strip() == str(os.getpid())
+        finally:
+            os.close(holder)
+            release_lock(lock_file)
+
+    def test_acquire_lock_flock_held_raises_after_spin(self, lock_file: Path) -> None:
+        lock_file.touch()
+        holder = os.open(str(lock_file), os.O_WRONLY)
+        fcntl.flock(holder, fcntl.LOCK_EX)
+        try:
+            with patch("auto_sdd.lib.reliability.time.sleep") as sleep:
+                with pytest.raises(
+                    LockContentionError, match="Could not acquire flock"
+                ):
+                    acquire_lock(lock_file)
+            assert sleep.call_count == 4
+        finally:
+            os.close(holder)
+
 
 # ── Exception hierarchy ─────────────────────────────────────────────────────
 
@@ -677,6 +1020,82 @@ class TestWriteStateAtomicity:
         assert state.feature_index == 5
         assert state.branch_strategy == "independent"
 
+    def test_write_state_failed_replace_keeps_old_state(self, state_file: Path) -> None:
+        write_state(state_file, 1, "chained", [], "main")
+        with patch(
+            "auto_sdd.lib.reliability.os.replace", side_effect=OSError("boom")
+        ):
+            with pytest.raises(OSError):
+                write_state(state_file, 2, "chained", [], "main")
+        state = read_state(state_file)
+        assert state is not None and state.feature_index == 1
+        assert list(state_file.parent.iterdir()) == [state_file]
+
+    def test_write_state_fsyncs_file_and_directory(self, state_file: Path) -> None:
+        with patch("auto_sdd.lib.reliability.os.fsync") as fsync:
+            write_state(state_file, 0, "chained", [], "main")
+        assert fsync.call_count == 2
+
+    def test_write_state_not_durable_skips_fsync(self, state_file: Path) -> None:
+        with patch("auto_sdd.lib.reliability.os.fsync") as fsync:
+            write_state(state_file, 0, "chained", [], "main", durable=False)
+        assert fsync.call_count == 0
+        assert read_state(state_file) is not None
+
+    def test_write_state_tolerates_unsupported_directory_fsync(
+        self, state_file: Path
+    ) -> None:
+        calls = {"n": 0}
+
+        def fake_fsync(fd: int) -> None:
+            calls["n"] += 1
+            if calls["n"] == 2:
+                raise OSError(errno.ENOTSUP, "Operation not supported")
+
+        with patch("auto_sdd.lib.reliability.os.fsync", side_effect=fake_fsync):
+            write_state(state_file, 3, "chained", [], "main")
+        state = read_state(state_file)
+        assert state is not None and state.feature_index == 3
+
+
+class TestStateBatcher:
+    """Coalesced resume-state writes."""
+
+    def test_state_batcher_writes_once_at_exit(self, state_file: Path) -> None:
+        with patch("auto_sdd.lib.reliability.write_state") as ws:
+            with StateBatcher(state_file) as sb:
+                for i in range(5):
+                    sb.update(i, "chained", [f"F{n}" for n in range(i)], "main")
+            assert ws.call_count == 1
+        assert ws.call_args.args == (
+            state_file, 4, "chained", ["F0", "F1", "F2", "F3"], "main"
+        )
+
+    def test_state_batcher_last_update_wins(self, state_file: Path) -> None:
+        completed = ["Auth"]
+        with StateBatcher(state_file) as sb:
+            sb.update(1, "chained", completed, "main")
+            completed.append("Dashboard")
+            sb.update(2, "chained", completed, "feature/x")
+            completed.append("Settings")
+        state = read_state(state_file)
+        assert state is not None
+        assert state.feature_index == 2
+        assert state.completed_features == ["Auth", "Dashboard"]
+
+    def test_state_batcher_no_update_no_write(self, state_file: Path) -> None:
+        with StateBatcher(state_file):
+            pass
+        assert not state_file.exists()
+
+    def test_state_batcher_writes_on_exception(self, state_file: Path) -> None:
+        with pytest.raises(RuntimeError):
+            with StateBatcher(state_file) as sb:
+                sb.update(3, "chained", ["Auth"], "main")
+                raise RuntimeError("build failed")
+        state = read_state(state_file)
+        assert state is not None and state.feature_index == 3
+
 
 # ── Bash state compatibility ─────────────────────────────────────────────────
 
@@ -156,3 +156,24 @@ def test_validate_frontmatter_closing_marker_beyond_20_lines(
     filler = "".join(f"line: {i}\n" for i in range(19))
     spec.write_text(f"---\nfeature: X\ndomain: Y\n{filler}---\n# Body\n")
     assert validate_frontmatter(spec) is False
+
+
+def test_validate_frontmatter_crlf_line_endings(tmp_path: Path) -> None:
+    """Windows line endings are accepted like LF."""
+    spec = tmp_path / "crlf.feature.md"
+    spec.write_bytes(b"---\r\nfeature: X\r\ndomain: Y\r\n---\r\n# Body\r\n")
+    assert validate_frontmatter(spec) is True
+
+
+def test_validate_frontmatter_ignores_body_after_header(tmp_path: Path) -> None:
+    """Only the header is read; undecodable body bytes don't matter."""
+    spec = tmp_path / "binary-body.feature.md"
+    spec.write_bytes(b"---\nfeature: X\ndomain: Y\n---\n" + b"\xff\xfe" * 50_000)
+    assert validate_frontmatter(spec) is True
+
+
+def test_validate_frontmatter_nested_key_not_counted(tmp_path: Path) -> None:
+    """An indented ``domain:`` under another key is not top-level."""
+    spec = tmp_path / "nested.feature.md"
+    spec.write_text("---\nfeature: X\nmeta:\n  domain: Y\n---\n# Body\n")
+    assert validate_frontmatter(spec) is False